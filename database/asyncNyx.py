@@ -0,0 +1,339 @@
+import asyncio
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Dict, List
+
+from database.compiler import CompiledQuery
+from database.nyx import NixORM
+from database.resultCache import ResultCache
+
+
+class AsyncDriver(ABC):
+    """
+    Interface dos drivers assíncronos usados pelo AsyncNixORM. Para outro banco
+    (asyncpg, aiomysql...) basta implementar estes métodos e informar o dialeto;
+    um driver sem algum deles não pode ser instanciado.
+
+    execute devolve as linhas (lista de dicts) ou, em comandos de escrita, o número
+    de linhas afetadas; stream devolve as linhas em lotes.
+    """
+
+    dialect = 'sqlite'
+
+    @abstractmethod
+    async def connect(self):
+        ...
+
+    @abstractmethod
+    async def execute(self, connection, sql: str, params: List) -> Any:
+        ...
+
+    @abstractmethod
+    def stream(self, connection, sql: str, params: List, batch_size: int) -> AsyncIterator[List[Dict]]:
+        ...
+
+    @abstractmethod
+    async def close(self, connection):
+        ...
+
+
+class _SqliteConnection:
+    def __init__(self, raw, executor: ThreadPoolExecutor):
+        self.raw = raw
+        self.executor = executor
+
+
+class SqliteAsyncDriver(AsyncDriver):
+    """
+    sqlite3 em uma thread dedicada por conexão: o event loop só espera o resultado.
+    Cada conexão do pool abre o arquivo de novo, então ':memory:' não serve para
+    mais de uma conexão (use um arquivo ou 'file::memory:?cache=shared' com uri=True).
+    """
+
+    dialect = 'sqlite'
+
+    def __init__(self, database: str, **connect_kwargs):
+        self.database = database
+        self.connect_kwargs = connect_kwargs
+
+    async def connect(self) -> _SqliteConnection:
+        # Uma thread por conexão: o sqlite3 não aceita a conexão usada por outras threads
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='nix-sqlite')
+        loop = asyncio.get_running_loop()
+        raw = await loop.run_in_executor(executor, partial(sqlite3.connect, self.database, **self.connect_kwargs))
+        return _SqliteConnection(raw, executor)
+
+    async def execute(self, connection: _SqliteConnection, sql: str, params: List) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(connection.executor, self._execute, connection.raw, sql, params)
+
+    async def stream(self, connection: _SqliteConnection, sql: str, params: List, batch_size: int) -> AsyncIterator[List[Dict]]:
+        loop = asyncio.get_running_loop()
+        cursor = await loop.run_in_executor(connection.executor, self._open_cursor, connection.raw, sql, params)
+        column_names = [desc[0] for desc in cursor.description]
+        try:
+            while True:
+                rows = await loop.run_in_executor(connection.executor, cursor.fetchmany, batch_size)
+                if not rows:
+                    break
+                yield [dict(zip(column_names, row)) for row in rows]
+        finally:
+            await loop.run_in_executor(connection.executor, cursor.close)
+
+    async def close(self, connection: _SqliteConnection):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(connection.executor, connection.raw.close)
+        connection.executor.shutdown(wait=False)
+
+    @staticmethod
+    def _execute(raw, sql: str, params: List):
+        # Mesmo contrato do SQLExecutor._execute_sql
+        try:
+            cursor = raw.cursor()
+            cursor.execute(sql, params or [])
+
+            if cursor.description is None:
+                raw.commit()
+                return cursor.rowcount
+
+            column_names = [desc[0] for desc in cursor.description]
+            return [dict(zip(column_names, row)) for row in cursor.fetchall()]
+
+        except Exception as e:
+            raise RuntimeError(f"Error when try execute SQL: {e}")
+
+    @staticmethod
+    def _open_cursor(raw, sql: str, params: List):
+        try:
+            cursor = raw.cursor()
+            cursor.execute(sql, params or [])
+            return cursor
+        except Exception as e:
+            raise RuntimeError(f"Error when try execute SQL: {e}")
+
+
+class AsyncConnectionPool:
+    """
+    Pool de conexões de um AsyncDriver, abertas sob demanda até size
+
+    Uso:
+    async with pool.connection() as connection:
+        rows = await driver.execute(connection, sql, params)
+    """
+
+    def __init__(self, driver: AsyncDriver, size: int = 5, timeout: float = None):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.driver = driver
+        self.size = size
+        self.timeout = timeout
+        self._idle: asyncio.Queue = None
+        self._opened = 0
+        self._closed = False
+
+    async def acquire(self):
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+
+        if self._idle.empty() and self._opened < self.size:
+            self._opened += 1
+            try:
+                return await self.driver.connect()
+            except BaseException:
+                self._opened -= 1
+                raise
+
+        try:
+            return await asyncio.wait_for(self._idle.get(), self.timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Timed out after {self.timeout}s waiting for a free connection")
+
+    def release(self, connection):
+        self._idle.put_nowait(connection)
+
+    @asynccontextmanager
+    async def connection(self):
+        connection = await self.acquire()
+        try:
+            yield connection
+        finally:
+            if self._closed:
+                await self.driver.close(connection)
+                self._opened -= 1
+            else:
+                self.release(connection)
+
+    async def close(self):
+        self._closed = True
+        while self._idle is not None and not self._idle.empty():
+            await self.driver.close(self._idle.get_nowait())
+            self._opened -= 1
+
+
+class AsyncNixORM:
+    """
+    Interface asyncio do NixORM: o SQL roda fora do event loop (thread dedicada no
+    sqlite ou driver assíncrono) e a DSL é compilada uma vez e guardada no cache de
+    compilação.
+
+    Uso:
+    async with AsyncNixORM('app.db', pool_size=5) as db:
+        await db.query("createTable('users').column('id', 'INTEGER', 'primarykey').column('name', 'VARCHAR', '100')")
+        users = await db.query("getAll('users').where('id', '=', :id)", params={'id': 1})
+
+        async for user in db.stream("getAll('users')"):
+            print(user)
+
+    # Outro banco
+    db = AsyncNixORM(MyPostgresDriver(dsn), pool_size=10)
+    """
+
+    def __init__(self, driver, schema: Dict[str, List[str]] = None, pool_size: int = 5,
+                 pool_timeout: float = None, compile_cache_path: str = None):
+        if isinstance(driver, str):
+            driver = SqliteAsyncDriver(driver)
+
+        self.driver = driver
+        self.pool = AsyncConnectionPool(driver, pool_size, pool_timeout)
+        # O NixORM só compila (parser, analisador, SQL); quem executa é o driver
+        self.orm = NixORM(None, schema, driver.dialect)
+        self.orm.enable_compile_cache(compile_cache_path)
+        self.sql_executor = self.orm.sql_executor
+        self._compile_lock = threading.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def add_table_schema(self, table: str, columns: List[str], primary_key: List[str] = None):
+        self.orm.add_table_schema(table, columns, primary_key)
+        return self
+
+    def enable_result_cache(self, ttl: float = 60.0, max_bytes: int = 64 * 1024 * 1024) -> ResultCache:
+        return self.orm.enable_result_cache(ttl, max_bytes)
+
+    def enable_single_flight(self, timeout: float = 30.0):
+        return self.orm.enable_single_flight(timeout)
+
+    async def compile_query(self, query_string: str) -> CompiledQuery:
+        key = self.orm._compile_key(query_string)
+        compiled = self.orm._compile_cache.get(key)
+        if compiled is not None:
+            return compiled
+
+        # Cache miss: parser e analisador rodam numa thread para não travar o loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._compile_locked, query_string)
+
+    def _compile_locked(self, query_string: str) -> CompiledQuery:
+        # Parser e analisador guardam estado da query atual: uma compilação por vez
+        with self._compile_lock:
+            return self.orm.compile_query(query_string)
+
+    async def query(self, query_string: str, row_format: str = None, params: Dict[str, Any] = None):
+        """
+        Exemplo:
+        await db.query("get('users', 'name').where('age', '>', :age)", params={'age': 18})
+        """
+        compiled = await self.compile_query(query_string)
+        return await self.run(compiled, params, row_format)
+
+    async def run(self, compiled: CompiledQuery, params: Dict[str, Any] = None, row_format: str = None):
+        executor = self.sql_executor
+        values = executor.resolve_params(compiled.params, params)
+
+        if not compiled.is_read():
+            try:
+                async with self.pool.connection() as connection:
+                    return await self.driver.execute(connection, compiled.sql, values)
+            finally:
+                executor._invalidate_cache(compiled.written_tables)
+
+        results = await self._read(compiled, values)
+        return executor.decode_rows(compiled, results, row_format)
+
+    async def _read(self, compiled: CompiledQuery, values: List) -> List[Dict]:
+        cache = self.sql_executor.result_cache
+        flight = self.sql_executor.single_flight
+        key = ResultCache.key(compiled.sql, values)
+
+        if cache is not None:
+            results = cache.get(key)
+            if results is not None:
+                return results
+
+        async def load():
+            generation = cache.generation if cache is not None else None
+            async with self.pool.connection() as connection:
+                results = await self.driver.execute(connection, compiled.sql, values)
+            if cache is not None:
+                cache.set(key, results, compiled.read_tables, generation)
+            return results
+
+        if flight is None:
+            return await load()
+
+        results, shared = await flight.do_async(key, load)
+        return [dict(row) for row in results] if shared else results
+
+    async def gather(self, queries: List, timeout: float = None) -> List:
+        """
+        Executa queries independentes em tasks concorrentes (uma conexão do pool cada) e
+        devolve os resultados na ordem recebida. timeout é o prazo do lote inteiro.
+
+        Exemplo:
+        users, orders = await db.gather(["getAll('users')", ("getAll('orders').where('user_id', '=', :id)", {'id': 1})], timeout=2.0)
+        """
+        statements = []
+        for item in queries:
+            params = None
+            if isinstance(item, tuple):
+                item, params = item
+            compiled = item if isinstance(item, CompiledQuery) else await self.compile_query(item)
+            statements.append((compiled, params))
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(*(self.run(compiled, params) for compiled, params in statements)), timeout
+            )
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Gather deadline of {timeout}s exceeded")
+
+    async def stream(self, query_string: str, params: Dict[str, Any] = None, batch_size: int = 500,
+                     row_format: str = None) -> AsyncIterator[Dict]:
+        """
+        Lê as linhas em lotes de batch_size sem carregar o resultado inteiro na memória.
+        A conexão fica reservada até o fim da iteração.
+
+        Exemplo:
+        async for order in db.stream("getAll('orders')", batch_size=1000):
+            ...
+        """
+        compiled = await self.compile_query(query_string)
+        if not compiled.is_read() or compiled.exists:
+            raise ValueError("Only get/getAll queries can be streamed")
+
+        values = self.sql_executor.resolve_params(compiled.params, params)
+        async with self.pool.connection() as connection:
+            batches = self.driver.stream(connection, compiled.sql, values, batch_size)
+            try:
+                async for rows in batches:
+                    for row in self.sql_executor.decode_rows(compiled, rows, row_format):
+                        yield row
+            finally:
+                await batches.aclose()
+
+    def sql(self, query_string: str) -> str:
+        return self.orm.sql(query_string)
+
+    async def close(self):
+        await self.pool.close()
@@ -0,0 +1,111 @@
+from typing import Any, Callable
+
+# Afinidade de tipo no estilo do sqlite: o nome declarado na coluna decide como o valor é lido
+INTEGER = 'integer'
+REAL = 'real'
+NUMERIC = 'numeric'
+BOOLEAN = 'boolean'
+TEXT = 'text'
+BLOB = 'blob'
+
+TRUE_VALUES = ('1', 'true', 't', 'yes', 'y')
+
+
+def type_affinity(sql_type: str) -> str:
+    """
+    Ex.: 'INTEGER' / 'BIGINT' -> integer, 'VARCHAR(100)' -> text, 'DOUBLE PRECISION' -> real,
+    'BOOLEAN' -> boolean, 'DECIMAL(10,2)' -> numeric, sem tipo -> blob
+    """
+    sql_type = (sql_type or '').upper()
+    if 'BOOL' in sql_type:
+        return BOOLEAN
+    if 'INT' in sql_type:
+        return INTEGER
+    if any(name in sql_type for name in ('CHAR', 'CLOB', 'TEXT')):
+        return TEXT
+    if not sql_type or 'BLOB' in sql_type or 'BYTEA' in sql_type:
+        return BLOB
+    if any(name in sql_type for name in ('REAL', 'FLOA', 'DOUB')):
+        return REAL
+    return NUMERIC
+
+
+def _to_integer(value: str):
+    try:
+        return int(value)
+    except ValueError:
+        return int(float(value))
+
+
+def _to_numeric(value: str):
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def _to_boolean(value: str):
+    return value.strip().lower() in TRUE_VALUES
+
+
+_PARSERS = {
+    INTEGER: _to_integer,
+    REAL: float,
+    NUMERIC: _to_numeric,
+    BOOLEAN: _to_boolean,
+}
+
+
+def text_coercer(sql_type: str) -> Callable[[Any], Any]:
+    """
+    Conversor de texto (CSV) para o tipo da coluna, escolhido uma vez por coluna.
+    Valores que já não são texto passam direto; texto vazio vira NULL fora das colunas de
+    texto e texto que não converte é mantido.
+    """
+    parse = _PARSERS.get(type_affinity(sql_type))
+    if parse is None:
+        return lambda value: value
+
+    def coerce(value):
+        if not isinstance(value, str):
+            return value
+        if value == '':
+            return None
+        # Como a afinidade do sqlite: texto que não é número (datas em colunas DATE) fica como está
+        try:
+            return parse(value)
+        except ValueError:
+            return value
+
+    return coerce
+
+
+def affinity_coercer(sql_type: str) -> Callable[[Any], Any]:
+    """
+    Conversão feita pelo sqlite ao gravar ou comparar com uma coluna: texto que parece
+    número vira número nas colunas numéricas, número vira texto nas colunas de texto;
+    o resto (inclusive '') fica como está.
+    """
+    affinity = type_affinity(sql_type)
+    if affinity == BLOB:
+        return lambda value: value
+    if affinity == TEXT:
+        def to_text(value):
+            if isinstance(value, bool):
+                return str(int(value))
+            return str(value) if isinstance(value, (int, float)) else value
+        return to_text
+
+    parse = float if affinity == REAL else _to_numeric
+
+    def coerce(value):
+        if isinstance(value, str):
+            try:
+                return parse(value)
+            except ValueError:
+                return value
+        if affinity == REAL and isinstance(value, int) and not isinstance(value, bool):
+            return float(value)
+        return value
+
+    return coerce
@@ -0,0 +1,186 @@
+from array import array
+from typing import Any, Dict, List
+
+from database.columnTypes import BOOLEAN, INTEGER, REAL, type_affinity
+from database.compiler import CompiledQuery
+from database.parser import Param, insertNode
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Afinidade -> typecode do array.array (e dtype do numpy correspondente)
+TYPECODES = {
+    INTEGER: 'q',
+    REAL: 'd',
+    BOOLEAN: 'b',
+}
+
+NUMPY_DTYPES = {
+    'q': 'int64',
+    'd': 'float64',
+    'b': 'bool',
+}
+
+
+class _Column:
+    """Buffer de uma coluna: array.array tipado enquanto os valores couberem, lista depois"""
+
+    def __init__(self, typecode: str = None):
+        self.typecode = typecode
+        self.values = array(typecode) if typecode else []
+
+    def extend(self, values):
+        if self.typecode is None:
+            self.values.extend(values)
+            return
+
+        if self.typecode == 'd':
+            # NULL numa coluna REAL vira NaN e a coluna continua tipada
+            values = [float('nan') if value is None else value for value in values]
+        # O lote vira array antes: array.extend deixaria os itens anteriores ao erro na coluna
+        try:
+            chunk = array(self.typecode, values)
+        except (TypeError, OverflowError):
+            # NULL em INTEGER/BOOLEAN ou valor de outro tipo: a coluna passa a ser lista de objetos
+            self.values = self.values.tolist()
+            self.typecode = None
+            self.values.extend(values)
+            return
+        self.values.extend(chunk)
+
+    def result(self, use_numpy: bool):
+        if not use_numpy:
+            return self.values
+        if self.typecode is None:
+            column = numpy.empty(len(self.values), dtype=object)
+            column[:] = self.values
+            return column
+        # frombuffer não copia: o array do numpy usa a memória do array.array
+        column = numpy.frombuffer(self.values, dtype='int8' if self.typecode == 'b' else NUMPY_DTYPES[self.typecode])
+        return column.astype(bool) if self.typecode == 'b' else column
+
+
+class ColumnFetcher:
+    """
+    Resultado em colunas: {coluna: array} em vez de lista de dicts. Cada coluna é um
+    array.array tipado pelo schema (INTEGER -> 'q', REAL -> 'd', BOOLEAN -> 'b'), ou
+    um array do NumPy quando ele está instalado. Texto, colunas sem tipo conhecido e
+    colunas inteiras com NULL ficam como lista (array de objetos no NumPy); NULL em
+    REAL vira NaN.
+
+    Uso:
+    columns = db.fetch_columns("get('metrics', 'ts', 'value').where('host', '=', :host)", {'host': 'a'})
+    columns['value'].mean()    # com NumPy
+    """
+
+    def __init__(self, orm_instance, compiled: CompiledQuery, params: Dict[str, Any] = None,
+                 batch_size: int = 10000, use_numpy: bool = None, aggregates: List[Dict] = None):
+        if not compiled.is_read() or compiled.exists:
+            raise ValueError("Only get/getAll queries can be fetched as columns")
+        if use_numpy and numpy is None:
+            raise RuntimeError("NumPy is not installed, use use_numpy=False for array.array columns")
+
+        self.orm = orm_instance
+        self.compiled = compiled
+        self.params = params
+        self.batch_size = batch_size
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        # aggregates do SelectNode: sem eles (query já compilada) toda coluna é tratada como coluna da tabela
+        self.aggregates = {aggregate['alias']: aggregate for aggregate in aggregates or []}
+
+    def fetch(self) -> Dict[str, Any]:
+        executor = self.orm.sql_executor
+        values = executor.resolve_params(self.compiled.params, self.params)
+        names, batches = executor.fetch_batches(self.compiled.sql, values, self.batch_size)
+
+        columns = [_Column(TYPECODES.get(self._affinity(name))) for name in names]
+        for batch in batches:
+            for column, column_values in zip(columns, zip(*batch)):
+                column.extend(column_values)
+
+        return {name: column.result(self.use_numpy) for name, column in zip(names, columns)}
+
+    def _affinity(self, name: str) -> str:
+        # Agregações pelo alias do node (count, avg, sum_total...), nunca pelo nome da coluna
+        aggregate = self.aggregates.get(name)
+        if aggregate is None:
+            return self._column_affinity(name)
+        if aggregate['function'] in ('count', 'countDistinct'):
+            return INTEGER
+        if aggregate['function'] == 'avg':
+            return REAL
+        return self._column_affinity(aggregate['column'])
+
+    def _column_affinity(self, name: str) -> str:
+        analyzer = self.orm.semantic_analyzer
+        if '.' in name:
+            table, column = name.split('.', 1)
+            tables = [table]
+        else:
+            tables, column = self.compiled.read_tables, name
+
+        for table in tables:
+            types = analyzer.get_column_types(table)
+            if not types and self.orm.sql_executor.dialect == 'sqlite':
+                # Sem tipos no schema: lê do banco uma vez
+                self.orm.introspect(table)
+                types = analyzer.get_column_types(table)
+            if column in types:
+                return type_affinity(types[column])
+        return None
+
+
+class ColumnInserter:
+    """
+    Insert a partir de colunas paralelas (listas, array.array ou NumPy): as colunas são
+    validadas uma vez no analisador e o executemany recebe tuplas montadas com zip
+    lote a lote, sem dict nem NixQuery por linha.
+
+    Uso:
+    db.insert_columns('metrics', {'ts': ts_array, 'value': value_array}, batch_size=10000)
+    """
+
+    def __init__(self, orm_instance, table: str, columns: Dict[str, Any], batch_size: int = 5000):
+        if not columns:
+            raise ValueError("insert_columns needs at least one column")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        lengths = {name: len(values) for name, values in columns.items()}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"All columns should have the same length: {lengths}")
+
+        self.orm = orm_instance
+        self.table = table
+        self.names = list(columns)
+        self.columns = list(columns.values())
+        self.length = next(iter(lengths.values()))
+        self.batch_size = batch_size
+
+    def run(self) -> int:
+        node = insertNode(self.table)
+        for name in self.names:
+            node.add_value(name, Param(name))
+        self.orm._analyze(node)
+        sql, _ = self.orm.sql_executor.compile(node)
+
+        executor = self.orm.sql_executor
+        context = self.orm.transaction() if executor.transaction is not None else self.orm.batch_commit(every=1)
+
+        affected = 0
+        with context:
+            for start in range(0, self.length, self.batch_size):
+                stop = start + self.batch_size
+                buffers = [self._slice(column, start, stop) for column in self.columns]
+                affected += executor.execute_many(sql, zip(*buffers), self.table)
+        return affected
+
+    @staticmethod
+    def _slice(column, start: int, stop: int):
+        chunk = column[start:stop]
+        # Escalares do NumPy (int64, float64...) não são aceitos pelos drivers: tolist() devolve tipos do Python
+        if numpy is not None and isinstance(chunk, numpy.ndarray):
+            return chunk.tolist()
+        return chunk
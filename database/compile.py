@@ -0,0 +1,185 @@
+"""
+Compilador ahead-of-time: arquivos .nix -> módulo Python com o SQL pronto.
+
+Cada query de um arquivo .nix é um bloco de linhas separado por linha em branco.
+O comentário "# name: ..." antes do bloco dá o nome da query no módulo gerado
+(sem ele o nome é <arquivo>_<posição>). createTable/createIndex dos arquivos
+entram no schema usado para validar as outras queries.
+
+Uso:
+python -m database.compile queries/ -o queries_compiled.py
+python -m database.compile queries/users.nix --schema schema.json --dialect postgres -o queries_compiled.py
+
+Em runtime:
+import queries_compiled
+db.run(queries_compiled.user_by_id, {'id': 1})
+
+# queries/users.nix
+createTable('users').column('id', 'INTEGER', 'primarykey').column('name', 'VARCHAR', '100')
+
+# name: user_by_id
+getAll('users').where('id', '=', :id)
+"""
+
+import argparse
+import json
+import keyword
+import os
+import pprint
+import re
+import sys
+from typing import Dict, List, Tuple
+
+from database import __version__
+from database.compiler import CompiledQuery, SQLExecutor
+from database.parser import NixParser, createTableNode, createIndexNode
+from database.semanticAnalyzer import SemanticAnalyzer
+
+
+NAME_COMMENT = re.compile(r'^#\s*name:\s*([A-Za-z_][A-Za-z0-9_]*)\s*$')
+# Nomes que o módulo gerado já define (render_module)
+RESERVED_NAMES = {'CompiledQuery', 'LIBRARY_VERSION', 'DIALECT', 'SCHEMA_VERSION', 'QUERIES'}
+
+
+def find_files(paths: List[str]) -> List[str]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files += [os.path.join(root, name) for name in names if name.endswith('.nix')]
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def read_queries(file_path: str) -> List[Tuple[str, str]]:
+    """Retorna (nome, dsl) de cada bloco do arquivo, na ordem"""
+    stem = re.sub(r'\W', '_', os.path.splitext(os.path.basename(file_path))[0])
+    queries = []
+    name = None
+    block = []
+
+    def flush():
+        nonlocal name, block
+        if block:
+            queries.append((name or f"{stem}_{len(queries) + 1}", '\n'.join(block)))
+        name = None
+        block = []
+
+    with open(file_path, encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            match = NAME_COMMENT.match(line)
+            if match:
+                flush()
+                name = match.group(1)
+            elif not line:
+                flush()
+            elif not line.startswith('#'):
+                block.append(line)
+    flush()
+    return queries
+
+
+def load_schema(path: str, analyzer: SemanticAnalyzer):
+    """
+    JSON com as tabelas: {"users": ["id", "name"]} ou
+    {"users": {"columns": ["id", "name"], "primary_key": ["id"], "types": {"id": "INTEGER"}}}
+    """
+    with open(path, encoding='utf-8') as file:
+        tables = json.load(file)
+
+    for table, definition in tables.items():
+        if isinstance(definition, list):
+            definition = {'columns': definition}
+        analyzer.schema[table] = list(definition['columns'])
+        if definition.get('primary_key'):
+            analyzer.primary_keys[table] = list(definition['primary_key'])
+        if definition.get('types'):
+            analyzer.column_types[table] = dict(definition['types'])
+
+
+def compile_files(files: List[str], analyzer: SemanticAnalyzer, dialect: str) -> Tuple[Dict[str, CompiledQuery], List[str]]:
+    executor = SQLExecutor(None, dialect)
+    parsed = []
+    errors = []
+
+    for file_path in files:
+        for name, dsl in read_queries(file_path):
+            try:
+                parsed.append((name, dsl, file_path, NixParser().parse(dsl)))
+            except (Exception, SystemExit):
+                errors.append(f"{file_path}: {name}: syntax error in {dsl!r}")
+
+    # DDL primeiro: uma query pode usar uma tabela criada em outro arquivo
+    parsed.sort(key=lambda item: not isinstance(item[3], (createTableNode, createIndexNode)))
+
+    compiled = {}
+    for name, dsl, file_path, node in parsed:
+        if name in compiled:
+            errors.append(f"{file_path}: {name}: duplicated query name")
+            continue
+        if not name.isidentifier() or keyword.iskeyword(name) or name in RESERVED_NAMES:
+            errors.append(f"{file_path}: {name}: invalid query name")
+            continue
+
+        if not analyzer.analyze(node):
+            errors.append(f"{file_path}: {name}: {'; '.join(analyzer.get_errors())}")
+            continue
+
+        compiled[name] = executor.compile_query(node)
+    return compiled, errors
+
+
+def render_module(compiled: Dict[str, CompiledQuery], analyzer: SemanticAnalyzer, dialect: str) -> str:
+    lines = [
+        '# Gerado por python -m database.compile, não editar.',
+        'from database.compiler import CompiledQuery',
+        '',
+        f'LIBRARY_VERSION = {__version__!r}',
+        f'DIALECT = {dialect!r}',
+        f'SCHEMA_VERSION = {analyzer.schema_version()!r}',
+        ''
+    ]
+    for name, query in compiled.items():
+        lines.append(f'{name} = CompiledQuery.fromDict({pprint.pformat(query.toDict(), width=120, sort_dicts=False)})')
+        lines.append('')
+
+    lines.append('QUERIES = {')
+    lines += [f'    {name!r}: {name},' for name in compiled]
+    lines.append('}')
+    return '\n'.join(lines) + '\n'
+
+
+def main(argv: List[str] = None) -> int:
+    arg_parser = argparse.ArgumentParser(prog='python -m database.compile',
+                                         description='Compile .nix query files to a Python module of prepared SQL')
+    arg_parser.add_argument('paths', nargs='+', help='.nix files or directories')
+    arg_parser.add_argument('-o', '--output', required=True, help='generated Python module')
+    arg_parser.add_argument('--schema', help='JSON file with the tables and columns')
+    arg_parser.add_argument('--dialect', default='sqlite', choices=sorted(SQLExecutor.DIALECTS))
+    args = arg_parser.parse_args(argv)
+
+    analyzer = SemanticAnalyzer()
+    if args.schema:
+        load_schema(args.schema, analyzer)
+
+    files = find_files(args.paths)
+    if not files:
+        print(f"No .nix files found in {', '.join(args.paths)}", file=sys.stderr)
+        return 1
+
+    compiled, errors = compile_files(files, analyzer, args.dialect)
+    if errors:
+        for error in errors:
+            print(error, file=sys.stderr)
+        return 1
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        file.write(render_module(compiled, analyzer, args.dialect))
+    print(f"{len(compiled)} queries compiled to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from database import __version__
+from database.compiler import CompiledQuery
+
+
+class CompileCache:
+    """
+    Cache de queries compiladas: DSL -> CompiledQuery, para não passar de novo por
+    lexer, parser, analisador e gerador de SQL. Com path, as entradas também ficam
+    num arquivo sqlite, carregado na inicialização (leitura com mmap) e preenchido
+    aos poucos, então um processo novo já começa aquecido.
+
+    A chave junta o fingerprint da DSL, a versão do schema, o dialeto e a versão da
+    biblioteca: mudou qualquer um deles, a query é compilada de novo.
+
+    Uso:
+    db.enable_compile_cache('.cache/nix_queries.db')
+    """
+
+    MMAP_SIZE = 256 * 1024 * 1024
+
+    def __init__(self, path: str = None, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, CompiledQuery]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = None
+        self.hits = 0
+        self.misses = 0
+
+        if path:
+            self._open(path)
+
+    @staticmethod
+    def fingerprint(dsl: str) -> str:
+        return hashlib.sha1(dsl.strip().encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def key(dsl: str, schema_version: str, dialect: str) -> str:
+        return f"{CompileCache.fingerprint(dsl)}:{schema_version}:{dialect}"
+
+    def get(self, key: str) -> Optional[CompiledQuery]:
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return compiled
+
+    def put(self, key: str, compiled: CompiledQuery):
+        with self._lock:
+            self._remember(key, compiled)
+
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO compiled_queries (key, library_version, payload) VALUES (?, ?, ?)",
+                    (key, __version__, json.dumps(compiled.toDict()))
+                )
+                self._disk.commit()
+
+    def put_many(self, entries: Dict[str, CompiledQuery]):
+        """Grava várias entradas numa única transação (usado pelo warmup)"""
+        with self._lock:
+            for key, compiled in entries.items():
+                self._remember(key, compiled)
+
+            if self._disk is not None:
+                self._disk.executemany(
+                    "INSERT OR REPLACE INTO compiled_queries (key, library_version, payload) VALUES (?, ?, ?)",
+                    [(key, __version__, json.dumps(compiled.toDict())) for key, compiled in entries.items()]
+                )
+                self._disk.commit()
+
+    def _remember(self, key: str, compiled: CompiledQuery):
+        self._entries[key] = compiled
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _open(self, path: str):
+        self._disk = sqlite3.connect(path, check_same_thread=False)
+        self._disk.execute(f"PRAGMA mmap_size = {self.MMAP_SIZE}")
+        self._disk.execute(
+            "CREATE TABLE IF NOT EXISTS compiled_queries ("
+            "key TEXT PRIMARY KEY, library_version TEXT NOT NULL, payload TEXT NOT NULL)"
+        )
+        # Entradas de outra versão da biblioteca nunca mais vão bater na chave
+        self._disk.execute("DELETE FROM compiled_queries WHERE library_version != ?", (__version__,))
+        self._disk.commit()
+
+        rows = self._disk.execute("SELECT key, payload FROM compiled_queries WHERE library_version = ?", (__version__,))
+        for key, payload in rows:
+            self._remember(key, CompiledQuery.fromDict(json.loads(payload)))
+
+    def close(self):
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,36 +1,300 @@
-from typing import Dict
-from database.parser import CreateDatabaseNode, SelectNode, insertNode, createTableNode
+import copy
+from typing import Any, Dict, List
+from database.queryPlan import QueryPlan
+from database.resultCache import ResultCache
+from database.parser import AGGREGATE_FUNCTIONS, ROW_FORMATS, CreateDatabaseNode, Param, SelectNode, insertNode, createTableNode, updateNode, deleteNode, createIndexNode, dropIndexNode
+
+class CompiledQuery:
+    """SQL já gerado + o que a execução precisa saber do node (tabelas lidas/escritas, formato das linhas)"""
+    
+    def __init__(self, sql: str, params: List, kind: str, read_tables: List[str] = None,
+                 written_tables: List[str] = None, exists: bool = False, row_format: str = 'flat'):
+        self.sql = sql
+        self.params = params
+        self.kind = kind
+        self.read_tables = read_tables or []
+        self.written_tables = written_tables  # None = tabela desconhecida, invalida todo o cache
+        self.exists = exists
+        self.row_format = row_format
+    
+    def is_read(self) -> bool:
+        return self.kind == 'SELECT'
+    
+    def parameter_names(self) -> List[str]:
+        return [param.name for param in self.params if isinstance(param, Param)]
+    
+    def toDict(self) -> Dict[str, Any]:
+        return {
+            'sql': self.sql,
+            'params': [{'param': value.name} if isinstance(value, Param) else value for value in self.params],
+            'kind': self.kind,
+            'read_tables': self.read_tables,
+            'written_tables': self.written_tables,
+            'exists': self.exists,
+            'row_format': self.row_format
+        }
+    
+    @classmethod
+    def fromDict(cls, data: Dict[str, Any]) -> 'CompiledQuery':
+        params = [Param(value['param']) if isinstance(value, dict) else value for value in data['params']]
+        return cls(data['sql'], params, data['kind'], data['read_tables'], data['written_tables'],
+                   data['exists'], data['row_format'])
+    
+    def __repr__(self):
+        return f'<CompiledQuery: {self.sql} params={self.params}>'
+
 
 class SQLExecutor:
-    def __init__(self, db_connection=None):
+    # Por dialeto: aspas dos identificadores, placeholder e limite de parâmetros por comando, auto incremento
+    DIALECTS = {
+        'sqlite': {'quote': '`', 'placeholder': '?', 'max_params': 999, 'autoincrement': " AUTOINCREMENT"},
+        'postgres': {'quote': '"', 'placeholder': '%s', 'max_params': 32767, 'autoincrement': " GENERATED BY DEFAULT AS IDENTITY"},
+    }
+
+    def __init__(self, db_connection=None, dialect: str = 'sqlite'):
+        if dialect not in self.DIALECTS:
+            raise ValueError(f"Dialect not supported: {dialect}")
+        
         self.db_connection = db_connection
+        self.dialect = dialect
         self.last_sql = None
+        self.last_params = []
+        self.result_cache = None
+        self.single_flight = None
+        self.replicas = None
+        self.transaction = None
+        self.backend = None
+        self.table_cache = None
+    
+    def with_connection(self, db_connection) -> 'SQLExecutor':
+        """Cópia do executor usando outra conexão (mesmo dialeto, cache de resultados e single flight)"""
+        executor = copy.copy(self)
+        executor.db_connection = db_connection
+        executor.transaction = None
+        return executor
+
+    def execute(self, node, return_sql_only: bool = True, bindings: Dict[str, Any] = None):
+        # Tabela em cache (TableCache): a leitura é respondida da memória
+        if self.table_cache is not None and not return_sql_only and isinstance(node, SelectNode):
+            results = self.table_cache.answer(node, bindings)
+            if results is not None:
+                return results
+        
+        # Backend em memória (MemoryBackend): o node roda direto, sem gerar SQL
+        if self.backend is not None and not return_sql_only:
+            return self.backend.execute(node, bindings)
+        
+        if return_sql_only or not self.db_connection:
+            sql = self._generate_sql(node)
+            self.last_sql = sql
+            self.last_params = []
+            return sql
+        
+        return self.run(self.compile_query(node), bindings)
+
+    def compile(self, node):
+        """Gera o SQL com placeholders e a lista de parâmetros na ordem de uso"""
+        params = []
+        sql = self._generate_sql(node, params)
+        self.last_sql = sql
+        self.last_params = params
+        return sql, params
+
+    def compile_query(self, node) -> 'CompiledQuery':
+        """Compila o node para um CompiledQuery, que pode ser executado várias vezes com run()"""
+        sql, params = self.compile(node)
+        
+        if isinstance(node, SelectNode):
+            return CompiledQuery(sql, params, node.type, read_tables=self._read_tables(node),
+                                 exists=node.exists, row_format=node.row_format)
+        return CompiledQuery(sql, params, node.type, written_tables=self._written_tables(node))
+
+    def run(self, compiled: 'CompiledQuery', bindings: Dict[str, Any] = None, row_format: str = None):
+        """Executa um CompiledQuery sem passar de novo pelo parser, analisador e gerador de SQL"""
+        values = self.resolve_params(compiled.params, bindings)
+        self.last_sql = compiled.sql
+        self.last_params = compiled.params
+        
+        if not compiled.is_read():
+            results = self._execute_sql(compiled.sql, values)
+            self._invalidate_cache(compiled.written_tables)
+            self._record_write()
+            return results
+        
+        results = self._execute_read(compiled.read_tables, compiled.sql, values)
+        return self.decode_rows(compiled, results, row_format)
+
+    def decode_rows(self, compiled: 'CompiledQuery', results: List[Dict], row_format: str = None):
+        """Aplica exists / row_format sobre as linhas lidas de um CompiledQuery"""
+        row_format = row_format or compiled.row_format
+        if row_format not in ROW_FORMATS:
+            raise ValueError(f"Row format '{row_format}' not supported")
+        
+        if compiled.exists:
+            return len(results) > 0
+        if row_format == 'nested':
+            return self._nest_rows(results)
+        return results
+
+    def _execute_read(self, tables: List[str], sql: str, values: List):
+        if self.result_cache is None and self.single_flight is None:
+            return self._read_sql(sql, values)
+        
+        key = ResultCache.key(sql, values)
+        if self.result_cache is not None:
+            results = self.result_cache.get(key)
+            if results is not None:
+                return results
+        
+        if self.single_flight is None:
+            return self._load_read(tables, sql, values, key)
+        
+        results, shared = self.single_flight.do(key, lambda: self._load_read(tables, sql, values, key))
+        # Quem só esperou recebe uma cópia para não dividir as mesmas linhas com o líder
+        return [dict(row) for row in results] if shared else results
+    
+    def _load_read(self, tables: List[str], sql: str, values: List, key):
+        if self.result_cache is None:
+            return self._read_sql(sql, values)
+        
+        generation = self.result_cache.generation
+        results = self._read_sql(sql, values)
+        self.result_cache.set(key, results, tables, generation)
+        return results
+    
+    def _read_sql(self, sql: str, values: List):
+        # Leituras vão para uma réplica, a não ser que a sessão tenha escrito há pouco
+        if self.replicas is None:
+            return self._execute_sql(sql, values)
+        
+        # Dentro de uma transação só o primário enxerga as escritas ainda sem commit
+        if self.transaction is not None or self.replicas.is_pinned():
+            self.replicas.count_primary_read()
+            return self._execute_sql(sql, values)
+        
+        with self.replicas.connection() as connection:
+            return self.with_connection(connection)._execute_sql(sql, values)
+    
+    def _record_write(self):
+        if self.replicas is None:
+            return
+        # Em transação a janela de leitura no primário começa no commit
+        if self.transaction is not None:
+            self.transaction.wrote = True
+        else:
+            self.replicas.record_write()
+    
+    def _read_tables(self, node: SelectNode) -> List[str]:
+        return [node.table] + [join['table'] for join in node.joins]
+    
+    def _written_tables(self, node):
+        # None = não dá para saber a tabela, invalida tudo
+        if isinstance(node, (insertNode, updateNode, deleteNode, createTableNode, createIndexNode)):
+            return [node.table_name]
+        return None
     
-    def execute(self, node, return_sql_only: bool = True):
+    def _invalidate_cache(self, tables: List[str] = None):
+        if self.result_cache is not None:
+            self.result_cache.invalidate(tables)
+        if self.table_cache is not None:
+            self.table_cache.invalidate(tables)
+    
+    def explain(self, node, bindings: Dict[str, Any] = None) -> QueryPlan:
+        """Roda EXPLAIN QUERY PLAN (sqlite) ou EXPLAIN (FORMAT JSON) (postgres) sobre o SQL compilado"""
+        if not self.db_connection:
+            raise RuntimeError("Explain requires a database connection")
+        
+        sql, params = self.compile(node)
+        # Parâmetros sem valor viram NULL: o plano não depende deles
+        values = [
+            (bindings or {}).get(value.name) if isinstance(value, Param) else value
+            for value in params
+        ]
+        
+        # Em joins o sqlite mostra os aliases (t0, t1...), o QueryPlan volta para o nome da tabela
+        aliases = {}
+        if isinstance(node, SelectNode):
+            aliases = {alias: table for table, alias in self._table_aliases(node).items()}
+        
+        if self.dialect == 'postgres':
+            rows = self._execute_sql(f"EXPLAIN (FORMAT JSON) {sql}", values)
+            return QueryPlan.from_postgres(sql, list(rows[0].values())[0])
+        
+        rows = self._execute_sql(f"EXPLAIN QUERY PLAN {sql}", values)
+        return QueryPlan.from_sqlite(sql, rows, aliases)
+
+    def introspect(self, table: str) -> Dict[str, Any]:
+        """Lê do banco as colunas, tipos, chave primária e índices de uma tabela (sqlite)"""
+        if self.dialect != 'sqlite':
+            raise ValueError(f"Introspection not supported for dialect: {self.dialect}")
+        
+        columns = self._execute_sql(f"PRAGMA table_info({self._quote(table)})")
+        if not columns:
+            raise ValueError(f"Table '{table}' not found on database")
+        
+        indexes = {}
+        for index in self._execute_sql(f"PRAGMA index_list({self._quote(table)})"):
+            # origin 'c' = CREATE INDEX; 'pk' e 'u' são criados pelas constraints da tabela
+            info = self._execute_sql(f"PRAGMA index_info({self._quote(index['name'])})")
+            indexes[index['name']] = {
+                'table': table,
+                'columns': [col['name'] for col in sorted(info, key=lambda col: col['seqno'])],
+                'unique': bool(index['unique']),
+                'where': None,
+                'include': [],
+                'origin': index['origin']
+            }
+        
+        return {
+            'columns': [col['name'] for col in columns],
+            'types': {col['name']: col['type'] for col in columns},
+            'primary_key': [col['name'] for col in sorted(columns, key=lambda col: col['pk']) if col['pk']],
+            'indexes': indexes
+        }
+    
+    def list_tables(self) -> List[str]:
+        if self.dialect != 'sqlite':
+            raise ValueError(f"Introspection not supported for dialect: {self.dialect}")
+        
+        rows = self._execute_sql("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%';")
+        return [row['name'] for row in rows]
+
+    def resolve_params(self, params: List, bindings: Dict[str, Any] = None) -> List:
+        """Troca os Param(':nome') da lista pelos valores informados em bindings"""
+        resolved = []
+        for value in params:
+            if isinstance(value, Param):
+                if not bindings or value.name not in bindings:
+                    raise ValueError(f"Missing value for parameter ':{value.name}'")
+                value = bindings[value.name]
+            resolved.append(value)
+        return resolved
+
+    def _generate_sql(self, node, params: List = None) -> str:
         if isinstance(node, SelectNode):
-            sql = self._generate_select_sql(node)
+            return self._generate_select_sql(node, params)
         elif isinstance(node, CreateDatabaseNode):
-            sql = self._generate_create_database_sql(node)
+            return self._generate_create_database_sql(node)
         elif isinstance(node, createTableNode):
-            sql = self._generate_create_table_sql(node)
+            return self._generate_create_table_sql(node)
         elif isinstance(node, insertNode):
-            sql = self._generate_insert_sql(node)
+            return self._generate_insert_sql(node, params)
+        elif isinstance(node, updateNode):
+            return self._generate_update_sql(node, params)
+        elif isinstance(node, deleteNode):
+            return self._generate_delete_sql(node, params)
+        elif isinstance(node, createIndexNode):
+            return self._generate_create_index_sql(node)
+        elif isinstance(node, dropIndexNode):
+            return self._generate_drop_index_sql(node)
         else:
             raise ValueError(f"Type Node not supported:  {type(node)}")
-        
-        self.last_sql = sql
-        
-        if return_sql_only:
-            return sql
-        else:
-            # Aqui executaria no banco se tivesse conexão teoricamente, mas não consegui integrar com o sql alchemy
-            return self._execute_sql(sql) if self.db_connection else sql
     
     def _generate_create_database_sql(self, node: CreateDatabaseNode) -> str:
         if not node.database_name:
             raise ValueError("Database name is empty!")
         
-        return f"CREATE DATABASE `{node.database_name}`;"
+        return f"CREATE DATABASE {self._quote(node.database_name)};"
     
     def _generate_create_table_sql(self, node: createTableNode) -> str:
         if not node.table_name:
@@ -41,7 +305,7 @@ class SQLExecutor:
         
         columns_sql = []
         for col in node.columns:
-            col_sql = f"`{col['name']}` {col['type']}"
+            col_sql = f"{self._quote(col['name'])} {col['type']}"
             
             if 'size' in col:
                 col_sql += f"({col['size']})"
@@ -55,13 +319,47 @@ class SQLExecutor:
                     elif constraint == 'unique':
                         col_sql += " UNIQUE"
                     elif constraint == 'autoincrement':
-                        col_sql += " AUTO_INCREMENT"
+                        col_sql += self.DIALECTS[self.dialect]['autoincrement']
             
             columns_sql.append(col_sql)
         
-        return f"CREATE TABLE `{node.table_name}` ({', '.join(columns_sql)});"
+        return f"CREATE TABLE {self._quote(node.table_name)} ({', '.join(columns_sql)});"
+    
+    def _generate_create_index_sql(self, node: createIndexNode) -> str:
+        if not node.index_name:
+            raise ValueError("Index name is empty")
+        
+        if not node.columns:
+            raise ValueError("Index should have at least one column")
+        
+        columns = list(node.columns)
+        include_sql = ''
+        if node.include:
+            if self.dialect == 'postgres':
+                include_sql = f" INCLUDE ({', '.join(self._quote(col) for col in node.include)})"
+            elif node.unique:
+                raise ValueError("sqlite cannot emulate INCLUDE columns on a unique index")
+            else:
+                # sqlite não tem INCLUDE: as colunas entram no fim da chave e o índice continua cobrindo a query
+                columns += node.include
+        
+        unique_sql = 'UNIQUE ' if node.unique else ''
+        columns_str = ', '.join(self._quote(col) for col in columns)
+        sql = f"CREATE {unique_sql}INDEX {self._quote(node.index_name)} ON {self._quote(node.table_name)} ({columns_str}){include_sql}"
+        
+        # Índice parcial: o WHERE do DDL não aceita parâmetros, o valor vai direto no SQL
+        if node.where:
+            sql += f" WHERE {self._generate_where_clause(node.where)}"
+        
+        return sql + ";"
+    
+    def _generate_drop_index_sql(self, node: dropIndexNode) -> str:
+        if not node.index_name:
+            raise ValueError("Index name is empty")
+        
+        return f"DROP INDEX {self._quote(node.index_name)};"
     
-    def _generate_insert_sql(self, node: insertNode) -> str:
+    def _generate_insert_sql(self, node: insertNode, params: List = None) -> str:
         if not node.table_name:
             raise ValueError("Table name is empty")
         
@@ -69,51 +367,200 @@ class SQLExecutor:
             raise ValueError("Insert should have at least one value")
         
         columns = list(node.values.keys())
-        values = list(node.values.values())
         
-        columns_str = ', '.join(f"`{col}`" for col in columns)
-        values_str = ', '.join(f"'{val}'" for val in values)
+        columns_str = ', '.join(self._quote(col) for col in columns)
+        rows_str = ', '.join(
+            f"({', '.join(self._bind(row[col], params) for col in columns)})"
+            for row in [node.values] + node.rows
+        )
+        
+        sql = f"INSERT INTO {self._quote(node.table_name)} ({columns_str}) VALUES {rows_str}"
         
-        return f"INSERT INTO `{node.table_name}` ({columns_str}) VALUES ({values_str});"
+        if node.conflict:
+            sql += f" {self._generate_on_conflict(node)}"
+        
+        return sql + ";"
     
-    def _generate_select_sql(self, node: SelectNode) -> str:
-        if node.columns == ['*']:
-            columns_str = '*'
-        else:
-            columns_str = ', '.join(f"`{col}`" for col in node.columns)
+    def _generate_on_conflict(self, node: insertNode) -> str:
+        # sqlite (3.24+) e postgres usam a mesma sintaxe ON CONFLICT ... excluded
+        conflict_str = ', '.join(self._quote(col) for col in node.conflict)
+        
+        if not node.update_columns:
+            return f"ON CONFLICT ({conflict_str}) DO NOTHING"
+        
+        set_str = ', '.join(f"{self._quote(col)} = excluded.{self._quote(col)}" for col in node.update_columns)
+        return f"ON CONFLICT ({conflict_str}) DO UPDATE SET {set_str}"
+    
+    def _generate_update_sql(self, node: updateNode, params: List = None) -> str:
+        if not node.table_name:
+            raise ValueError("Table name is empty")
+        
+        if not node.values:
+            raise ValueError("Update should set at least one value")
+        
+        set_str = ', '.join(f"{self._quote(col)} = {self._bind(val, params)}" for col, val in node.values.items())
+        sql = f"UPDATE {self._quote(node.table_name)} SET {set_str}"
+        
+        if node.where:
+            sql += f" WHERE {self._generate_where_clause(node.where, params=params)}"
+        
+        return sql + ";"
+    
+    def _generate_delete_sql(self, node: deleteNode, params: List = None) -> str:
+        if not node.table_name:
+            raise ValueError("Table name is empty")
         
-        sql = f"SELECT {columns_str} FROM `{node.table}`"
+        sql = f"DELETE FROM {self._quote(node.table_name)}"
         
         if node.where:
-            where_clause = self._generate_where_clause(node.where)
+            sql += f" WHERE {self._generate_where_clause(node.where, params=params)}"
+        
+        return sql + ";"
+    
+    def _generate_select_sql(self, node: SelectNode, params: List = None) -> str:
+        aliases = self._table_aliases(node)
+        columns_str = self._generate_projection(node, aliases)
+        
+        sql = f"SELECT {columns_str} FROM {self._generate_from(node, aliases)}"
+        
+        if node.where:
+            where_clause = self._generate_where_clause(node.where, aliases, params)
             sql += f" WHERE {where_clause}"
+
+        if node.group_by:
+            sql += " GROUP BY " + ', '.join(self._column(col, aliases) for col in node.group_by)
+
+        if node.having:
+            having_clause = self._generate_where_clause(node.having, aliases, params)
+            sql += f" HAVING {having_clause}"
+        
+        if node.order_by and not node.exists:
+            aggregate_aliases = {aggregate['alias'] for aggregate in node.aggregates}
+            sql += " ORDER BY " + ', '.join(
+                f"{self._quote(col) if col in aggregate_aliases else self._column(col, aliases)} {direction}"
+                for col, direction in node.order_by
+            )
         
-        if node.limit:
+        if node.exists:
+            sql += " LIMIT 1"
+        elif node.limit:
             sql += f" LIMIT {int(node.limit)}"
         
         return sql + ";"
+
+    def _table_aliases(self, node: SelectNode) -> Dict[str, str]:
+        if not node.joins:
+            return {}
+
+        tables = [node.table] + [join['table'] for join in node.joins]
+        return {table: f"t{index}" for index, table in enumerate(tables)}
+
+    def _generate_from(self, node: SelectNode, aliases: Dict[str, str]) -> str:
+        if not aliases:
+            return self._quote(node.table)
+
+        sql = f"{self._quote(node.table)} AS {self._quote(aliases[node.table])}"
+        for join in node.joins:
+            left = self._column(join['left'], aliases)
+            right = self._column(join['right'], aliases)
+            sql += f" {join['type']} JOIN {self._quote(join['table'])} AS {self._quote(aliases[join['table']])} ON {left} = {right}"
+        return sql
+
+    def _column(self, column: str, aliases: Dict[str, str] = None) -> str:
+        if aliases and '.' in column:
+            table, name = column.split('.', 1)
+            return f"{self._quote(aliases.get(table, table))}.{self._quote(name)}"
+        return self._quote(column)
+
+    def _generate_projection(self, node: SelectNode, aliases: Dict[str, str] = None) -> str:
+        if node.exists:
+            return '1'
+
+        # Em joins cada coluna recebe o nome qualificado ('tabela.coluna') como alias
+        def project(col):
+            if aliases and '.' in col:
+                return f"{self._column(col, aliases)} AS {self._quote(col)}"
+            return self._column(col, aliases)
+
+        if not node.aggregates:
+            if node.columns == ['*']:
+                return '*'
+            return ', '.join(project(col) for col in node.columns)
+
+        # Com agregações, '*' projeta apenas as colunas agrupadas
+        columns = node.group_by if node.columns == ['*'] else node.columns
+        parts = [project(col) for col in columns]
+        for aggregate in node.aggregates:
+            expression = self._generate_aggregate(aggregate['function'], aggregate['column'], aliases)
+            parts.append(f"{expression} AS {self._quote(aggregate['alias'])}")
+        return ', '.join(parts)
+
+    def _generate_aggregate(self, function: str, column: str, aliases: Dict[str, str] = None) -> str:
+        sql_function = AGGREGATE_FUNCTIONS[function]
+        target = '*' if column == '*' else self._column(column, aliases)
+        if function == 'countDistinct':
+            target = f"DISTINCT {target}"
+        return f"{sql_function}({target})"
     
-    def _generate_where_clause(self, condition: Dict) -> str:
+    def _generate_where_clause(self, condition: Dict, aliases: Dict[str, str] = None, params: List = None) -> str:
         column = condition.get('ID')
         operator = condition.get('EQUALS')
         value = condition.get('NUMBER')
+        function = condition.get('FUNC')
         
-        try:
-            if isinstance(value, str) and value.isdigit():
-                formatted_value = value
-            elif isinstance(value, (int, float)):
-                formatted_value = str(value)
-            else:
-                formatted_value = f"'{value}'"
-        except (ValueError, TypeError):
-            formatted_value = f"'{value}'"
+        formatted_value = self._bind(value, params)
         
-        return f"`{column}` {operator} {formatted_value}"
+        if function:
+            return f"{self._generate_aggregate(function, column, aliases)} {operator} {formatted_value}"
+        return f"{self._column(column, aliases)} {operator} {formatted_value}"
+
+    def _bind(self, value: Any, params: List = None) -> str:
+        # Sem lista de parâmetros o valor é escrito direto no SQL (modo somente SQL)
+        if isinstance(value, (list, tuple)):
+            return f"({', '.join(self._bind(item, params) for item in value)})"
+        
+        if params is None:
+            return self._format_value(value)
+        
+        params.append(value)
+        return self.DIALECTS[self.dialect]['placeholder']
+
+    def _quote(self, identifier: str) -> str:
+        quote = self.DIALECTS[self.dialect]['quote']
+        return f"{quote}{identifier}{quote}"
+
+    def _format_value(self, value: Any) -> str:
+        if isinstance(value, Param):
+            return f":{value.name}"
+        elif isinstance(value, str) and value.isdigit():
+            return value
+        elif isinstance(value, (int, float)):
+            return str(value)
+        return "'" + str(value).replace("'", "''") + "'"
+
+    def _nest_rows(self, rows):
+        nested = []
+        for row in rows:
+            item = {}
+            for key, value in row.items():
+                if '.' in key:
+                    table, column = key.split('.', 1)
+                    item.setdefault(table, {})[column] = value
+                else:
+                    item[key] = value
+            nested.append(item)
+        return nested
     
-    def _execute_sql(self, sql: str): # Quando for implementado a integração com sql alchemy, executaria o comando sql
+    def _execute_sql(self, sql: str, params: List = None): # Quando for implementado a integração com sql alchemy, executaria o comando sql
         try:
             cursor = self.db_connection.cursor()
-            cursor.execute(sql)
+            cursor.execute(sql, params or [])
+            
+            # Comandos de escrita não retornam linhas: devolve o número de linhas afetadas
+            if cursor.description is None:
+                self._commit()
+                return cursor.rowcount
+            
             results = cursor.fetchall()
             
             column_names = [desc[0] for desc in cursor.description]
@@ -122,9 +569,63 @@ class SQLExecutor:
         except Exception as e:
             raise RuntimeError(f"Error when try execute SQL: {e}")
     
+    def fetch_batches(self, sql: str, params: List = None, batch_size: int = 10000):
+        """
+        Lê o resultado em lotes de tuplas (fetchmany), sem montar dicts.
+        Retorna (nomes das colunas, gerador de lotes).
+        """
+        try:
+            cursor = self.db_connection.cursor()
+            cursor.execute(sql, params or [])
+        except Exception as e:
+            raise RuntimeError(f"Error when try execute SQL: {e}")
+        
+        column_names = [desc[0] for desc in cursor.description]
+        
+        def batches():
+            try:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        return
+                    yield rows
+            finally:
+                cursor.close()
+        
+        return column_names, batches()
+    
+    def execute_many(self, sql: str, rows: List[List], table: str = None, commit: bool = True) -> int:
+        """
+        Executa o mesmo comando para cada linha de parâmetros (executemany), retorna as linhas afetadas.
+        commit=False deixa a transação aberta para quem chamou juntar vários comandos num commit só.
+        """
+        self.last_sql = sql
+        try:
+            cursor = self.db_connection.cursor()
+            cursor.executemany(sql, rows)
+            if commit:
+                self._commit()
+            return cursor.rowcount
+            
+        except Exception as e:
+            raise RuntimeError(f"Error when try execute SQL: {e}")
+        finally:
+            self._invalidate_cache([table] if table else None)
+            self._record_write()
+    
+    def _commit(self):
+        # Dentro de db.transaction() quem faz o commit é a transação
+        if self.transaction is None:
+            self.db_connection.commit()
+        else:
+            self.transaction.statement_done()
+    
     def get_last_sql(self):
         return self.last_sql
 
+    def get_last_params(self):
+        return self.last_params
+
 
 # Teste do executor
 if __name__ == "__main__":
@@ -137,8 +638,13 @@ if __name__ == "__main__":
         "createDatabase('eCom')",
         "createTable('users').column('id', 'INTEGER', 'primarykey').column('name', 'VARCHAR', '100')",
         "get('users', 'name').where('age', '>', '18')",
+        "get('users', 'age').count().groupBy('age').having('count', '*', '>', '1')",
+        "get('users').where('age', '>', '18').exists()",
+        "get('users', 'users.name', 'orders.total').join('orders', 'users.id', 'orders.user_id')",
         "getAll('users')",
-        "insert('users').values('name', 'John', 'age', '25')"
+        "insert('users').values('name', 'John', 'age', '25')",
+        "update('users').set('name', 'Maria').where('id', '=', :id)",
+        "delete('users').where('id', '=', '1')"
     ]
     
     for query in test_queries:
@@ -0,0 +1,72 @@
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable
+
+
+class ConnectionPool:
+    """
+    Pool de conexões DB-API para execução em várias threads, abertas sob demanda até size.
+    As conexões passam de uma thread para outra: no sqlite use check_same_thread=False.
+
+    Uso:
+    pool = ConnectionPool(lambda: sqlite3.connect('app.db', check_same_thread=False), size=8)
+    with pool.connection() as connection:
+        connection.execute(...)
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 5, timeout: float = None):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            create = self._opened < self.size
+            if create:
+                self._opened += 1
+
+        if create:
+            try:
+                return self.factory()
+            except BaseException:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"Timed out after {self.timeout}s waiting for a free connection")
+
+    def release(self, connection):
+        self._idle.put(connection)
+
+    @contextmanager
+    def connection(self):
+        connection = self.acquire()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self):
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            connection.close()
+            with self._lock:
+                self._opened -= 1
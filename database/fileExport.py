@@ -0,0 +1,89 @@
+import csv
+import gzip
+import json
+import os
+from typing import Any, Dict, List
+
+from database.compiler import CompiledQuery
+
+FORMATS = ('csv', 'jsonl')
+
+
+class FileExporter:
+    """
+    Exporta o resultado de uma query direto do cursor (fetchmany) para CSV ou JSONL,
+    sem montar um dict por linha: memória limitada a um lote e velocidade do driver.
+    Caminhos terminados em .gz (ou compression='gzip') são gravados com gzip.
+
+    Uso:
+    rows = db.export("getAll('events').where('day', '=', :day)", 'events.csv.gz', params={'day': 20})
+    db.getAll('users').export(sys.stdout, format='jsonl')
+    """
+
+    def __init__(self, orm_instance, compiled: CompiledQuery, params: Dict[str, Any] = None,
+                 batch_size: int = 10000):
+        if not compiled.is_read() or compiled.exists:
+            raise ValueError("Only get/getAll queries can be exported")
+
+        self.orm = orm_instance
+        self.compiled = compiled
+        self.params = params
+        self.batch_size = batch_size
+
+    def write(self, target, format: str = None, compression: str = None) -> int:
+        if isinstance(target, (str, os.PathLike)):
+            path = os.fspath(target)
+            name = path[:-3] if path.endswith('.gz') else path
+            compression = compression or ('gzip' if path.endswith('.gz') else None)
+            format = format or os.path.splitext(name)[1].lstrip('.').lower()
+            self._check(format, compression)
+
+            opener = gzip.open if compression == 'gzip' else open
+            with opener(path, 'wt', encoding='utf-8', newline='') as file:
+                return self._write(file, format)
+
+        format = format or 'csv'
+        self._check(format, compression)
+        if compression == 'gzip':
+            # Arquivo já aberto em modo binário
+            with gzip.open(target, 'wt', encoding='utf-8', newline='') as file:
+                return self._write(file, format)
+        return self._write(target, format)
+
+    @staticmethod
+    def _check(format: str, compression: str):
+        if format not in FORMATS:
+            raise ValueError(f"Export format not supported: {format}")
+        if compression not in (None, 'gzip'):
+            raise ValueError(f"Compression not supported: {compression}")
+
+    def _write(self, file, format: str) -> int:
+        executor = self.orm.sql_executor
+        values = executor.resolve_params(self.compiled.params, self.params)
+        columns, batches = executor.fetch_batches(self.compiled.sql, values, self.batch_size)
+
+        if format == 'csv':
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            write_batch = writer.writerows
+        else:
+            write_batch = self._jsonl_writer(file, columns)
+
+        total = 0
+        for batch in batches:
+            write_batch(batch)
+            total += len(batch)
+        return total
+
+    @staticmethod
+    def _jsonl_writer(file, columns: List[str]):
+        encode = json.JSONEncoder(ensure_ascii=False, default=str).encode
+        # As chaves são codificadas uma vez; cada linha só codifica os valores
+        keys = [f"{encode(col)}: " for col in columns]
+
+        def write_batch(batch):
+            file.write(''.join(
+                '{' + ', '.join(key + encode(value) for key, value in zip(keys, row)) + '}\n'
+                for row in batch
+            ))
+        return write_batch
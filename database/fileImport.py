@@ -0,0 +1,167 @@
+import csv
+import io
+import json
+import mmap
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List
+
+from database.columnTypes import text_coercer
+from database.parser import Param, insertNode
+
+FORMATS = ('csv', 'jsonl')
+
+
+class ImportProgress:
+    def __init__(self, table: str):
+        self.table = table
+        self.rows = 0
+        self.batches = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def seconds(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        seconds = self.seconds
+        return self.rows / seconds if seconds > 0 else 0.0
+
+    def toDict(self) -> Dict[str, Any]:
+        return {
+            'table': self.table,
+            'rows': self.rows,
+            'batches': self.batches,
+            'seconds': round(self.seconds, 3),
+            'rows_per_second': round(self.rows_per_second, 1)
+        }
+
+    def __repr__(self):
+        return f'<ImportProgress: {self.table} rows={self.rows} rows_per_second={self.rows_per_second:.0f}>'
+
+
+class FileImporter:
+    """
+    Importa um arquivo CSV (com cabeçalho) ou JSONL para uma tabela sem carregar o
+    arquivo na memória: as linhas são lidas do arquivo mapeado (mmap), convertidas
+    com o tipo de cada coluna e gravadas em lotes de executemany.
+
+    Uso:
+    stats = db.import_file('users', 'users.csv', batch_size=5000, progress=print)
+    stats = db.import_file('events', 'events.jsonl', atomic=True)
+    """
+
+    def __init__(self, orm_instance, table: str, path: str, format: str = None, batch_size: int = 5000,
+                 progress: Callable[[ImportProgress], None] = None, atomic: bool = False,
+                 delimiter: str = ',', encoding: str = 'utf-8'):
+        format = format or os.path.splitext(path)[1].lstrip('.').lower()
+        if format not in FORMATS:
+            raise ValueError(f"Import format not supported: {format}")
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.orm = orm_instance
+        self.table = table
+        self.path = path
+        self.format = format
+        self.batch_size = batch_size
+        self.progress = progress
+        self.atomic = atomic
+        self.delimiter = delimiter
+        self.encoding = encoding
+
+    def run(self) -> ImportProgress:
+        stats = ImportProgress(self.table)
+        with open(self.path, 'rb') as file:
+            lines = self._lines(file)
+            records = self._csv_records(lines) if self.format == 'csv' else self._jsonl_records(lines)
+
+            columns = next(records, None)
+            if columns is None:
+                return stats
+
+            sql = self._statement(columns)
+            types = self.orm.semantic_analyzer.get_column_types(self.table)
+            coercers = [text_coercer(types.get(col)) for col in columns]
+
+            executor = self.orm.sql_executor
+            # Um commit por lote, ou a importação inteira numa transação só (atomic)
+            if self.atomic or executor.transaction is not None:
+                context = self.orm.transaction()
+            else:
+                context = self.orm.batch_commit(every=1)
+
+            with context:
+                batch = []
+                for record in records:
+                    batch.append([coerce(value) for coerce, value in zip(coercers, record)])
+                    if len(batch) >= self.batch_size:
+                        self._write(sql, batch, stats)
+                        batch = []
+                if batch:
+                    self._write(sql, batch, stats)
+        return stats
+
+    def _statement(self, columns: List[str]):
+        # Valida as colunas uma vez com o analisador, como no upsert_many
+        node = insertNode(self.table)
+        for col in columns:
+            node.add_value(col, Param(col))
+        self.orm._analyze(node)
+        sql, _ = self.orm.sql_executor.compile(node)
+        return sql
+
+    def _write(self, sql: str, batch: List[List], stats: ImportProgress):
+        self.orm.sql_executor.execute_many(sql, batch, self.table)
+        stats.rows += len(batch)
+        stats.batches += 1
+        if self.progress is not None:
+            self.progress(stats)
+
+    def _lines(self, file) -> Iterator[str]:
+        # Arquivo vazio (ou que não é arquivo comum) não pode ser mapeado: lê direto
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            yield from io.TextIOWrapper(file, encoding=self.encoding, newline='')
+            return
+
+        with mapped:
+            for line in iter(mapped.readline, b''):
+                yield line.decode(self.encoding)
+
+    def _csv_records(self, lines: Iterator[str]) -> Iterator[List]:
+        # Primeiro item: o cabeçalho com as colunas (sem o BOM do utf-8)
+        reader = csv.reader(lines, delimiter=self.delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [col.strip() for col in header]
+        if header and header[0].startswith('\ufeff'):
+            header[0] = header[0][1:]
+        yield header
+
+        for number, record in enumerate(reader, start=2):
+            if not record:
+                continue
+            if len(record) != len(header):
+                raise ValueError(f"Line {number} has {len(record)} values, expected {len(header)}")
+            yield record
+
+    def _jsonl_records(self, lines: Iterator[str]) -> Iterator[List]:
+        columns = None
+        for number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+
+            row = json.loads(line)
+            if columns is None:
+                columns = list(row)
+                yield columns
+
+            extra = set(row) - set(columns)
+            if extra:
+                raise ValueError(f"Line {number} has unknown columns: {', '.join(sorted(extra))}")
+            yield [row.get(col) for col in columns]
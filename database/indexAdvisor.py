@@ -0,0 +1,204 @@
+from typing import Any, Dict, List, Tuple
+
+from database.parser import SelectNode, createIndexNode
+
+
+class IndexRecommendation:
+    def __init__(self, table: str, columns: Tuple[str, ...], frequency: int, fingerprints: List[str], example):
+        self.table = table
+        self.columns = columns
+        self.frequency = frequency
+        self.fingerprints = fingerprints
+        self.example = example          # (SelectNode, bindings) da query mais frequente
+        self.plan_before = None
+        self.plan_after = None
+        self.estimated_rows_saved = None
+
+    @property
+    def name(self) -> str:
+        return f"idx_{self.table}_{'_'.join(self.columns)}"
+
+    def node(self) -> createIndexNode:
+        node = createIndexNode(self.table, self.name)
+        node.set_columns(self.columns)
+        return node
+
+    def dsl(self) -> str:
+        columns = ', '.join(f"'{col}'" for col in self.columns)
+        return f"createIndex('{self.table}', '{self.name}').on({columns})"
+
+    def benefit(self) -> str:
+        if self.plan_before is None:
+            return 'not measured'
+
+        notes = []
+        if self.table in self.plan_before.full_scans() and self.table not in self.plan_after.full_scans():
+            notes.append('removes full scan')
+        if self._temp_sort(self.plan_before) and not self._temp_sort(self.plan_after):
+            notes.append('removes temp b-tree sort')
+        return ', '.join(notes) or 'no plan change'
+
+    @staticmethod
+    def _temp_sort(plan) -> bool:
+        return any('TEMP B-TREE' in node.detail for node in plan.walk())
+
+    def __repr__(self):
+        return f'<IndexRecommendation: {self.dsl()} frequency={self.frequency} benefit={self.benefit()}>'
+
+
+class IndexAdvisor:
+    """
+    Agrupa o workload por fingerprint e sugere índices compostos para os
+    filtros e ordenações mais frequentes que ainda não têm índice
+
+    Uso:
+    advisor = db.record_workload()
+    ... queries da aplicação ...
+    for recommendation in advisor.recommend(top=3, measure=True):
+        print(recommendation.dsl(), recommendation.benefit())
+    """
+
+    EQUALITY_OPERATORS = ('=', 'IN')
+    RANGE_OPERATORS = ('<', '>', '<=', '>=')
+
+    def __init__(self, orm_instance):
+        self.orm = orm_instance
+        self.workload: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, node: SelectNode, bindings: Dict[str, Any] = None, count: int = 1):
+        fingerprint = self.fingerprint(node)
+        entry = self.workload.setdefault(fingerprint, {'count': 0, 'node': node, 'bindings': bindings})
+        entry['count'] += count
+
+    def record_query(self, query: str, params: Dict[str, Any] = None, count: int = 1):
+        """Registra uma query da DSL vinda de log, com a frequência observada"""
+        node = self.orm.parser.parse(query)
+        self.orm._analyze(node)
+        if isinstance(node, SelectNode):
+            self.record(node, params, count)
+
+    def fingerprint(self, node: SelectNode) -> str:
+        # Mesma forma de query com valores diferentes -> mesmo fingerprint
+        parts = [node.table]
+        for join in node.joins:
+            parts.append(f"{join['type']} JOIN {join['table']} ON {join['left']} = {join['right']}")
+        if node.where:
+            parts.append(f"WHERE {node.where.get('FUNC') or ''}{node.where['ID']} {node.where['EQUALS']}")
+        if node.group_by:
+            parts.append(f"GROUP BY {', '.join(node.group_by)}")
+        if node.order_by:
+            parts.append(f"ORDER BY {', '.join(f'{col} {direction}' for col, direction in node.order_by)}")
+        if node.limit or node.exists:
+            parts.append('LIMIT')
+        return ' | '.join(parts)
+
+    def recommend(self, top: int = 5, min_frequency: int = 1, measure: bool = False) -> List[IndexRecommendation]:
+        candidates: Dict[Tuple[str, Tuple[str, ...]], Dict[str, Any]] = {}
+
+        for fingerprint, entry in self.workload.items():
+            for table, columns in self._access_patterns(entry['node']):
+                candidate = candidates.setdefault((table, columns), {'frequency': 0, 'fingerprints': [], 'example': None})
+                candidate['frequency'] += entry['count']
+                candidate['fingerprints'].append(fingerprint)
+                if candidate['example'] is None or entry['count'] > candidate['example'][2]:
+                    candidate['example'] = (entry['node'], entry['bindings'], entry['count'])
+
+        # Um índice (a, b) também atende quem filtra só por (a): soma a frequência no maior
+        for (table, columns), candidate in list(candidates.items()):
+            wider = [
+                key for key in candidates
+                if key[0] == table and len(key[1]) > len(columns) and key[1][:len(columns)] == columns
+            ]
+            if wider:
+                target = candidates[max(wider, key=lambda key: candidates[key]['frequency'])]
+                target['frequency'] += candidate['frequency']
+                target['fingerprints'] += candidate['fingerprints']
+                del candidates[(table, columns)]
+
+        recommendations = []
+        for (table, columns), candidate in candidates.items():
+            if candidate['frequency'] < min_frequency or self._is_covered(table, columns):
+                continue
+            node, bindings, _ = candidate['example']
+            recommendations.append(IndexRecommendation(
+                table, columns, candidate['frequency'], candidate['fingerprints'], (node, bindings)
+            ))
+
+        recommendations.sort(key=lambda recommendation: recommendation.frequency, reverse=True)
+        recommendations = recommendations[:top]
+
+        if measure:
+            for recommendation in recommendations:
+                self._measure(recommendation)
+        return recommendations
+
+    def apply(self, recommendations: List[IndexRecommendation]):
+        for recommendation in recommendations:
+            self.orm._execute_node(recommendation.node())
+
+    def _access_patterns(self, node: SelectNode) -> List[Tuple[str, Tuple[str, ...]]]:
+        def split(column):
+            return tuple(column.split('.', 1)) if '.' in column else (node.table, column)
+
+        equality: Dict[str, List[str]] = {}
+        ranges: Dict[str, List[str]] = {}
+        sort: Dict[str, List[str]] = {}
+
+        if node.where and not node.where.get('FUNC'):
+            table, column = split(node.where['ID'])
+            if node.where['EQUALS'] in self.EQUALITY_OPERATORS:
+                equality.setdefault(table, []).append(column)
+            elif node.where['EQUALS'] in self.RANGE_OPERATORS:
+                ranges.setdefault(table, []).append(column)
+
+        # Joins buscam a tabela da direita pela coluna do ON
+        for join in node.joins:
+            table, column = split(join['right'])
+            equality.setdefault(table, []).append(column)
+
+        sort_columns = node.group_by or [column for column, _ in node.order_by]
+        aggregate_aliases = [aggregate['alias'] for aggregate in node.aggregates]
+        for column in sort_columns:
+            if column not in aggregate_aliases:
+                table, column = split(column)
+                sort.setdefault(table, []).append(column)
+
+        patterns = []
+        for table in dict.fromkeys(list(equality) + list(ranges) + list(sort)):
+            columns = list(equality.get(table, []))
+            # Filtro de intervalo encerra a chave: colunas de ordenação depois dele não evitam o sort
+            tail = ranges.get(table) or sort.get(table, [])
+            columns += [column for column in tail if column not in columns]
+            if columns:
+                patterns.append((table, tuple(columns)))
+        return patterns
+
+    def _is_covered(self, table: str, columns: Tuple[str, ...]) -> bool:
+        existing = [index['columns'] for index in self.orm.semantic_analyzer.get_indexes(table).values()]
+        existing.append(self.orm.semantic_analyzer.get_primary_key(table))
+        return any(tuple(index[:len(columns)]) == columns for index in existing if index)
+
+    def _measure(self, recommendation: IndexRecommendation):
+        # Cria o índice dentro de um savepoint, compara os planos e desfaz
+        node, bindings = recommendation.example
+        executor = self.orm.sql_executor
+        recommendation.plan_before = executor.explain(node, bindings)
+
+        cursor = self.orm.db_connection.cursor()
+        cursor.execute("SAVEPOINT nix_index_advisor")
+        try:
+            cursor.execute(executor.execute(recommendation.node(), return_sql_only=True))
+            recommendation.plan_after = executor.explain(node, bindings)
+        finally:
+            cursor.execute("ROLLBACK TO nix_index_advisor")
+            cursor.execute("RELEASE nix_index_advisor")
+
+        if recommendation.table in recommendation.plan_before.full_scans() \
+                and recommendation.table not in recommendation.plan_after.full_scans():
+            count_node = SelectNode(recommendation.table)
+            count_node.add_aggregate('count')
+            rows = executor.execute(count_node, return_sql_only=False)[0]['count']
+            # Limite superior: cada execução deixa de ler a tabela inteira
+            recommendation.estimated_rows_saved = rows * recommendation.frequency
+        else:
+            recommendation.estimated_rows_saved = 0
@@ -18,7 +18,8 @@ class NixLexer:
         "GTE",# maior ou igual
         "LTE",# menor ou igual
         "NE", # diferente
-        "SEMICOLON"
+        "SEMICOLON",
+        "PARAM" # :nome
     )
 
     reservedWords = {
@@ -29,7 +30,18 @@ class NixLexer:
         "leftJoin": "LEFTJOIN",
         "rightJoin": "RIGHTJOIN",
         "orderby": "ORDERBY",
+        "orderBy": "ORDERBY",
         "limit": "LIMIT",
+        "groupBy": "GROUPBY",
+        "having": "HAVING",
+        "exists": "EXISTS",
+
+        "count": "COUNT",
+        "countDistinct": "COUNTDISTINCT",
+        "sum": "SUM",
+        "avg": "AVG",
+        "min": "MIN",
+        "max": "MAX",
 
         "insert": "INSERT",
         "update": "UPDATE",
@@ -43,6 +55,10 @@ class NixLexer:
         "createTable": "CREATETABLE",
         "dropDatabase": "DROPDATABASE",
         "dropTable": "DROPTABLE",
+        "createIndex": "CREATEINDEX",
+        "dropIndex": "DROPINDEX",
+        "on": "ON",
+        "include": "INCLUDE",
         "column": "COLUMN",
         "primaryKey": "PRIMARYKEY",
         "foreignKey": "FOREIGNKEY",
@@ -67,7 +83,7 @@ class NixLexer:
         "null": "NULL"
     }
 
-    tokens = tokens + tuple(reservedWords.values())
+    tokens = tokens + tuple(dict.fromkeys(reservedWords.values()))
     t_COMMA =  r'\,'
     t_DOT =    r'\.'
     t_LPAREN = r'\('
@@ -85,6 +101,11 @@ class NixLexer:
         t.value = t.value[1:-1]
         return t
     
+    def t_PARAM(self, t):
+        r'\:[a-zA-Z_][a-zA-Z0-9_]*'
+        t.value = t.value[1:]
+        return t
+    
     def t_NUMBER(self, t):
         r'\d+(\.\d+)?'
 
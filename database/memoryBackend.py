@@ -0,0 +1,407 @@
+import bisect
+import operator
+import re
+from functools import cmp_to_key
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from database.columnTypes import affinity_coercer
+from database.parser import (Param, SelectNode, createIndexNode, createTableNode, deleteNode, dropIndexNode,
+                             insertNode, updateNode)
+
+COMPARATORS = {
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+}
+
+RANGE_OPERATORS = ('<', '>', '<=', '>=')
+
+
+def like_pattern(pattern: str):
+    # LIKE do sqlite: % e _ como curingas, sem diferenciar maiúsculas
+    regex = ''.join('.*' if char == '%' else '.' if char == '_' else re.escape(char) for char in pattern)
+    return re.compile(f'^{regex}$', re.IGNORECASE | re.DOTALL)
+
+
+class MemoryTable:
+    """
+    Tabela guardada por colunas (uma lista por coluna) com índices opcionais:
+    hash (valor -> linhas) para '=' / 'IN' e ordenado (bisect) para '<', '>', '<=', '>='.
+    Com types ({coluna: tipo SQL}) os valores gravados e comparados seguem a afinidade
+    da coluna, como no sqlite. Linhas removidas ficam marcadas até o próximo compact().
+    """
+
+    def __init__(self, name: str, columns: List[str], primary_key: List[str] = None, types: Dict[str, str] = None):
+        self.name = name
+        self.columns = list(columns)
+        self.primary_key = list(primary_key or [])
+        self.types = dict(types or {})
+        self.data: Dict[str, List] = {col: [] for col in self.columns}
+        self.deleted: Set[int] = set()
+        self.hash_indexes: Dict[str, Dict[Any, List[int]]] = {}
+        self.sorted_indexes: Dict[str, List] = {}
+        self._coercers = {col: affinity_coercer(sql_type) for col, sql_type in self.types.items() if col in self.data}
+        self._next_id = 1
+        # A chave primária sempre tem índice hash: é ele que barra chave repetida
+        if len(self.primary_key) == 1:
+            self.create_hash_index(self.primary_key[0])
+
+    def __len__(self):
+        return len(self.data[self.columns[0]]) - len(self.deleted) if self.columns else 0
+
+    def row_ids(self) -> Iterable[int]:
+        total = len(self.data[self.columns[0]]) if self.columns else 0
+        return (row_id for row_id in range(total) if row_id not in self.deleted)
+
+    def value(self, row_id: int, column: str) -> Any:
+        return self.data[column][row_id]
+
+    def row(self, row_id: int, columns: List[str] = None) -> Dict[str, Any]:
+        return {col: self.data[col][row_id] for col in columns or self.columns}
+
+    def coerce(self, column: str, value: Any) -> Any:
+        """Valor convertido pela afinidade da coluna (sem types, fica como está)"""
+        coercer = self._coercers.get(column)
+        return coercer(value) if coercer is not None else value
+
+    # ==================== ESCRITA ====================
+
+    def insert(self, values: Dict[str, Any]) -> int:
+        unknown = set(values) - set(self.data)
+        if unknown:
+            raise ValueError(f"Columns not found on table '{self.name}': {', '.join(sorted(unknown))}")
+
+        values = {col: self.coerce(col, value) for col, value in values.items()}
+        # Chave primária inteira sem valor: auto incremento
+        if len(self.primary_key) == 1 and values.get(self.primary_key[0]) is None:
+            values[self.primary_key[0]] = self._next_id
+        self._check_unique(values)
+
+        key_value = values.get(self.primary_key[0]) if len(self.primary_key) == 1 else None
+        if isinstance(key_value, int):
+            self._next_id = max(self._next_id, key_value + 1)
+
+        row_id = len(self.data[self.columns[0]])
+        for col in self.columns:
+            self.data[col].append(values.get(col))
+        self._index_add(row_id, self.columns)
+        return row_id
+
+    def update(self, row_ids: List[int], values: Dict[str, Any]):
+        for col in values:
+            self._check_column(col)
+        values = {col: self.coerce(col, value) for col, value in values.items()}
+
+        key_columns = [col for col in self.primary_key if col in values]
+        if key_columns and row_ids:
+            if len(row_ids) > 1:
+                raise ValueError(f"UNIQUE constraint failed: {self.name}.{', '.join(key_columns)}")
+            current = self.row(row_ids[0], self.primary_key)
+            current.update({col: values[col] for col in key_columns})
+            self._check_unique(current, ignore=row_ids[0])
+
+        # Só as linhas alteradas saem e voltam dos índices das colunas alteradas
+        changed = list(values)
+        for row_id in row_ids:
+            self._index_remove(row_id, changed)
+            for col, value in values.items():
+                self.data[col][row_id] = value
+            self._index_add(row_id, changed)
+
+    def delete(self, row_ids: List[int]):
+        for row_id in row_ids:
+            if row_id not in self.deleted:
+                self._index_remove(row_id, self.columns)
+                self.deleted.add(row_id)
+
+    def _check_unique(self, values: Dict[str, Any], ignore: int = None):
+        if not self.primary_key:
+            return
+
+        if len(self.primary_key) == 1:
+            row_ids = self.hash_indexes[self.primary_key[0]].get(values.get(self.primary_key[0]), ())
+        else:
+            key = tuple(values.get(col) for col in self.primary_key)
+            row_ids = [row_id for row_id in self.row_ids()
+                       if tuple(self.data[col][row_id] for col in self.primary_key) == key]
+
+        if any(row_id != ignore for row_id in row_ids):
+            raise ValueError(f"UNIQUE constraint failed: {self.name}.{', '.join(self.primary_key)}")
+
+    def compact(self):
+        """Remove de fato as linhas marcadas como apagadas"""
+        alive = list(self.row_ids())
+        self.data = {col: [values[row_id] for row_id in alive] for col, values in self.data.items()}
+        self.deleted = set()
+        self._rebuild_indexes(list(set(self.hash_indexes) | set(self.sorted_indexes)))
+
+    # ==================== ÍNDICES ====================
+
+    def create_hash_index(self, column: str):
+        self._check_column(column)
+        index: Dict[Any, List[int]] = {}
+        for row_id in self.row_ids():
+            index.setdefault(self.data[column][row_id], []).append(row_id)
+        self.hash_indexes[column] = index
+
+    def create_sorted_index(self, column: str):
+        self._check_column(column)
+        # NULL não entra: nenhum operador de intervalo casa com NULL
+        self.sorted_indexes[column] = sorted(
+            (self.data[column][row_id], row_id) for row_id in self.row_ids() if self.data[column][row_id] is not None
+        )
+
+    def _index_add(self, row_id: int, columns: Iterable[str]):
+        for col in columns:
+            value = self.data[col][row_id]
+            if col in self.hash_indexes:
+                self.hash_indexes[col].setdefault(value, []).append(row_id)
+            if col in self.sorted_indexes and value is not None:
+                bisect.insort(self.sorted_indexes[col], (value, row_id))
+
+    def _index_remove(self, row_id: int, columns: Iterable[str]):
+        for col in columns:
+            value = self.data[col][row_id]
+            if col in self.hash_indexes:
+                bucket = self.hash_indexes[col][value]
+                bucket.remove(row_id)
+                if not bucket:
+                    del self.hash_indexes[col][value]
+            if col in self.sorted_indexes and value is not None:
+                index = self.sorted_indexes[col]
+                del index[bisect.bisect_left(index, (value, row_id))]
+
+    def _rebuild_indexes(self, columns: List[str]):
+        for col in columns:
+            if col in self.hash_indexes:
+                self.create_hash_index(col)
+            if col in self.sorted_indexes:
+                self.create_sorted_index(col)
+
+    def _check_column(self, column: str):
+        if column not in self.data:
+            raise ValueError(f"Column '{column}' not found on table '{self.name}'")
+
+    # ==================== BUSCA ====================
+
+    def find(self, condition: Optional[Dict], bindings: Dict[str, Any] = None) -> List[int]:
+        """Linhas que atendem o where, usando índice quando existe um para o operador"""
+        if not condition:
+            return list(self.row_ids())
+
+        column = condition['ID'].split('.')[-1]
+        self._check_column(column)
+        operator_name = condition['EQUALS']
+        value = resolve(condition['NUMBER'], bindings)
+        # O valor comparado recebe a afinidade da coluna: where('id', '=', '1') acha o id 1
+        if operator_name == 'IN':
+            value = [self.coerce(column, option) for option in value]
+        elif operator_name != 'LIKE':
+            value = self.coerce(column, value)
+
+        if operator_name in ('=', 'IN') and column in self.hash_indexes:
+            index = self.hash_indexes[column]
+            options = value if operator_name == 'IN' else [value]
+            row_ids = [row_id for option in dict.fromkeys(options) if option is not None for row_id in index.get(option, ())]
+            return sorted(row_ids)
+
+        if operator_name in RANGE_OPERATORS + ('=',) and column in self.sorted_indexes and value is not None:
+            return sorted(self._range(column, operator_name, value))
+
+        matches = predicate(operator_name, value)
+        values = self.data[column]
+        return [row_id for row_id in self.row_ids() if matches(values[row_id])]
+
+    def _range(self, column: str, operator_name: str, value: Any) -> List[int]:
+        index = self.sorted_indexes[column]
+        keys = [item[0] for item in index] if len(index) < 64 else _KeyView(index)
+        if operator_name == '<':
+            items = index[:bisect.bisect_left(keys, value)]
+        elif operator_name == '<=':
+            items = index[:bisect.bisect_right(keys, value)]
+        elif operator_name == '>':
+            items = index[bisect.bisect_right(keys, value):]
+        elif operator_name == '>=':
+            items = index[bisect.bisect_left(keys, value):]
+        else:
+            items = index[bisect.bisect_left(keys, value):bisect.bisect_right(keys, value)]
+        return [row_id for _, row_id in items]
+
+
+class _KeyView:
+    # Visão dos valores do índice ordenado para o bisect, sem copiar a lista
+    def __init__(self, index: List):
+        self.index = index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, position: int):
+        return self.index[position][0]
+
+
+def resolve(value: Any, bindings: Dict[str, Any] = None) -> Any:
+    if isinstance(value, Param):
+        if not bindings or value.name not in bindings:
+            raise ValueError(f"Missing value for parameter ':{value.name}'")
+        return bindings[value.name]
+    if isinstance(value, (list, tuple)):
+        return [resolve(item, bindings) for item in value]
+    return value
+
+
+def predicate(operator_name: str, value: Any):
+    # Como no SQL, comparação com NULL nunca é verdadeira
+    if operator_name == 'IN':
+        options = set(value)
+        return lambda item: item is not None and item in options
+    if operator_name == 'LIKE':
+        pattern = like_pattern(str(value))
+        return lambda item: item is not None and pattern.match(str(item)) is not None
+
+    compare = COMPARATORS[operator_name]
+
+    def matches(item):
+        if item is None or value is None:
+            return False
+        try:
+            return compare(item, value)
+        except TypeError:
+            return False
+    return matches
+
+
+def sort_rows(rows: List[Dict], order_by: List) -> List[Dict]:
+    # NULL antes de qualquer valor no ASC, como no sqlite
+    def compare(left, right):
+        for column, direction in order_by:
+            a, b = left.get(column, left.get(column.split('.')[-1])), right.get(column, right.get(column.split('.')[-1]))
+            if a == b:
+                continue
+            if a is None:
+                result = -1
+            elif b is None:
+                result = 1
+            else:
+                result = -1 if a < b else 1
+            return -result if direction == 'DESC' else result
+        return 0
+    return sorted(rows, key=cmp_to_key(compare))
+
+
+def select_rows(table: MemoryTable, node: SelectNode, bindings: Dict[str, Any] = None):
+    """Roda um get/getAll de uma tabela só (projeção, where, orderBy, limit, exists) sobre a MemoryTable"""
+    if node.aggregates or node.joins or node.group_by:
+        raise ValueError("Aggregations and joins are not supported by the memory backend")
+
+    row_ids = table.find(node.where, bindings)
+    if node.exists:
+        return len(row_ids) > 0
+
+    columns = table.columns if node.columns == ['*'] else [col.split('.')[-1] for col in node.columns]
+    for col in columns:
+        table._check_column(col)
+
+    if node.order_by:
+        # Ordena com todas as colunas (o orderBy pode usar coluna fora da projeção), projeta depois
+        rows = sort_rows([table.row(row_id) for row_id in row_ids], node.order_by)
+        if node.limit:
+            rows = rows[:int(node.limit)]
+        return [{col: row[col] for col in columns} for row in rows]
+
+    if node.limit:
+        row_ids = row_ids[:int(node.limit)]
+    return [table.row(row_id, columns) for row_id in row_ids]
+
+
+class MemoryBackend:
+    """
+    Backend do SQLExecutor que roda os nodes direto sobre tabelas em memória, sem banco:
+    createTable, createIndex (índice hash + ordenado na primeira coluna), insert,
+    update, delete e get/getAll com projeção, where, orderBy, limit e exists.
+    Agregações e joins não são suportados.
+
+    Uso:
+    db = NixORM(backend=MemoryBackend())
+    db.createTable('users').primaryKey('id').column('name', 'VARCHAR', '100').column('age', 'INTEGER').execute()
+    db.insert('users').values(name='Ana', age=30).execute()
+    db.sql_executor.backend.table('users').create_hash_index('name')
+    db.getAll('users').where('name', '=', 'Ana').execute()
+    """
+
+    def __init__(self):
+        self.tables: Dict[str, MemoryTable] = {}
+        self.index_columns: Dict[str, tuple] = {}
+
+    def table(self, name: str) -> MemoryTable:
+        if name not in self.tables:
+            raise ValueError(f"Table '{name}' not found on memory backend")
+        return self.tables[name]
+
+    def create_table(self, name: str, columns: List[str], primary_key: List[str] = None, types: Dict[str, str] = None,
+                     hash_indexes: Iterable[str] = (), sorted_indexes: Iterable[str] = ()) -> MemoryTable:
+        table = self.tables[name] = MemoryTable(name, columns, primary_key, types)
+        for col in hash_indexes:
+            table.create_hash_index(col)
+        for col in sorted_indexes:
+            table.create_sorted_index(col)
+        return table
+
+    def load(self, name: str, rows: Iterable[Dict[str, Any]]) -> int:
+        table = self.table(name)
+        count = 0
+        for row in rows:
+            table.insert(row)
+            count += 1
+        return count
+
+    def execute(self, node, bindings: Dict[str, Any] = None):
+        if isinstance(node, SelectNode):
+            return self.select(node, bindings)
+        if isinstance(node, createTableNode):
+            primary_key = [col['name'] for col in node.columns if 'primarykey' in col.get('constraints', [])]
+            types = {col['name']: col['type'] for col in node.columns}
+            self.create_table(node.table_name, [col['name'] for col in node.columns], primary_key, types)
+            return 0
+        if isinstance(node, createIndexNode):
+            table = self.table(node.table_name)
+            table.create_hash_index(node.columns[0])
+            table.create_sorted_index(node.columns[0])
+            self.index_columns[node.index_name] = (node.table_name, node.columns[0])
+            return 0
+        if isinstance(node, dropIndexNode):
+            table_name, column = self.index_columns.pop(node.index_name, (None, None))
+            if table_name in self.tables and column not in self.tables[table_name].primary_key:
+                self.tables[table_name].hash_indexes.pop(column, None)
+                self.tables[table_name].sorted_indexes.pop(column, None)
+            return 0
+        if isinstance(node, insertNode):
+            table = self.table(node.table_name)
+            if node.conflict:
+                raise ValueError("Upsert is not supported by the memory backend")
+            # Como um INSERT no banco: uma chave repetida desfaz as linhas já gravadas pelo comando
+            row_ids = []
+            try:
+                for row in [node.values] + node.rows:
+                    row_ids.append(table.insert({col: resolve(value, bindings) for col, value in row.items()}))
+            except ValueError:
+                table.delete(row_ids)
+                raise
+            return len(row_ids)
+        if isinstance(node, updateNode):
+            table = self.table(node.table_name)
+            row_ids = table.find(node.where, bindings)
+            table.update(row_ids, {col: resolve(value, bindings) for col, value in node.values.items()})
+            return len(row_ids)
+        if isinstance(node, deleteNode):
+            table = self.table(node.table_name)
+            row_ids = table.find(node.where, bindings)
+            table.delete(row_ids)
+            return len(row_ids)
+        raise ValueError(f"Node not supported by the memory backend: {node!r}")
+
+    def select(self, node: SelectNode, bindings: Dict[str, Any] = None):
+        return select_rows(self.table(node.table), node, bindings)
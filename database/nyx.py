@@ -1,9 +1,29 @@
-from typing import Dict, List
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Any, Dict, Iterable, List
 
-from database.compiler import SQLExecutor
+from database.compileCache import CompileCache
+from database.columnar import ColumnFetcher, ColumnInserter
+from database.compiler import CompiledQuery, SQLExecutor
+from database.connectionPool import ConnectionPool
+from database.fileExport import FileExporter
+from database.fileImport import FileImporter, ImportProgress
+from database.indexAdvisor import IndexAdvisor
 from database.nyxBuilder import NixQuery
-from database.parser import NixParser
+from database.parser import NixParser, Param, SelectNode, createIndexNode, deleteNode, dropIndexNode, insertNode, updateNode
+from database.queryRegistry import compile_dsl, registered_queries
+from database.queryPlan import FullScanError, FullScanWarning, QueryPlan
+from database.relatedLoader import RelatedLoader
+from database.replicaRouter import ReplicaRouter
+from database.resultCache import ResultCache
+from database.singleFlight import SingleFlight
+from database.tableCache import CachedTable, TableCache
 from database.semanticAnalyzer import SemanticAnalyzer
+from database.transaction import Transaction
+from database.writeBatcher import WriteBatcher
 
 
 class NixORM:
@@ -18,49 +38,100 @@ class NixORM:
     # Usando métodos (interface)
     result = db.get('users', 'id', 'name')
     result = db.getAll('users').where('id', '=', '1').limit(10)
+    
+    # Agregações (só as linhas agregadas saem do banco)
+    result = db.query("get('users', 'age').count().groupBy('age').having('count', '*', '>', '1')")
+    result = db.get('orders', 'user_id').sum('total').groupBy('user_id').execute()
+    found = db.get('users').where('id', '=', 1).exists().execute()
+    
+    # Update / delete em conjunto (retornam o número de linhas afetadas)
+    count = db.update('users').set(status='inactive').where('age', '<', 18).execute()
+    count = db.delete('users').where('id', '=', 1).execute()
+    count = db.update_many('users', [{'id': 1, 'age': 26}, {'id': 2, 'age': 31}])
+    count = db.upsert_many('users', rows, conflict=('id',), update=['age'])
+    
+    # Índices secundários
+    db.createIndex('users', 'idx_age').on('age', 'name').where('age', '>', 18).execute()
+    db.createTable('users').primaryKey('id').column('age', 'INTEGER').index('idx_age', 'age', unique=True).execute()
+    
+    # Joins (uma única query em vez de uma por linha)
+    result = db.get('users', 'users.name', 'orders.total').leftJoin('orders', 'users.id', 'orders.user_id').row_format('nested').execute()
+    
+    # Sem banco: tabelas em memória (testes, dados de referência)
+    db = NixORM(backend=MemoryBackend())
     """
     
-    def __init__(self, db_connection=None, schema: Dict[str, List[str]] = None):
+    def __init__(self, db_connection=None, schema: Dict[str, List[str]] = None, dialect: str = 'sqlite',
+                 backend=None):
         self.db_connection = db_connection
         self.schema = schema or {}
         self.parser = NixParser()
         self.semantic_analyzer = SemanticAnalyzer(schema)
-        self.sql_executor = SQLExecutor(db_connection)
+        self.sql_executor = SQLExecutor(db_connection, dialect)
+        self.sql_executor.backend = backend
         self._debug = False
+        self._full_scan_check = None
+        self._full_scan_min_rows = 0
+        self._workload = None
+        self._compile_cache = None
+        self._pool = None
+        self._pool_executor = None
+        # Serializa o uso da conexão principal por threads auxiliares (RelatedLoader)
+        self._connection_lock = threading.Lock()
     
     def set_debug(self, debug: bool = True):
         self._debug = debug
         return self
     
-    def add_table_schema(self, table: str, columns: List[str]):
+    def set_full_scan_check(self, mode: str = 'warn', min_rows: int = 1000):
+        """
+        Modo de desenvolvimento: antes de cada SELECT roda o explain e avisa ('warn')
+        ou falha ('raise') quando há full scan em tabela com mais de min_rows linhas.
+        mode=None desliga a verificação.
+        """
+        if mode not in ('warn', 'raise', None):
+            raise ValueError(f"Full scan check mode not supported: {mode}")
+        
+        self._full_scan_check = mode
+        self._full_scan_min_rows = min_rows
+        return self
+    
+    def add_table_schema(self, table: str, columns: List[str], primary_key: List[str] = None):
         self.schema[table] = columns
         self.semantic_analyzer.schema[table] = columns
+        if primary_key:
+            self.semantic_analyzer.primary_keys[table] = list(primary_key)
         return self
     
     # ==================== INTERFACE STRING  ====================
     
-    def query(self, query_string: str):
+    def query(self, query_string: str, row_format: str = None, params: Dict[str, Any] = None):
         """
         Usando
         
         Exemplos:
         db.query("get('users', 'id', 'name')")
         db.query("getAll('users').where('id', '=', '1')")
+        db.query("update('users').set('name', :name).where('id', '=', :id)", params={'name': 'Maria', 'id': 1})
+        db.query("get('users', 'name', 'orders.total').join('orders', 'users.id', 'orders.user_id')", row_format='nested')
         """
         
         if self._debug:
             print(f"[DEBUG] Parsing: {query_string}")
         
+        compiled = self._cached_query(query_string)
+        if compiled is not None:
+            return self.sql_executor.run(compiled, params, row_format)
+        
         try:
             ast_node = self.parser.parse(query_string)
         except Exception as e:
             raise SyntaxError(f"Erro de parsing: {e}")
+
+        if row_format and isinstance(ast_node, SelectNode):
+            ast_node.set_row_format(row_format)
         
-        if not self.semantic_analyzer.analyze(ast_node):
-            errors = self.semantic_analyzer.get_errors()
-            raise ValueError(f"Semantic errors {'; '.join(errors)}")
-        
-        return self.sql_executor.execute(ast_node, return_sql_only=False)
+        return self._execute_node(ast_node, bindings=params)
     
     def sql(self, query_string: str) -> str:
         """
@@ -72,11 +143,137 @@ class NixORM:
         
         ast_node = self.parser.parse(query_string)
         
-        if not self.semantic_analyzer.analyze(ast_node):
+        return self._execute_node(ast_node, return_sql_only=True) # type: ignore
+
+    def _execute_node(self, node, return_sql_only: bool = False, bindings: Dict[str, Any] = None):
+        self._analyze(node)
+        
+        if self._full_scan_check and not return_sql_only and isinstance(node, SelectNode):
+            self._check_full_scan(node, bindings)
+        
+        if self._workload is not None and not return_sql_only and isinstance(node, SelectNode):
+            self._workload.record(node, bindings)
+        
+        return self.sql_executor.execute(node, return_sql_only=return_sql_only, bindings=bindings)
+
+    def run(self, compiled: CompiledQuery, params: Dict[str, Any] = None, row_format: str = None):
+        """
+        Executa uma query já compilada (compile_query, cache ou módulo gerado por
+        python -m database.compile) sem passar pela DSL
+        
+        Exemplo:
+        import queries_compiled
+        db.run(queries_compiled.user_by_id, {'id': 1})
+        """
+        return self.sql_executor.run(compiled, params, row_format)
+    
+    def gather(self, queries: List, timeout: float = None) -> List:
+        """
+        Executa queries independentes ao mesmo tempo, cada uma numa conexão do pool
+        (enable_connection_pool), e devolve os resultados na ordem recebida. Tudo é
+        compilado antes de começar; timeout é o prazo do lote inteiro.
+        Sem pool, as queries rodam uma depois da outra na conexão principal e o timeout é
+        conferido entre elas.
+        
+        Exemplo:
+        db.enable_connection_pool(lambda: sqlite3.connect('app.db', check_same_thread=False), size=8)
+        users, orders, total = db.gather([
+            "getAll('users')",
+            ("getAll('orders').where('user_id', '=', :id)", {'id': 1}),
+            db.get('orders').sum('total'),
+        ], timeout=2.0)
+        """
+        statements = [self._gather_statement(item) for item in queries]
+        
+        if self._pool is None:
+            return self._gather_serial(statements, timeout)
+        
+        futures = [self._pool_executor.submit(self._run_pooled, compiled, params) for compiled, params in statements]
+        done, pending = wait(futures, timeout)
+        if pending:
+            for future in pending:
+                future.cancel()
+            raise TimeoutError(f"Gather deadline of {timeout}s exceeded: {len(pending)} of {len(futures)} queries unfinished")
+        
+        return [future.result() for future in futures]
+    
+    def _gather_serial(self, statements: List, timeout: float = None) -> List:
+        # Sem pool não dá para interromper uma query: o prazo é conferido depois de cada uma
+        deadline = None if timeout is None else time.monotonic() + timeout
+        results = []
+        for compiled, params in statements:
+            results.append(self.sql_executor.run(compiled, params))
+            if deadline is not None and time.monotonic() > deadline:
+                unfinished = len(statements) - len(results)
+                raise TimeoutError(f"Gather deadline of {timeout}s exceeded: {unfinished} of {len(statements)} queries not started")
+        return results
+    
+    def _gather_statement(self, item):
+        params = None
+        if isinstance(item, tuple):
+            item, params = item
+        
+        if isinstance(item, str):
+            return self.compile_query(item), params
+        if isinstance(item, NixQuery):
+            return item.compile(), params
+        if isinstance(item, CompiledQuery):
+            return item, params
+        raise ValueError(f"Query not supported on gather: {item!r}")
+    
+    def _run_pooled(self, compiled: CompiledQuery, params: Dict[str, Any] = None):
+        with self._pool.connection() as connection:
+            return self.sql_executor.with_connection(connection).run(compiled, params)
+    
+    def _cached_query(self, query_string: str):
+        # Com full scan check ou workload ligados a query passa pelo caminho completo
+        if self._compile_cache is None or not self.db_connection \
+                or self._full_scan_check or self._workload is not None:
+            return None
+        
+        compiled = self.compile_query(query_string)
+        # Leitura de tabela em cache (cache_table) passa pelo node, que a memória responde
+        table_cache = self.sql_executor.table_cache
+        if table_cache is not None and compiled.is_read() and table_cache.covers(compiled.read_tables):
+            return None
+        return compiled
+    
+    def compile_query(self, query_string: str) -> CompiledQuery:
+        """
+        Compila a query da DSL para um CompiledQuery (executado com db.run), usando o
+        cache de compilação quando ligado
+        
+        Exemplo:
+        user_by_id = db.compile_query("getAll('users').where('id', '=', :id)")
+        db.run(user_by_id, {'id': 1})
+        """
+        key = None
+        if self._compile_cache is not None:
+            key = self._compile_key(query_string)
+            compiled = self._compile_cache.get(key)
+            if compiled is not None:
+                return compiled
+        
+        try:
+            node = self.parser.parse(query_string)
+        except Exception as e:
+            raise SyntaxError(f"Erro de parsing: {e}")
+        
+        self._analyze(node)
+        compiled = self.sql_executor.compile_query(node)
+        
+        # DDL altera o schema: não vale a pena guardar
+        if key is not None and isinstance(node, (SelectNode, insertNode, updateNode, deleteNode)):
+            self._compile_cache.put(key, compiled)
+        return compiled
+    
+    def _compile_key(self, query_string: str) -> str:
+        return CompileCache.key(query_string, self.semantic_analyzer.schema_version(), self.sql_executor.dialect)
+    
+    def _analyze(self, node):
+        if not self.semantic_analyzer.analyze(node):
             errors = self.semantic_analyzer.get_errors()
             raise ValueError(f"Semantic errors {'; '.join(errors)}")
-        
-        return self.sql_executor.execute(ast_node, return_sql_only=True) # type: ignore
     
     # ==================== INTERFACE ====================
     
@@ -89,13 +286,556 @@ class NixORM:
     def insert(self, table_name: str):
         return NixQuery(self, 'INSERT', table_name, [])
 
+    def update(self, table_name: str):
+        return NixQuery(self, 'UPDATE', table_name, [])
+
+    def delete(self, table_name: str):
+        return NixQuery(self, 'DELETE', table_name, [])
+
+    def update_many(self, table: str, rows: List[Dict[str, Any]], key: str = None) -> int:
+        """
+        Atualiza várias linhas pela chave primária com executemany
+        (um comando por conjunto de colunas, não uma query por linha)
+        
+        Exemplo:
+        db.update_many('users', [{'id': 1, 'age': 26}, {'id': 2, 'age': 31}])
+        """
+        
+        if key is None:
+            primary_key = self.semantic_analyzer.get_primary_key(table)
+            if len(primary_key) != 1:
+                raise ValueError(f"Table '{table}' needs a single-column primary key or an explicit key")
+            key = primary_key[0]
+        
+        # Agrupa as linhas pelo conjunto de colunas para reaproveitar o mesmo SQL
+        batches: Dict[tuple, List[Dict[str, Any]]] = {}
+        for row in rows:
+            if key not in row:
+                raise ValueError(f"Row without key column '{key}': {row}")
+            columns = tuple(col for col in row if col != key)
+            batches.setdefault(columns, []).append(row)
+        
+        affected = 0
+        for columns, batch in batches.items():
+            if not columns:
+                continue
+            
+            node = updateNode(table)
+            for col in columns:
+                node.add_value(col, Param(col))
+            node.set_where({'ID': key, 'EQUALS': '=', 'NUMBER': Param(key)})
+            self._analyze(node)
+            
+            sql, params = self.sql_executor.compile(node)
+            affected += self.sql_executor.execute_many(
+                sql, [self.sql_executor.resolve_params(params, row) for row in batch], table
+            )
+        
+        return affected
+
+    def upsert_many(self, table: str, rows: List[Dict[str, Any]], conflict: Iterable[str] = None,
+                    update: Iterable[str] = None, batch_size: int = 500, multi_row: bool = False) -> int:
+        """
+        Insere ou atualiza várias linhas com INSERT ... ON CONFLICT ... DO UPDATE,
+        em lotes de executemany (ou VALUES com várias linhas se multi_row=True)
+        
+        Exemplo:
+        db.upsert_many('users', rows, conflict=('id',), update=['name', 'age'])
+        """
+        
+        rows = list(rows)
+        if not rows:
+            return 0
+        
+        conflict = list(conflict or self.semantic_analyzer.get_primary_key(table))
+        if not conflict:
+            raise ValueError(f"Table '{table}' has no primary key, inform the conflict columns")
+        
+        columns = list(rows[0].keys())
+        for row in rows:
+            if set(row.keys()) != set(columns):
+                raise ValueError("All rows of an upsert should have the same columns")
+        
+        if update is None:
+            update = [col for col in columns if col not in conflict]
+        
+        if multi_row:
+            # Limita as linhas por comando ao máximo de parâmetros do dialeto
+            max_params = self.sql_executor.DIALECTS[self.sql_executor.dialect]['max_params']
+            batch_size = max(1, min(batch_size, max_params // len(columns)))
+        
+        node = insertNode(table)
+        for col in columns:
+            node.add_value(col, Param(col))
+        node.set_conflict(conflict, update)
+        self._analyze(node)
+        sql, params = self.sql_executor.compile(node)
+        
+        affected = 0
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            
+            if multi_row:
+                node = insertNode(table)
+                for col in columns:
+                    node.add_value(col, batch[0][col])
+                for row in batch[1:]:
+                    node.add_row(row)
+                node.set_conflict(conflict, update)
+                affected += self._execute_node(node)
+            else:
+                affected += self.sql_executor.execute_many(
+                    sql, [self.sql_executor.resolve_params(params, row) for row in batch], table
+                )
+        
+        return affected
+
+    def transaction(self, isolation_level: str = None) -> Transaction:
+        """
+        Contexto de transação: COMMIT no fim, ROLLBACK em erro. Dentro de outra
+        transação vira um SAVEPOINT. isolation_level: 'DEFERRED', 'IMMEDIATE' ou
+        'EXCLUSIVE' no sqlite; 'READ COMMITTED', 'REPEATABLE READ'... no postgres.
+        
+        Exemplo:
+        with db.transaction():
+            db.update('accounts').set(balance=90).where('id', '=', 1).execute()
+            db.update('accounts').set(balance=110).where('id', '=', 2).execute()
+        """
+        return Transaction(self.sql_executor, isolation_level)
+    
+    def batch_commit(self, every: int = 1000, isolation_level: str = None) -> Transaction:
+        """
+        Transação que faz COMMIT a cada every comandos de escrita (e no fim)
+        
+        Exemplo:
+        with db.batch_commit(every=1000):
+            for row in rows:
+                db.insert('events').values(**row).execute()
+        """
+        return Transaction(self.sql_executor, isolation_level, batch_every=every)
+    
+    def import_file(self, table: str, path: str, format: str = None, batch_size: int = 5000,
+                    progress=None, atomic: bool = False, delimiter: str = ',', encoding: str = 'utf-8') -> ImportProgress:
+        """
+        Importa um CSV (com cabeçalho) ou JSONL em lotes de executemany, com memória
+        constante. Os valores são convertidos pelos tipos do schema (createTable ou
+        introspect). progress recebe um ImportProgress depois de cada lote.
+        
+        Exemplo:
+        stats = db.import_file('users', 'users.csv', batch_size=10000, progress=print)
+        stats.rows_per_second
+        """
+        return FileImporter(self, table, path, format, batch_size, progress, atomic, delimiter, encoding).run()
+    
+    def export(self, query, target, format: str = None, params: Dict[str, Any] = None, compression: str = None,
+               batch_size: int = 10000) -> int:
+        """
+        Grava o resultado da query em CSV ou JSONL direto do cursor, em lotes de
+        batch_size (ver FileExporter). Retorna o número de linhas exportadas.
+        
+        Exemplo:
+        db.export("getAll('orders')", 'orders.jsonl.gz')
+        db.export(db.get('users', 'id', 'name'), open('users.csv', 'w', newline=''), format='csv')
+        """
+        return FileExporter(self, self._compile_any(query), params, batch_size).write(target, format, compression)
+    
+    def fetch_columns(self, query, params: Dict[str, Any] = None, batch_size: int = 10000,
+                      use_numpy: bool = None) -> Dict[str, Any]:
+        """
+        Executa o SELECT e devolve {coluna: array} (array.array tipado ou NumPy, ver
+        ColumnFetcher), preenchido lote a lote do cursor
+        
+        Exemplo:
+        columns = db.fetch_columns("get('metrics', 'ts', 'value')")
+        total = sum(columns['value'])
+        """
+        compiled = self._compile_any(query)
+        # O tipo de cada agregação vem do node, não do nome da coluna
+        if isinstance(query, str):
+            aggregates = self.parser.parse(query).aggregates
+        elif isinstance(query, NixQuery):
+            aggregates = query._build_node().aggregates
+        else:
+            aggregates = None
+        return ColumnFetcher(self, compiled, params, batch_size, use_numpy, aggregates).fetch()
+    
+    def insert_columns(self, table: str, columns: Dict[str, Any], batch_size: int = 5000) -> int:
+        """
+        Insere colunas paralelas (listas, array.array ou arrays do NumPy) em lotes de
+        executemany (ver ColumnInserter). Retorna o número de linhas inseridas.
+        
+        Exemplo:
+        db.insert_columns('metrics', {'ts': ts_array, 'value': value_array})
+        """
+        return ColumnInserter(self, table, columns, batch_size).run()
+    
+    def _compile_any(self, query) -> CompiledQuery:
+        # DSL, builder ou query já compilada
+        if isinstance(query, str):
+            return self.compile_query(query)
+        if isinstance(query, NixQuery):
+            return query.compile()
+        return query
+    
+    def write_batcher(self, max_batch: int = 500, flush_interval: float = 0.05, max_queue: int = 10000,
+                      put_timeout: float = None, connection_factory=None) -> WriteBatcher:
+        """
+        Inserts em segundo plano, gravados em lotes (ver WriteBatcher)
+        
+        Exemplo:
+        batcher = db.write_batcher(max_batch=1000, connection_factory=lambda: sqlite3.connect('app.db'))
+        batcher.insert('events', name='click', user_id=1)
+        batcher.close()
+        """
+        return WriteBatcher(self, max_batch, flush_interval, max_queue, put_timeout, connection_factory)
+
     def createTable(self, table_name: str):
         return TableBuilder(self, table_name)
 
+    def createIndex(self, table_name: str, index_name: str):
+        return IndexBuilder(self, table_name, index_name)
+
+    def dropIndex(self, index_name: str):
+        return self._execute_node(dropIndexNode(index_name))
+
     def createDatabase(self, database_name: str):
         query_string = f"createDatabase('{database_name}')"
         return self.query(query_string)
 
+    # ==================== CACHE ====================
+
+    def enable_result_cache(self, ttl: float = 60.0, max_bytes: int = 64 * 1024 * 1024) -> ResultCache:
+        """
+        Guarda o resultado dos SELECTs por (SQL, parâmetros). Insert, update, delete e DDL
+        feitos pelo ORM invalidam as entradas das tabelas alteradas; escritas fora do ORM
+        só aparecem depois do TTL.
+        
+        Exemplo:
+        db.enable_result_cache(ttl=30)
+        db.get_cache_stats()
+        """
+        
+        self.sql_executor.result_cache = ResultCache(ttl, max_bytes)
+        return self.sql_executor.result_cache
+
+    def disable_result_cache(self):
+        self.sql_executor.result_cache = None
+        return self
+
+    def enable_connection_pool(self, factory, size: int = 5, timeout: float = None) -> ConnectionPool:
+        """
+        Pool de conexões extras usado pelo gather. factory cria uma conexão nova; no
+        sqlite use check_same_thread=False, já que cada query roda numa thread do pool.
+        
+        Exemplo:
+        db.enable_connection_pool(lambda: sqlite3.connect('app.db', check_same_thread=False), size=8)
+        """
+        self.disable_connection_pool()
+        self._pool = ConnectionPool(factory, size, timeout)
+        self._pool_executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix='nix-gather')
+        return self._pool
+    
+    def disable_connection_pool(self):
+        if self._pool is not None:
+            self._pool_executor.shutdown(wait=True)
+            self._pool.close()
+        self._pool = None
+        self._pool_executor = None
+        return self
+
+    @classmethod
+    def with_replicas(cls, primary_factory, replica_factories: List, schema: Dict[str, List[str]] = None,
+                      dialect: str = 'sqlite', **options) -> 'NixORM':
+        """
+        NixORM com a conexão criada por primary_factory para escritas e DDL e as
+        réplicas para leituras (options vão para enable_read_replicas)
+        
+        Exemplo:
+        db = NixORM.with_replicas(
+            lambda: sqlite3.connect('primary.db', check_same_thread=False),
+            [lambda: sqlite3.connect('replica_1.db', check_same_thread=False)],
+            strategy='least_outstanding', pin_window=2.0
+        )
+        """
+        orm = cls(primary_factory(), schema, dialect)
+        orm.enable_read_replicas(replica_factories, **options)
+        return orm
+    
+    def enable_read_replicas(self, factories: List, strategy: str = 'round_robin', pin_window: float = 1.0,
+                             pool_size: int = 5) -> ReplicaRouter:
+        """
+        SELECTs passam a ser distribuídos entre as réplicas ('round_robin' ou
+        'least_outstanding'); insert, update, delete e DDL continuam no primário.
+        Depois de escrever, a sessão (thread ou task do asyncio) lê do primário por
+        pin_window segundos.
+        """
+        self.disable_read_replicas()
+        self.sql_executor.replicas = ReplicaRouter(factories, strategy, pin_window, pool_size)
+        return self.sql_executor.replicas
+    
+    def disable_read_replicas(self):
+        if self.sql_executor.replicas is not None:
+            self.sql_executor.replicas.close()
+        self.sql_executor.replicas = None
+        return self
+
+    def enable_single_flight(self, timeout: float = 30.0) -> SingleFlight:
+        """
+        SELECTs idênticos (mesmo SQL e parâmetros) executados ao mesmo tempo viram uma
+        única ida ao banco; os demais esperam até timeout segundos pelo resultado.
+        
+        Exemplo:
+        db.enable_single_flight(timeout=5)
+        """
+        
+        self.sql_executor.single_flight = SingleFlight(timeout)
+        return self.sql_executor.single_flight
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        cache = self.sql_executor.result_cache
+        return cache.stats() if cache is not None else {}
+
+    def cache_table(self, table: str, key: str = 'id', indexes: Iterable[str] = (), ttl: float = None,
+                    version=None, check_interval: float = 1.0) -> CachedTable:
+        """
+        Carrega a tabela inteira em memória, com índice na chave e nas colunas de indexes.
+        get/getAll da tabela (where, orderBy, limit, exists) passam a ser respondidos sem
+        ir ao banco. Escritas feitas pelo ORM recarregam a cópia na próxima leitura; para
+        escritas de fora use ttl (segundos) ou version, uma função cujo valor muda junto
+        com a tabela (consultada no máximo a cada check_interval segundos).
+        Queries já compiladas executadas com db.run continuam indo ao banco.
+        
+        Exemplo:
+        plans = db.cache_table('plans', key='id', indexes=['code'])
+        db.getAll('plans').where('code', '=', 'pro').execute()
+        plans.get(1)
+        
+        # Mudanças de outros processos no sqlite
+        db.cache_table('countries', key='code', version=lambda: conn.execute('PRAGMA data_version').fetchone()[0])
+        """
+        if not self.db_connection:
+            raise RuntimeError("Table cache requires a database connection")
+        
+        if self.sql_executor.table_cache is None:
+            self.sql_executor.table_cache = TableCache()
+        
+        # Os tipos das colunas fazem a memória comparar valores como o banco ('1' acha o id 1)
+        types = self.semantic_analyzer.get_column_types(table)
+        if not types and self.sql_executor.dialect == 'sqlite':
+            self.introspect(table)
+            types = self.semantic_analyzer.get_column_types(table)
+        
+        cached = CachedTable(self.sql_executor, table, key, indexes, ttl, version, check_interval, types=types)
+        cached.load()
+        return self.sql_executor.table_cache.add(cached)
+    
+    def uncache_table(self, table: str):
+        if self.sql_executor.table_cache is not None:
+            self.sql_executor.table_cache.remove(table)
+        return self
+    
+    def get_table_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        table_cache = self.sql_executor.table_cache
+        return table_cache.stats() if table_cache is not None else {}
+
+    def enable_compile_cache(self, path: str = None, max_entries: int = 10000) -> CompileCache:
+        """
+        Guarda as queries da DSL já compiladas (parser + analisador + SQL). Com path as
+        entradas ficam num arquivo sqlite e um processo novo já começa com o cache quente.
+        
+        Exemplo:
+        db.enable_compile_cache('.cache/nix_queries.db')
+        db.query("getAll('users').where('id', '=', :id)", params={'id': 1})
+        """
+        if self._compile_cache is not None:
+            self._compile_cache.close()
+        self._compile_cache = CompileCache(path, max_entries)
+        return self._compile_cache
+    
+    def disable_compile_cache(self):
+        if self._compile_cache is not None:
+            self._compile_cache.close()
+        self._compile_cache = None
+        return self
+
+    def warmup(self, queries: Iterable[str] = None, workers: int = None, processes: bool = False) -> int:
+        """
+        Compila de uma vez as queries conhecidas (por padrão as registradas com @nix_query)
+        e guarda no cache de compilação. Erros de sintaxe ou de schema aparecem aqui, no
+        startup, todos juntos. workers > 1 divide o trabalho num pool de threads
+        (processes=True usa processos, melhor para registros grandes).
+        
+        Exemplo:
+        db.warmup()
+        db.warmup(["getAll('users').where('id', '=', :id)"], workers=4, processes=True)
+        """
+        queries = list(dict.fromkeys(registered_queries() if queries is None else queries))
+        if self._compile_cache is None:
+            self.enable_compile_cache()
+        
+        analyzer = self.semantic_analyzer
+        state = {
+            'schema': analyzer.schema,
+            'primary_keys': analyzer.primary_keys,
+            'indexes': analyzer.indexes,
+            'column_types': analyzer.column_types
+        }
+        dialect = self.sql_executor.dialect
+        
+        if workers and workers > 1:
+            pool_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+            with pool_class(max_workers=workers) as pool:
+                futures = [pool.submit(compile_dsl, dsl, state, dialect) for dsl in queries]
+                results = {dsl: self._warmup_result(future.result) for dsl, future in zip(queries, futures)}
+        else:
+            results = {dsl: self._warmup_result(partial(compile_dsl, dsl, state, dialect)) for dsl in queries}
+        
+        errors = [f"{dsl}: {error}" for dsl, error in results.items() if isinstance(error, BaseException)]
+        if errors:
+            raise ValueError(f"Warmup failed for {len(errors)} of {len(queries)} queries: {'; '.join(errors)}")
+        
+        schema_version = analyzer.schema_version()
+        entries = {
+            CompileCache.key(dsl, schema_version, dialect): CompiledQuery.fromDict(data)
+            for dsl, data in results.items() if data is not None
+        }
+        self._compile_cache.put_many(entries)
+        return len(entries)
+
+    @staticmethod
+    def _warmup_result(outcome):
+        # Junta os erros para mostrar todos de uma vez em vez de parar no primeiro
+        try:
+            return outcome()
+        except (Exception, SystemExit) as e:
+            return e
+
+    # ==================== PLANO DE EXECUÇÃO ====================
+    
+    def explain(self, query, params: Dict[str, Any] = None) -> QueryPlan:
+        """
+        Plano de execução da query (string da DSL ou NixQuery)
+        
+        Exemplo:
+        plan = db.explain("get('users').where('age', '>', '18')")
+        plan.full_scans()  # -> ['users']
+        """
+        
+        node = self.parser.parse(query) if isinstance(query, str) else query._build_node()
+        self._analyze(node)
+        return self.sql_executor.explain(node, params)
+
+    def _check_full_scan(self, node, bindings: Dict[str, Any] = None):
+        plan = self.sql_executor.explain(node, bindings)
+        
+        for table in set(plan.full_scans()):
+            count_node = SelectNode(table)
+            count_node.add_aggregate('count')
+            rows = self.sql_executor.execute(count_node, return_sql_only=False)[0]['count']
+            if rows <= self._full_scan_min_rows:
+                continue
+            
+            message = f"Full table scan on '{table}' ({rows} rows): {plan.sql}"
+            if self._full_scan_check == 'raise':
+                raise FullScanError(message)
+            warnings.warn(message, FullScanWarning, stacklevel=3)
+
+    def record_workload(self, enabled: bool = True) -> IndexAdvisor:
+        """
+        Passa a registrar os SELECTs executados para o advisor de índices
+        
+        Exemplo:
+        advisor = db.record_workload()
+        ...
+        advisor.recommend(top=3, measure=True)
+        """
+        
+        if not enabled:
+            self._workload = None
+        elif self._workload is None:
+            self._workload = IndexAdvisor(self)
+        return self._workload
+
+    # ==================== RELACIONAMENTOS ====================
+
+    def load_related(self, table: str, foreign_key: str, parent_ids: Iterable, columns: List[str] = None,
+                     batch_size: int = 500) -> Dict[Any, List[Dict]]:
+        """
+        Carrega as linhas filhas de vários pais com uma query IN por lote,
+        em vez de uma query por pai (N+1)
+        
+        Exemplo:
+        orders = db.load_related('orders', 'user_id', [user['id'] for user in users])
+        orders[1]  # -> [{'id': 10, 'user_id': 1, ...}, ...]
+        """
+        
+        keys = list(dict.fromkeys(key for key in parent_ids if key is not None))
+        grouped = {key: [] for key in keys}
+        
+        if columns and foreign_key not in columns:
+            columns = list(columns) + [foreign_key]
+        
+        for start in range(0, len(keys), batch_size):
+            node = SelectNode(table, columns or ['*'])
+            node.set_where({
+                'ID': foreign_key,
+                'EQUALS': 'IN',
+                'NUMBER': keys[start:start + batch_size]
+            })
+            
+            for row in self._execute_node(node):
+                grouped.setdefault(row[foreign_key], []).append(row)
+        
+        return grouped
+
+    def _related_statements(self, table: str, foreign_key: str, keys: List, columns: List[str] = None,
+                            batch_size: int = 500) -> List[CompiledQuery]:
+        # Análise e SQL do load_related sem executar (o RelatedLoader roda isso na thread do loop)
+        if columns and foreign_key not in columns:
+            columns = list(columns) + [foreign_key]
+        
+        statements = []
+        for start in range(0, len(keys), batch_size):
+            node = SelectNode(table, columns or ['*'])
+            node.set_where({'ID': foreign_key, 'EQUALS': 'IN', 'NUMBER': keys[start:start + batch_size]})
+            self._analyze(node)
+            statements.append(self.sql_executor.compile_query(node))
+        return statements
+    
+    def related_loader(self, table: str, foreign_key: str, columns: List[str] = None, batch_size: int = 500,
+                       executor=None):
+        """
+        Versão async: chamadas de load() feitas no mesmo tick do event loop
+        viram uma única query, executada numa thread de executor (padrão: a do loop)
+        
+        Exemplo:
+        loader = db.related_loader('orders', 'user_id')
+        orders = await asyncio.gather(*(loader.load(user['id']) for user in users))
+        """
+        
+        return RelatedLoader(self, table, foreign_key, columns, batch_size, executor)
+
+    def introspect(self, *tables: str):
+        """
+        Carrega o schema (colunas, tipos, chave primária e índices) direto do banco
+        
+        Exemplo:
+        db.introspect()            # todas as tabelas
+        db.introspect('users')
+        """
+        
+        for table in tables or self.sql_executor.list_tables():
+            info = self.sql_executor.introspect(table)
+            self.add_table_schema(table, info['columns'], info['primary_key'])
+            self.semantic_analyzer.column_types[table] = info['types']
+            
+            for name, index in self.semantic_analyzer.get_indexes(table).items():
+                if name not in info['indexes']:
+                    del self.semantic_analyzer.indexes[name]
+            self.semantic_analyzer.indexes.update(info['indexes'])
+        
+        return self
+
     def get_schema(self):
         return self.semantic_analyzer.get_schema()
 
@@ -107,6 +847,7 @@ class TableBuilder:
         self.orm = orm_instance
         self.table_name = table_name
         self._columns = []
+        self._indexes = []
     
     def column(self, name: str, data_type: str, *constraints):
         column_def = {
@@ -128,6 +869,19 @@ class TableBuilder:
     def primaryKey(self, column_name: str, data_type: str = 'INTEGER'):
         return self.column(column_name, data_type, 'primarykey', 'autoincrement')
     
+    def index(self, index_name: str, *columns: str, unique: bool = False, where: tuple = None, include: List[str] = None):
+        """Índice secundário criado logo depois da tabela: .index('idx_age', 'age', where=('age', '>', 18))"""
+        index = IndexBuilder(self.orm, self.table_name, index_name).on(*columns)
+        if unique:
+            index.unique()
+        if where:
+            index.where(*where)
+        if include:
+            index.include(*include)
+        
+        self._indexes.append(index)
+        return self
+    
     def execute(self):
         from database.parser import createTableNode
         
@@ -135,11 +889,10 @@ class TableBuilder:
         for col in self._columns:
             node.add_column(col)
         
-        if not self.orm.semantic_analyzer.analyze(node):
-            errors = self.orm.semantic_analyzer.get_errors()
-            raise ValueError(f"Semantic errors {'; '.join(errors)}")
-        
-        return self.orm.sql_executor.execute(node, return_sql_only=False)
+        result = self.orm._execute_node(node, return_sql_only=False)
+        for index in self._indexes:
+            index.execute()
+        return result
     
     def sql(self) -> str:
         from database.parser import createTableNode
@@ -148,11 +901,56 @@ class TableBuilder:
         for col in self._columns:
             node.add_column(col)
         
-        if not self.orm.semantic_analyzer.analyze(node):
-            errors = self.orm.semantic_analyzer.get_errors()
-            raise ValueError(f"Semantic errors {'; '.join(errors)}")
-        
-        return self.orm.sql_executor.execute(node, return_sql_only=True)
+        statements = [self.orm._execute_node(node, return_sql_only=True)]
+        statements += [index.sql() for index in self._indexes]
+        return '\n'.join(statements)
+
+
+class IndexBuilder:
+    def __init__(self, orm_instance, table_name: str, index_name: str):
+        self.orm = orm_instance
+        self.table_name = table_name
+        self.index_name = index_name
+        self._columns = []
+        self._include = []
+        self._unique = False
+        self._where = None
+    
+    def on(self, *columns: str):
+        self._columns.extend(columns)
+        return self
+    
+    def unique(self):
+        self._unique = True
+        return self
+    
+    def where(self, column: str, operator: str, value: Any):
+        self._where = {
+            'ID': column,
+            'EQUALS': operator,
+            'NUMBER': value
+        }
+        return self
+    
+    def include(self, *columns: str):
+        self._include.extend(columns)
+        return self
+    
+    def _build_node(self):
+        node = createIndexNode(self.table_name, self.index_name)
+        node.set_columns(self._columns)
+        node.set_include(self._include)
+        if self._unique:
+            node.set_unique()
+        if self._where:
+            node.set_where(self._where)
+        return node
+    
+    def execute(self):
+        return self.orm._execute_node(self._build_node(), return_sql_only=False)
+    
+    def sql(self) -> str:
+        return self.orm._execute_node(self._build_node(), return_sql_only=True)
 
 
 
@@ -170,6 +968,7 @@ if __name__ == "__main__":
                .column('name', 'VARCHAR', '100', 'notnull')\
                .column('email', 'VARCHAR', '255', 'unique')\
                .column('age', 'INTEGER')\
+               .index('idx_users_age', 'age')\
                .sql()
         print(f"SQL: {sql}")
         
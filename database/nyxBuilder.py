@@ -1,5 +1,5 @@
 from typing import List, Any, Union
-from database.parser import SelectNode, insertNode
+from database.parser import SelectNode, insertNode, updateNode, deleteNode, numeric_literal
 
 class NixQuery:
     def __init__(self, orm_instance, query_type: str, table: str, columns: List[str]):
@@ -10,8 +10,18 @@ class NixQuery:
         self._where_conditions = []
         self._limit_value = None
         self._values = {}
+        self._aggregates = []
+        self._group_by = []
+        self._having = None
+        self._exists = False
+        self._joins = []
+        self._row_format = 'flat'
+        self._order_by = []
     
     def where(self, column: str, operator: str, value: Any):
+        # Sem suporte a AND: um segundo where seria ignorado (num delete, apagaria linhas demais)
+        if self._where_conditions:
+            raise ValueError("Only one where() per query is supported, combining conditions (AND) is not")
         self._where_conditions.append({
             'ID': column,
             'EQUALS': operator, 
@@ -23,28 +33,102 @@ class NixQuery:
         self._limit_value = count
         return self
     
+    def orderBy(self, column: str, direction: str = 'ASC'):
+        self._order_by.append((column, direction))
+        return self
+    
+    def count(self, column: str = '*', alias: str = None):
+        return self._aggregate('count', column, alias)
+
+    def countDistinct(self, column: str, alias: str = None):
+        return self._aggregate('countDistinct', column, alias)
+
+    def sum(self, column: str, alias: str = None):
+        return self._aggregate('sum', column, alias)
+
+    def avg(self, column: str, alias: str = None):
+        return self._aggregate('avg', column, alias)
+
+    def min(self, column: str, alias: str = None):
+        return self._aggregate('min', column, alias)
+
+    def max(self, column: str, alias: str = None):
+        return self._aggregate('max', column, alias)
+
+    def _aggregate(self, function: str, column: str, alias: str):
+        self._aggregates.append((function, column, alias))
+        return self
+
+    def groupBy(self, *columns: str):
+        self._group_by.extend(columns)
+        return self
+
+    def having(self, function: str, column: str, operator: str, value: Any):
+        # Como na DSL: agregação não tem afinidade no sqlite, '0' precisa ir como número
+        if isinstance(value, (list, tuple)):
+            value = [numeric_literal(item) for item in value]
+        self._having = {
+            'FUNC': function,
+            'ID': column,
+            'EQUALS': operator,
+            'NUMBER': numeric_literal(value)
+        }
+        return self
+
+    def exists(self):
+        self._exists = True
+        return self
+    
+    def join(self, table: str, left: str, right: str):
+        self._joins.append(('INNER', table, left, right))
+        return self
+
+    def leftJoin(self, table: str, left: str, right: str):
+        self._joins.append(('LEFT', table, left, right))
+        return self
+
+    def rightJoin(self, table: str, left: str, right: str):
+        self._joins.append(('RIGHT', table, left, right))
+        return self
+
+    def row_format(self, row_format: str):
+        """'flat' -> {'users.name': ...} | 'nested' -> {'users': {'name': ...}}"""
+        self._row_format = row_format
+        return self
+    
     def values(self, **kwargs):
         self._values.update(kwargs)
         return self
     
+    def set(self, **kwargs):
+        self._values.update(kwargs)
+        return self
+    
     def execute(self):
         node = self._build_node()
         
-        if not self.orm.semantic_analyzer.analyze(node):
-            errors = self.orm.semantic_analyzer.get_errors()
-            raise ValueError(f"Semantic errors: {'; '.join(errors)}")
-        
         # Executar
-        return self.orm.sql_executor.execute(node, return_sql_only=False)
+        return self.orm._execute_node(node, return_sql_only=False)
+    
+    def compile(self):
+        """CompiledQuery da query montada, para db.run ou db.gather"""
+        node = self._build_node()
+        self.orm._analyze(node)
+        return self.orm.sql_executor.compile_query(node)
+    
+    def export(self, target, format: str = None, compression: str = None, batch_size: int = 10000) -> int:
+        return self.orm.export(self, target, format, compression=compression, batch_size=batch_size)
+    
+    def fetch_columns(self, batch_size: int = 10000, use_numpy: bool = None):
+        return self.orm.fetch_columns(self, batch_size=batch_size, use_numpy=use_numpy)
     
     def sql(self) -> str:
         node = self._build_node()
         
-        if not self.orm.semantic_analyzer.analyze(node):
-            errors = self.orm.semantic_analyzer.get_errors()
-            raise ValueError(f"Semantic errors: {'; '.join(errors)}")
-        
-        return self.orm.sql_executor.execute(node, return_sql_only=True)
+        return self.orm._execute_node(node, return_sql_only=True)
+    
+    def explain(self):
+        return self.orm.explain(self)
     
     def _build_node(self):
         if self.query_type in ['GET', 'GETALL']:
@@ -55,6 +139,26 @@ class NixQuery:
             
             if self._limit_value:
                 node.set_limit(self._limit_value)
+
+            for function, column, alias in self._aggregates:
+                node.add_aggregate(function, column, alias)
+
+            if self._group_by:
+                node.set_group_by(self._group_by)
+
+            if self._having:
+                node.set_having(self._having)
+
+            if self._exists:
+                node.set_exists()
+
+            for join_type, table, left, right in self._joins:
+                node.add_join(join_type, table, left, right)
+
+            node.set_row_format(self._row_format)
+
+            for column, direction in self._order_by:
+                node.add_order_by(column, direction)
             
             return node
         
@@ -64,5 +168,19 @@ class NixQuery:
                 node.add_value(col, val)
             return node
         
+        elif self.query_type == 'UPDATE':
+            node = updateNode(self.table)
+            for col, val in self._values.items():
+                node.add_value(col, val)
+            if self._where_conditions:
+                node.set_where(self._where_conditions[0])
+            return node
+        
+        elif self.query_type == 'DELETE':
+            node = deleteNode(self.table)
+            if self._where_conditions:
+                node.set_where(self._where_conditions[0])
+            return node
+        
         else:
             raise ValueError(f"Type Node not supported:  {self.query_type}")
\ No newline at end of file
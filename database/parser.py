@@ -1,13 +1,66 @@
 from database.lexer import NixLexer
+import re
 import sys
+from typing import Any
 
 # Parser com base nos conteúdos de aula, pois fornece um melhor controle sobre o parseamento das classes
 # Como ele trabalha a apartir dos tokens definidos a MV vai gerar um sql equivalente 
 
+# Funções de agregação aceitas pela DSL (nome na DSL -> função SQL)
+AGGREGATE_FUNCTIONS = {
+    'count': 'COUNT',
+    'countDistinct': 'COUNT',
+    'sum': 'SUM',
+    'avg': 'AVG',
+    'min': 'MIN',
+    'max': 'MAX',
+}
+
+AGGREGATE_TOKENS = {
+    'COUNT': 'count',
+    'COUNTDISTINCT': 'countDistinct',
+    'SUM': 'sum',
+    'AVG': 'avg',
+    'MIN': 'min',
+    'MAX': 'max',
+}
+
+# Tipos de join da DSL -> SQL
+JOIN_TYPES = {
+    'JOIN': 'INNER',
+    'LEFTJOIN': 'LEFT',
+    'RIGHTJOIN': 'RIGHT',
+}
+
+ROW_FORMATS = ('flat', 'nested')
+
+
+def aggregate_alias(function, column):
+    if column == '*':
+        return function.lower()
+    prefix = 'count_distinct' if function == 'countDistinct' else function.lower()
+    return f'{prefix}_{column.split(".")[-1]}'
+
+
 class Node:
     def toDict(self):
         return self.__dict__
 
+
+# Valor informado apenas na execução: ':nome' na DSL
+class Param:
+    def __init__(self, name):
+        self.name = name
+
+    def __eq__(self, other):
+        return isinstance(other, Param) and other.name == self.name
+
+    def __hash__(self):
+        return hash((Param, self.name))
+
+    def __repr__(self):
+        return f':{self.name}'
+
 # Criando arvore de símbolos
 class SelectNode(Node):
     def __init__(self, table, columns=None):
@@ -16,6 +69,13 @@ class SelectNode(Node):
         self.columns = columns or ['*']
         self.where = None
         self.limit = None
+        self.aggregates = []
+        self.group_by = []
+        self.having = None
+        self.exists = False
+        self.joins = []
+        self.row_format = 'flat'
+        self.order_by = []
     
 
     def set_where(self, condition):
@@ -23,9 +83,41 @@ class SelectNode(Node):
     
     def set_limit(self, limit):
         self.limit = limit
+
+    def add_aggregate(self, function, column='*', alias=None):
+        self.aggregates.append({
+            'function': function,
+            'column': column,
+            'alias': alias or aggregate_alias(function, column)
+        })
+
+    def set_group_by(self, columns):
+        self.group_by = list(columns)
+
+    def set_having(self, condition):
+        self.having = condition
+
+    def set_exists(self):
+        self.exists = True
+
+    def add_join(self, join_type, table, left, right):
+        self.joins.append({
+            'type': join_type,
+            'table': table,
+            'left': left,
+            'right': right
+        })
+
+    def set_row_format(self, row_format):
+        self.row_format = row_format
+
+    def add_order_by(self, column, direction='ASC'):
+        self.order_by.append((column, direction.upper()))
     
     def __repr__(self):
-        return f'<Selected Node: table_name={self.table} and columns name {self.columns} where={self.where} limit={self.limit}>'
+        return (f'<Selected Node: table_name={self.table} and columns name {self.columns} where={self.where} limit={self.limit}'
+                f' aggregates={self.aggregates} group_by={self.group_by} having={self.having} exists={self.exists}'
+                f' joins={self.joins} order_by={self.order_by}>')
 
 
 class createTableNode(Node):
@@ -50,17 +142,103 @@ class CreateDatabaseNode(Node):
         return f'<CreateDatabaseNode: {self.database_name}>'
 
 
+class createIndexNode(Node):
+    def __init__(self, table_name, index_name):
+        self.type = "CREATE INDEX"
+        self.table_name = table_name
+        self.index_name = index_name
+        self.columns = []
+        self.unique = False
+        self.where = None
+        self.include = []
+    
+    def set_columns(self, columns):
+        self.columns = list(columns)
+    
+    def set_unique(self):
+        self.unique = True
+    
+    def set_where(self, condition):
+        self.where = condition
+    
+    def set_include(self, columns):
+        self.include = list(columns)
+    
+    def __repr__(self) -> str:
+        return (f'<CreateIndexNode: name={self.index_name} table={self.table_name} columns={self.columns}'
+                f' unique={self.unique} where={self.where} include={self.include}>')
+
+
+class dropIndexNode(Node):
+    def __init__(self, index_name):
+        self.type = "DROP INDEX"
+        self.index_name = index_name
+    
+    def __repr__(self) -> str:
+        return f'<DropIndexNode: {self.index_name}>'
+
+
 class insertNode(Node):
     def __init__(self, table_name):
         self.type = 'INSERT'
         self.table_name = table_name
         self.values = {}
+        self.rows = []
+        self.conflict = []
+        self.update_columns = []
     
     def add_value(self, column, value):
         self.values[column] = value
     
+    def add_row(self, values):
+        # Linhas extras do mesmo INSERT (VALUES com várias linhas)
+        self.rows.append(dict(values))
+    
+    def set_conflict(self, columns, update_columns):
+        self.conflict = list(columns)
+        self.update_columns = list(update_columns)
+    
     def __repr__(self):
-        return f'<InsertNode: table={self.table_name} values={self.values}>'
+        return f'<InsertNode: table={self.table_name} values={self.values} rows={len(self.rows) + 1} conflict={self.conflict}>'
+
+class updateNode(Node):
+    def __init__(self, table_name):
+        self.type = 'UPDATE'
+        self.table_name = table_name
+        self.values = {}
+        self.where = None
+    
+    def add_value(self, column, value):
+        self.values[column] = value
+    
+    def set_where(self, condition):
+        self.where = condition
+    
+    def __repr__(self):
+        return f'<UpdateNode: table={self.table_name} values={self.values} where={self.where}>'
+
+
+class deleteNode(Node):
+    def __init__(self, table_name):
+        self.type = 'DELETE'
+        self.table_name = table_name
+        self.where = None
+    
+    def set_where(self, condition):
+        self.where = condition
+    
+    def __repr__(self):
+        return f'<DeleteNode: table={self.table_name} where={self.where}>'
+
+def numeric_literal(value: Any) -> Any:
+    """'10' -> 10, '1.5' -> 1.5; o resto fica como está. Usado no having, onde o sqlite não converte"""
+    if isinstance(value, str):
+        if re.fullmatch(r'-?\d+', value):
+            return int(value)
+        if re.fullmatch(r'-?\d+\.\d+', value):
+            return float(value)
+    return value
+
 
 class NixParser:
     def __init__(self):
@@ -92,8 +270,16 @@ class NixParser:
             return self.parse_create_database()
         elif self.lookAhead.type == 'CREATETABLE':
             return self.parse_create_table()
+        elif self.lookAhead.type == 'CREATEINDEX':
+            return self.parse_create_index()
+        elif self.lookAhead.type == 'DROPINDEX':
+            return self.parse_drop_index()
         elif self.lookAhead.type == 'INSERT':
             return self.parse_insert()
+        elif self.lookAhead.type == 'UPDATE':
+            return self.parse_update()
+        elif self.lookAhead.type == 'DELETE':
+            return self.parse_delete()
         elif self.lookAhead.type == 'GETALL':
             return self.parse_getAll()
         elif self.lookAhead.type == 'GET':
@@ -158,6 +344,51 @@ class NixParser:
         
         return node
     
+    def parse_create_index(self):
+        self.match("CREATEINDEX")
+        self.match("LPAREN")
+        table_name = self.match("STRING").value
+        self.match("COMMA")
+        index_name = self.match("STRING").value
+        self.match("RPAREN")
+        
+        node = createIndexNode(table_name, index_name)
+        
+        while self.lookAhead and self.lookAhead.type == "DOT":
+            self.match("DOT")
+            if self.lookAhead.type == "ON":
+                self.match("ON")
+                self.match("LPAREN")
+                node.set_columns(self._parse_string_list())
+                self.match("RPAREN")
+            elif self.lookAhead.type == "INCLUDE":
+                self.match("INCLUDE")
+                self.match("LPAREN")
+                node.set_include(self._parse_string_list())
+                self.match("RPAREN")
+            elif self.lookAhead.type == "UNIQUE":
+                self.match("UNIQUE")
+                self.match("LPAREN")
+                self.match("RPAREN")
+                node.set_unique()
+            elif self.lookAhead.type == "WHERE":
+                self._parse_where(node)
+            else:
+                raise SyntaxError("Método encadeado não reconhecido")
+        
+        self.symbols.append(node)
+        return node
+    
+    def parse_drop_index(self):
+        self.match("DROPINDEX")
+        self.match("LPAREN")
+        index_name = self.match("STRING").value
+        self.match("RPAREN")
+        
+        node = dropIndexNode(index_name)
+        self.symbols.append(node)
+        return node
+    
     def _parse_column_definition(self):
         self.match("COLUMN")
         self.match("LPAREN")
@@ -206,14 +437,60 @@ class NixParser:
         self.symbols.append(node)
         return node
     
-    def _parse_values(self, node):
-        self.match("VALUES")
+    def parse_update(self):
+        self.match("UPDATE")
+        self.match("LPAREN")
+        table_name = self.match("STRING").value
+        self.match("RPAREN")
+        
+        node = updateNode(table_name)
+        
+        while self.lookAhead and self.lookAhead.type == "DOT":
+            self.match("DOT")
+            if self.lookAhead.type == "SET":
+                self._parse_values(node, "SET")
+            elif self.lookAhead.type == "WHERE":
+                self._parse_where(node)
+            else:
+                raise SyntaxError("Método encadeado não reconhecido")
+        
+        self.symbols.append(node)
+        return node
+    
+    def parse_delete(self):
+        self.match("DELETE")
+        self.match("LPAREN")
+        table_name = self.match("STRING").value
+        self.match("RPAREN")
+        
+        node = deleteNode(table_name)
+        
+        while self.lookAhead and self.lookAhead.type == "DOT":
+            self.match("DOT")
+            if self.lookAhead.type == "WHERE":
+                self._parse_where(node)
+            else:
+                raise SyntaxError("Método encadeado não reconhecido")
+        
+        self.symbols.append(node)
+        return node
+    
+    def _parse_where(self, node):
+        if node.where is not None:
+            raise SyntaxError("Only one where() per query is supported")
+        self.match("WHERE")
+        self.match("LPAREN")
+        node.set_where(self._parse_condition())
+        self.match("RPAREN")
+    
+    def _parse_values(self, node, keyword="VALUES"):
+        self.match(keyword)
         self.match("LPAREN")
         
         while True:
             column = self.match("STRING").value
             self.match("COMMA")
-            value = self.match("STRING").value
+            value = self._parse_value()
             
             node.add_value(column, value)
             
@@ -228,29 +505,98 @@ class NixParser:
         while self.lookAhead and self.lookAhead.type == "DOT":
             self.match("DOT")
             if self.lookAhead.type == "WHERE":
-                self.match("WHERE")
-                self.match("LPAREN")
-                cond = self._parse_condition()
-                self.match("RPAREN")
-                node.set_where(cond)
+                self._parse_where(node)
             elif self.lookAhead.type == "LIMIT":
                 self.match("LIMIT")
                 self.match("LPAREN")
                 val = int(self.match("STRING").value)
                 self.match("RPAREN")
                 node.set_limit(val)
+            elif self.lookAhead.type == "ORDERBY":
+                self.match("ORDERBY")
+                self.match("LPAREN")
+                column = self.match("STRING").value
+                direction = 'ASC'
+                if self.lookAhead.type == "COMMA":
+                    self.match("COMMA")
+                    direction = self.match("STRING").value
+                self.match("RPAREN")
+                node.add_order_by(column, direction)
+            elif self.lookAhead.type in AGGREGATE_TOKENS:
+                self._parse_aggregate(node)
+            elif self.lookAhead.type == "GROUPBY":
+                self.match("GROUPBY")
+                self.match("LPAREN")
+                node.set_group_by(self._parse_string_list())
+                self.match("RPAREN")
+            elif self.lookAhead.type == "HAVING":
+                self.match("HAVING")
+                self.match("LPAREN")
+                function = self.match("STRING").value   # FUNÇÃO
+                self.match("COMMA")
+                cond = self._parse_condition(numeric_strings=True)
+                cond["FUNC"] = function
+                self.match("RPAREN")
+                node.set_having(cond)
+            elif self.lookAhead.type in JOIN_TYPES:
+                join_type = JOIN_TYPES[self.match(self.lookAhead.type).type]
+                self.match("LPAREN")
+                table = self.match("STRING").value
+                self.match("COMMA")
+                left = self.match("STRING").value    # COLUNA DA ESQUERDA
+                self.match("COMMA")
+                right = self.match("STRING").value   # COLUNA DA DIREITA
+                self.match("RPAREN")
+                node.add_join(join_type, table, left, right)
+            elif self.lookAhead.type == "EXISTS":
+                self.match("EXISTS")
+                self.match("LPAREN")
+                self.match("RPAREN")
+                node.set_exists()
             else:
                 raise SyntaxError("Método encadeado não reconhecido")
         return node
+
+    def _parse_aggregate(self, node):
+        function = AGGREGATE_TOKENS[self.match(self.lookAhead.type).type]
+        self.match("LPAREN")
+        column, alias = '*', None
+
+        if self.lookAhead.type == "STRING":
+            column = self.match("STRING").value
+            if self.lookAhead.type == "COMMA":
+                self.match("COMMA")
+                alias = self.match("STRING").value
+
+        self.match("RPAREN")
+        node.add_aggregate(function, column, alias)
+
+    def _parse_string_list(self):
+        values = [self.match("STRING").value]
+        while self.lookAhead.type == "COMMA":
+            self.match("COMMA")
+            values.append(self.match("STRING").value)
+        return values
     
-    def _parse_condition(self):
+    def _parse_condition(self, numeric_strings: bool = False):
         left = self.match("STRING").value   # COLUNA
         self.match("COMMA")
         op = self.match("STRING").value     # OPERADOR
         self.match("COMMA")
-        right = int(self.match("STRING").value)  # VALOR
+        right = self._parse_value(numeric_strings)  # VALOR
         return {"ID": left, "EQUALS": op, "NUMBER": right}
 
+    def _parse_value(self, numeric_strings: bool = False):
+        if self.lookAhead.type == "NUMBER":
+            return self.match("NUMBER").value
+        if self.lookAhead.type == "PARAM":
+            return Param(self.match("PARAM").value)
+
+        # Texto entre aspas fica como está ('01234' é um CEP, não 1234); quem converte é a
+        # afinidade da coluna no banco. Só o having converte, já que agregação não tem coluna
+        value = self.match("STRING").value
+        return numeric_literal(value) if numeric_strings else value
+
 
 
 queries = [
@@ -0,0 +1,135 @@
+import json
+from typing import Dict, List
+
+
+class FullScanError(RuntimeError):
+    pass
+
+
+class FullScanWarning(RuntimeWarning):
+    pass
+
+
+class PlanNode:
+    def __init__(self, detail: str, table: str = None, index: str = None, full_scan: bool = False):
+        self.detail = detail
+        self.table = table
+        self.index = index
+        self.full_scan = full_scan
+        self.children: List['PlanNode'] = []
+
+    def toDict(self) -> Dict:
+        return {
+            'detail': self.detail,
+            'table': self.table,
+            'index': self.index,
+            'full_scan': self.full_scan,
+            'children': [child.toDict() for child in self.children]
+        }
+
+    def __repr__(self):
+        return f'<PlanNode: {self.detail}>'
+
+
+class QueryPlan:
+    """
+    Plano de execução em árvore, igual para sqlite e postgres
+
+    Uso:
+    plan = db.explain("get('users').where('age', '>', '18')")
+    plan.full_scans()   # -> ['users'] quando não existe índice em age
+    print(plan)
+    """
+
+    def __init__(self, sql: str, roots: List[PlanNode]):
+        self.sql = sql
+        self.roots = roots
+
+    @classmethod
+    def from_sqlite(cls, sql: str, rows: List[Dict], aliases: Dict[str, str] = None) -> 'QueryPlan':
+        # Linhas do EXPLAIN QUERY PLAN: id, parent, notused, detail
+        nodes = {}
+        roots = []
+        for row in rows:
+            node = cls._parse_sqlite_detail(row['detail'])
+            node.table = (aliases or {}).get(node.table, node.table)
+            nodes[row['id']] = node
+            parent = nodes.get(row['parent'])
+            if parent is None:
+                roots.append(node)
+            else:
+                parent.children.append(node)
+        return cls(sql, roots)
+
+    @staticmethod
+    def _parse_sqlite_detail(detail: str) -> PlanNode:
+        # Ex.: "SCAN users", "SCAN TABLE users", "SEARCH users USING INDEX idx_age (age>?)"
+        words = detail.split()
+        table = None
+        index = None
+
+        if words and words[0] in ('SCAN', 'SEARCH'):
+            position = 2 if len(words) > 2 and words[1] == 'TABLE' else 1
+            table = words[position] if len(words) > position else None
+            if table == 'CONSTANT' or (table and table.startswith('(')):
+                table = None
+
+        if 'INDEX' in words:
+            position = words.index('INDEX') + 1
+            index = words[position] if len(words) > position else None
+        elif 'PRIMARY KEY' in detail or 'INTEGER PRIMARY KEY' in detail:
+            index = 'PRIMARY KEY'
+
+        full_scan = bool(words) and words[0] == 'SCAN' and index is None
+        return PlanNode(detail, table, index, full_scan)
+
+    @classmethod
+    def from_postgres(cls, sql: str, document) -> 'QueryPlan':
+        # 'Relation Name' já é o nome real da tabela, mesmo com alias
+        if isinstance(document, str):
+            document = json.loads(document)
+
+        roots = [cls._parse_postgres_node(item['Plan']) for item in document]
+        return cls(sql, roots)
+
+    @classmethod
+    def _parse_postgres_node(cls, plan: Dict) -> PlanNode:
+        node_type = plan.get('Node Type', '')
+        table = plan.get('Relation Name')
+        detail = f"{node_type} on {table}" if table else node_type
+
+        node = PlanNode(detail, table, plan.get('Index Name'), node_type == 'Seq Scan')
+        for child in plan.get('Plans', []):
+            node.children.append(cls._parse_postgres_node(child))
+        return node
+
+    def walk(self):
+        stack = list(reversed(self.roots))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def full_scans(self) -> List[str]:
+        return [node.table for node in self.walk() if node.full_scan and node.table]
+
+    def uses_index(self, index_name: str) -> bool:
+        return any(node.index == index_name for node in self.walk())
+
+    def toDict(self) -> Dict:
+        return {'sql': self.sql, 'plan': [root.toDict() for root in self.roots]}
+
+    def __str__(self):
+        lines = [self.sql]
+
+        def render(node, depth):
+            lines.append(f"{'  ' * depth}- {node.detail}")
+            for child in node.children:
+                render(child, depth + 1)
+
+        for root in self.roots:
+            render(root, 0)
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f'<QueryPlan: {self.sql} full_scans={self.full_scans()}>'
@@ -0,0 +1,64 @@
+from typing import Any, Dict, List, Optional
+
+from database.compiler import CompiledQuery, SQLExecutor
+from database.parser import NixParser, SelectNode, deleteNode, insertNode, updateNode
+from database.semanticAnalyzer import SemanticAnalyzer
+
+# Queries registradas com @nix_query na importação dos módulos, na ordem de registro
+_REGISTRY: Dict[str, None] = {}
+
+
+def nix_query(dsl: str):
+    """
+    Registra a query da DSL para ser compilada no db.warmup(), ainda no startup.
+    A função decorada não muda; a query fica em func.nix_query.
+    
+    Uso:
+    @nix_query("getAll('users').where('id', '=', :id)")
+    def user_by_id(db, id):
+        return db.query(user_by_id.nix_query, params={'id': id})
+    """
+    def decorator(func):
+        register(dsl)
+        func.nix_query = dsl
+        return func
+    return decorator
+
+
+def register(*queries: str):
+    for dsl in queries:
+        _REGISTRY[dsl] = None
+
+
+def registered_queries() -> List[str]:
+    return list(_REGISTRY)
+
+
+def clear_registry():
+    _REGISTRY.clear()
+
+
+def compile_dsl(dsl: str, analyzer_state: Dict[str, Any], dialect: str) -> Optional[Dict[str, Any]]:
+    """
+    Compila uma query com parser, analisador e executor próprios: roda em thread ou
+    processo separado sem dividir estado. Retorna o CompiledQuery em dict
+    (None para DDL, que só é validada na sintaxe).
+    """
+    try:
+        node = NixParser().parse(dsl)
+    except SystemExit:
+        # O parser encerra o processo em erro de sintaxe; aqui vira exceção
+        raise SyntaxError(f"Erro de parsing: {dsl}")
+    
+    if not isinstance(node, (SelectNode, insertNode, updateNode, deleteNode)):
+        return None
+    
+    analyzer = SemanticAnalyzer(dict(analyzer_state['schema']))
+    analyzer.primary_keys = dict(analyzer_state['primary_keys'])
+    analyzer.indexes = dict(analyzer_state['indexes'])
+    analyzer.column_types = dict(analyzer_state['column_types'])
+    if not analyzer.analyze(node):
+        raise ValueError(f"Semantic errors {'; '.join(analyzer.get_errors())}")
+    
+    compiled: CompiledQuery = SQLExecutor(None, dialect).compile_query(node)
+    return compiled.toDict()
@@ -0,0 +1,93 @@
+import asyncio
+from functools import partial
+from typing import Any, Dict, List
+
+
+class RelatedLoader:
+    """
+    Carregador no estilo dataloader: junta as chaves pedidas no mesmo tick
+    do event loop e resolve todas com um único NixORM.load_related(), que roda
+    numa thread (executor, por padrão o do loop) para não travar o event loop.
+    Só o SQL sai da thread do loop; com enable_connection_pool ele usa uma conexão
+    do pool, sem pool usa a conexão principal (no sqlite, check_same_thread=False).
+    
+    Uso:
+    loader = db.related_loader('orders', 'user_id')
+    orders = await loader.load(1)
+    orders_by_user = await loader.load_many([1, 2, 3])
+    """
+    
+    def __init__(self, orm_instance, table: str, foreign_key: str, columns: List[str] = None, batch_size: int = 500,
+                 executor=None):
+        self.orm = orm_instance
+        self.table = table
+        self.foreign_key = foreign_key
+        self.columns = columns
+        self.batch_size = batch_size
+        self.executor = executor
+        self._pending: Dict[Any, List[asyncio.Future]] = {}
+        self._scheduled = False
+        self._tasks = set()
+    
+    async def load(self, key: Any) -> List[Dict]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        
+        if not self._scheduled:
+            self._scheduled = True
+            # call_soon roda depois de todas as corrotinas prontas neste tick
+            loop.call_soon(self._dispatch)
+        
+        return await future
+    
+    async def load_many(self, keys: List[Any]) -> Dict[Any, List[Dict]]:
+        results = await asyncio.gather(*(self.load(key) for key in keys))
+        return dict(zip(keys, results))
+    
+    def _dispatch(self):
+        pending = self._pending
+        self._pending = {}
+        self._scheduled = False
+        
+        # Referência guardada até o fim: o loop só mantém referência fraca das tasks
+        task = asyncio.get_running_loop().create_task(self._resolve(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _resolve(self, pending: Dict[Any, List[asyncio.Future]]):
+        loop = asyncio.get_running_loop()
+        keys = [key for key in pending if key is not None]
+        try:
+            # Parser/analisador não são thread-safe: a análise fica na thread do loop, só o SQL vai para o executor
+            statements = self.orm._related_statements(self.table, self.foreign_key, keys, self.columns, self.batch_size)
+            grouped = await loop.run_in_executor(self.executor, self._fetch, statements)
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        
+        for key, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(list(grouped.get(key, [])))
+    
+    def _fetch(self, statements: List) -> Dict[Any, List[Dict]]:
+        # Com pool (enable_connection_pool) cada lote usa uma conexão própria; sem ele a
+        # conexão principal é usada sob lock, um lote de cada vez
+        grouped: Dict[Any, List[Dict]] = {}
+        if self.orm._pool is not None:
+            with self.orm._pool.connection() as connection:
+                executor = self.orm.sql_executor.with_connection(connection)
+                for compiled in statements:
+                    for row in executor.run(compiled):
+                        grouped.setdefault(row[self.foreign_key], []).append(row)
+            return grouped
+        
+        with self.orm._connection_lock:
+            for compiled in statements:
+                for row in self.orm.sql_executor.run(compiled):
+                    grouped.setdefault(row[self.foreign_key], []).append(row)
+        return grouped
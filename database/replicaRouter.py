@@ -0,0 +1,85 @@
+import contextvars
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, List
+
+from database.connectionPool import ConnectionPool
+
+# Momento da última escrita da sessão atual (cada thread / task do asyncio é uma sessão)
+_last_write: contextvars.ContextVar = contextvars.ContextVar('nix_last_write', default=None)
+
+
+class ReplicaRouter:
+    """
+    Escolhe a réplica de cada leitura: 'round_robin' ou 'least_outstanding' (a réplica
+    com menos queries em andamento). Depois de uma escrita a sessão lê do primário
+    durante pin_window segundos, para enxergar o que acabou de escrever.
+
+    Uso:
+    db.enable_read_replicas([
+        lambda: sqlite3.connect('replica_1.db', check_same_thread=False),
+        lambda: sqlite3.connect('replica_2.db', check_same_thread=False),
+    ], strategy='least_outstanding', pin_window=2.0)
+    """
+
+    STRATEGIES = ('round_robin', 'least_outstanding')
+
+    def __init__(self, factories: List[Callable[[], Any]], strategy: str = 'round_robin',
+                 pin_window: float = 1.0, pool_size: int = 5):
+        if not factories:
+            raise ValueError("At least one replica is required")
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Replica strategy not supported: {strategy}")
+
+        self.pools = [ConnectionPool(factory, pool_size) for factory in factories]
+        self.strategy = strategy
+        self.pin_window = pin_window
+        self.outstanding = [0] * len(self.pools)
+        self.reads = [0] * len(self.pools)
+        self.primary_reads = 0
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    def record_write(self):
+        _last_write.set(time.monotonic())
+
+    def is_pinned(self) -> bool:
+        last_write = _last_write.get()
+        return last_write is not None and time.monotonic() - last_write < self.pin_window
+
+    def count_primary_read(self):
+        with self._lock:
+            self.primary_reads += 1
+
+    def choose(self) -> int:
+        with self._lock:
+            start = next(self._next)
+            order = [(start + offset) % len(self.pools) for offset in range(len(self.pools))]
+            if self.strategy == 'least_outstanding':
+                # Empate fica com a próxima da vez, como no round robin
+                return min(order, key=lambda index: self.outstanding[index])
+            return order[0]
+
+    @contextmanager
+    def connection(self):
+        index = self.choose()
+        with self._lock:
+            self.outstanding[index] += 1
+            self.reads[index] += 1
+        try:
+            with self.pools[index].connection() as connection:
+                yield connection
+        finally:
+            with self._lock:
+                self.outstanding[index] -= 1
+
+    def stats(self):
+        with self._lock:
+            return {'replica_reads': list(self.reads), 'primary_reads': self.primary_reads,
+                    'outstanding': list(self.outstanding)}
+
+    def close(self):
+        for pool in self.pools:
+            pool.close()
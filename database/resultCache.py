@@ -0,0 +1,140 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Tuple
+
+
+def approximate_size(value: Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approximate_size(key) + approximate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(approximate_size(item) for item in value)
+    return size
+
+
+class CacheEntry:
+    def __init__(self, rows, tables: Iterable[str], expires_at: float, size: int):
+        self.rows = rows
+        self.tables = set(tables)
+        self.expires_at = expires_at
+        self.size = size
+
+
+class ResultCache:
+    """
+    Cache de resultados por (SQL compilado, parâmetros) com TTL e limite de memória em bytes.
+    Escritas feitas pelo SQLExecutor invalidam as entradas que leem a tabela alterada.
+
+    Uso:
+    db.enable_result_cache(ttl=30, max_bytes=32 * 1024 * 1024)
+    db.getAll('plans').execute()   # miss -> banco
+    db.getAll('plans').execute()   # hit
+    db.get_cache_stats()           # {'hits': 1, 'misses': 1, ...}
+    """
+
+    def __init__(self, ttl: float = 60.0, max_bytes: int = 64 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: 'OrderedDict[Tuple, CacheEntry]' = OrderedDict()
+        self._by_table: Dict[str, set] = {}
+        self._lock = threading.RLock()
+        # Muda a cada invalidação: uma leitura que começou antes de uma escrita não entra no cache
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(sql: str, params) -> Tuple:
+        return (sql, tuple(params or ()))
+
+    def get(self, key: Tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            # Cópia rasa: quem recebe pode alterar as linhas sem estragar o cache
+            return [dict(row) for row in entry.rows]
+
+    def set(self, key: Tuple, rows, tables: Iterable[str], generation: int = None):
+        size = approximate_size(rows)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            entry = CacheEntry([dict(row) for row in rows], tables, time.monotonic() + self.ttl, size)
+            self._entries[key] = entry
+            self.current_bytes += size
+            for table in entry.tables:
+                self._by_table.setdefault(table, set()).add(key)
+
+            # Remove as menos usadas até caber no limite de memória
+            while self.current_bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, tables: Iterable[str] = None):
+        """Remove as entradas que leem alguma das tabelas (todas quando tables=None)"""
+        with self._lock:
+            if tables is None:
+                keys = list(self._entries)
+            else:
+                keys = {key for table in tables for key in self._by_table.get(table, ())}
+
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            self.generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self.current_bytes = 0
+
+    def _remove(self, key: Tuple):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        self.current_bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,10 +1,15 @@
+import hashlib
+import json
 from typing import Dict, List
-from database.parser import CreateDatabaseNode, NixParser, SelectNode, insertNode, createTableNode
+from database.parser import AGGREGATE_FUNCTIONS, ROW_FORMATS, CreateDatabaseNode, Param, NixParser, SelectNode, insertNode, createTableNode, updateNode, deleteNode, createIndexNode, dropIndexNode
 
 class SemanticAnalyzer:
     
     def __init__(self, schema: Dict[str, List[str]] = None):
         self.schema = schema or {}
+        self.primary_keys: Dict[str, List[str]] = {}
+        self.indexes: Dict[str, Dict] = {}
+        self.column_types: Dict[str, Dict[str, str]] = {}
         self.errors = []
         self.warnings = []
     
@@ -20,6 +25,14 @@ class SemanticAnalyzer:
             self._analyze_insert_node(node)
         elif isinstance(node, SelectNode):
             self._analyze_select_node(node)
+        elif isinstance(node, updateNode):
+            self._analyze_update_node(node)
+        elif isinstance(node, deleteNode):
+            self._analyze_delete_node(node)
+        elif isinstance(node, createIndexNode):
+            self._analyze_create_index(node)
+        elif isinstance(node, dropIndexNode):
+            self._analyze_drop_index(node)
         else:
             self.errors.append(f"Type Node not supported: {type(node)}")
         
@@ -45,6 +58,56 @@ class SemanticAnalyzer:
         # Gera o schema da tabela automaticamente
         column_names = [col['name'] for col in node.columns]
         self.schema[node.table_name] = column_names
+        self.column_types[node.table_name] = {col['name']: col['type'] for col in node.columns}
+        
+        primary_key = [col['name'] for col in node.columns if 'primarykey' in col.get('constraints', [])]
+        if primary_key:
+            self.primary_keys[node.table_name] = primary_key
+    
+    def _analyze_create_index(self, node):
+        if not node.index_name:
+            self.errors.append("Index name is empty")
+            return
+        
+        if not node.columns:
+            self.errors.append("Index should have at least one column, use on(...)")
+            return
+        
+        if node.table_name not in self.schema:
+            self.errors.append(f"Table '{node.table_name}' not found on schema")
+            return
+        
+        for col in node.columns + node.include:
+            if not self._has_column(node.table_name, col):
+                self.errors.append(f"Column '{col}' not found on table '{node.table_name}'")
+        
+        if len(set(node.columns + node.include)) != len(node.columns + node.include):
+            self.errors.append("Index columns should not repeat")
+        
+        if node.where:
+            self._analyze_where_condition(node.where, node.table_name)
+            if isinstance(node.where.get('NUMBER'), Param):
+                self.errors.append("Partial index condition cannot use parameters")
+        
+        if node.index_name in self.indexes:
+            self.warnings.append(f"Index '{node.index_name}' already exists on schema")
+        
+        if not self.errors:
+            self.indexes[node.index_name] = {
+                'table': node.table_name,
+                'columns': list(node.columns),
+                'unique': node.unique,
+                'where': node.where,
+                'include': list(node.include)
+            }
+    
+    def _analyze_drop_index(self, node):
+        if not node.index_name:
+            self.errors.append("Index name is empty")
+            return
+        
+        if self.indexes.pop(node.index_name, None) is None:
+            self.warnings.append(f"Index '{node.index_name}' not found on schema")
     
     def _analyze_insert_node(self, node):
         if not node.table_name:
@@ -64,10 +127,57 @@ class SemanticAnalyzer:
             for col in node.values.keys():
                 if col not in available_columns:
                     self.errors.append(f"Column'{col}' not found on table '{node.table_name}'")
+        
+        for row in node.rows:
+            if set(row.keys()) != set(node.values.keys()):
+                self.errors.append("All rows of an insert should have the same columns")
+                break
+        
+        if node.conflict:
+            for col in node.conflict:
+                if col not in node.values:
+                    self.errors.append(f"Conflict column '{col}' should be part of the inserted values")
+            for col in node.update_columns:
+                if col not in node.values:
+                    self.errors.append(f"Update column '{col}' should be part of the inserted values")
+                elif col in node.conflict:
+                    self.errors.append(f"Conflict column '{col}' cannot be updated")
+    
+    def _analyze_update_node(self, node):
+        if not node.table_name:
+            self.errors.append("Table name is empty")
+            return
+        
+        if not node.values:
+            self.errors.append("Update should set at least one value")
+            return
+        
+        if node.table_name in self.schema:
+            for col in node.values.keys():
+                if not self._has_column(node.table_name, col):
+                    self.errors.append(f"Column '{col}' not found on table '{node.table_name}'")
+        
+        self._analyze_write_condition(node)
+    
+    def _analyze_delete_node(self, node):
+        if not node.table_name:
+            self.errors.append("Table name is empty")
+            return
+        
+        self._analyze_write_condition(node)
+    
+    def _analyze_write_condition(self, node):
+        if node.where:
+            self._analyze_where_condition(node.where, node.table_name)
+        else:
+            self.warnings.append(f"{node.type} without where affects every row of '{node.table_name}'")
     
     def _analyze_select_node(self, node: SelectNode):
         # Se a tabela não existe no schema, cria com colunas genéricas
-        if node.table not in self.schema:
+        if node.joins:
+            if not self._analyze_joins(node):
+                return
+        elif node.table not in self.schema:
             self.warnings.append(f"Table '{node.table}' not found on schema, creating basic structure")
             # Cria schema básico baseado nas colunas solicitadas
             if node.columns != ['*']:
@@ -76,13 +186,14 @@ class SemanticAnalyzer:
                 self.schema[node.table] = ['id']  # Coluna padrão
         
         if node.columns != ['*'] and self.schema:
-            available_columns = self.schema.get(node.table, [])
             for column in node.columns:
-                if column not in available_columns:
+                if not self._has_column(node.table, column):
                     self.errors.append(f"Column '{column}' not found on table '{node.table}'")
         
         if node.where:
             self._analyze_where_condition(node.where, node.table)
+
+        self._analyze_aggregation(node)
         
         if node.limit:
             try:
@@ -91,7 +202,112 @@ class SemanticAnalyzer:
                     self.errors.append("LIMIT should be greater than 0")
             except ValueError:
                 self.errors.append("LIMIT should be a valid number")
+
+        for column, direction in node.order_by:
+            if direction not in ('ASC', 'DESC'):
+                self.errors.append(f"Order direction '{direction}' not supported")
+            aliases = [aggregate['alias'] for aggregate in node.aggregates]
+            if column not in aliases and not self._has_column(node.table, column):
+                self.errors.append(f"Column '{column}' not found on table '{node.table}'")
+
+        if node.row_format not in ROW_FORMATS:
+            self.errors.append(f"Row format '{node.row_format}' not supported")
+
+    def _analyze_joins(self, node: SelectNode) -> bool:
+        error_count = len(self.errors)
+        tables = [node.table] + [join['table'] for join in node.joins]
+
+        for table in tables:
+            if table not in self.schema:
+                self.errors.append(f"Table '{table}' not found on schema, joins require a known schema")
+        if len(set(tables)) != len(tables):
+            self.errors.append("The same table cannot appear twice in a join")
+        if len(self.errors) > error_count:
+            return False
+
+        # Qualifica todas as colunas como 'tabela.coluna' para que o compilador use os aliases
+        # No ON, a coluna da esquerda pertence às tabelas anteriores e a da direita à tabela do join
+        for index, join in enumerate(node.joins):
+            join['left'] = self._qualify_column(tables[:index + 1], join['left'], tables[:index + 2])
+            join['right'] = self._qualify_column([join['table']], join['right'], tables[:index + 2])
+            for column in (join['left'], join['right']):
+                if not self._has_column(node.table, column):
+                    self.errors.append(f"Column '{column}' not found on join with '{join['table']}'")
+
+        if node.columns == ['*']:
+            if not node.aggregates:
+                node.columns = [f"{table}.{column}" for table in tables for column in self.schema[table]]
+        else:
+            node.columns = [self._qualify_column(tables, column) for column in node.columns]
+
+        if node.where:
+            node.where['ID'] = self._qualify_column(tables, node.where['ID'])
+        node.group_by = [self._qualify_column(tables, column) for column in node.group_by]
+        for aggregate in node.aggregates:
+            if aggregate['column'] != '*':
+                aggregate['column'] = self._qualify_column(tables, aggregate['column'])
+        if node.having and node.having.get('ID') != '*':
+            node.having['ID'] = self._qualify_column(tables, node.having['ID'])
+        aliases = [aggregate['alias'] for aggregate in node.aggregates]
+        node.order_by = [
+            (column if column in aliases else self._qualify_column(tables, column), direction)
+            for column, direction in node.order_by
+        ]
+
+        return len(self.errors) == error_count
+
+    def _qualify_column(self, tables: List[str], column: str, visible_tables: List[str] = None) -> str:
+        if '.' in column:
+            table = column.split('.', 1)[0]
+            if table not in (visible_tables or tables):
+                self.errors.append(f"Table '{table}' is not part of the query")
+            return column
+
+        owners = [table for table in tables if column in self.schema.get(table, [])]
+        if len(owners) > 1:
+            self.errors.append(f"Column '{column}' is ambiguous between tables {owners}")
+        if len(owners) == 1:
+            return f"{owners[0]}.{column}"
+        return column
+
+    def _has_column(self, table: str, column: str) -> bool:
+        if '.' in column:
+            table, column = column.split('.', 1)
+        return column in self.schema.get(table, [])
     
+    def _analyze_aggregation(self, node: SelectNode):
+        for aggregate in node.aggregates:
+            self._analyze_aggregate_function(aggregate['function'], aggregate['column'], node.table)
+
+        for column in node.group_by:
+            if not self._has_column(node.table, column):
+                self.errors.append(f"Column '{column}' not found on table '{node.table}'")
+
+        if node.aggregates and node.columns != ['*']:
+            for column in node.columns:
+                if column not in node.group_by:
+                    self.errors.append(f"Column '{column}' must appear in groupBy when using aggregates")
+
+        if node.having:
+            if not node.aggregates and not node.group_by:
+                self.errors.append("HAVING requires groupBy or an aggregate")
+            self._analyze_aggregate_function(node.having.get('FUNC'), node.having.get('ID'), node.table)
+            self._analyze_where_condition(node.having, node.table)
+
+        if node.exists and node.aggregates:
+            self.errors.append("exists() cannot be combined with aggregates")
+
+    def _analyze_aggregate_function(self, function: str, column: str, table: str):
+        if function not in AGGREGATE_FUNCTIONS:
+            self.errors.append(f"Aggregate function '{function}' not supported")
+            return
+
+        if column == '*':
+            if function != 'count':
+                self.errors.append(f"Aggregate '{function}' requires a column")
+        elif not self._has_column(table, column):
+            self.errors.append(f"Column '{column}' not found on table '{table}'")
+
     def _analyze_where_condition(self, condition: Dict, table: str):
         column = condition.get('ID')
         operator = condition.get('EQUALS')
@@ -101,13 +317,15 @@ class SemanticAnalyzer:
             self.errors.append("WHERE contitions is not complete")
             return
         
-        if self.schema and table in self.schema:
-            if column not in self.schema[table]:
+        if self.schema and table in self.schema and not condition.get('FUNC'):
+            if not self._has_column(table, column):
                 self.errors.append(f"Column '{column}' not found on table '{table}'")
         
         valid_operators = ['=', '!=', '<', '>', '<=', '>=', 'LIKE', 'IN']
         if operator not in valid_operators:
             self.errors.append(f"Operator '{operator}' not supported")
+        elif operator == 'IN' and (not isinstance(value, (list, tuple)) or not value):
+            self.errors.append("IN requires a non-empty list of values")
     
     def get_errors(self) -> List[str]:
         return self.errors
@@ -117,6 +335,20 @@ class SemanticAnalyzer:
     
     def get_schema(self) -> Dict[str, List[str]]:
         return self.schema
+    
+    def schema_version(self) -> str:
+        """Hash do schema: queries compiladas com outro schema precisam ser compiladas de novo"""
+        tables = {table: columns for table, columns in self.schema.items() if not table.startswith('_')}
+        return hashlib.sha1(json.dumps(tables, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    
+    def get_primary_key(self, table: str) -> List[str]:
+        return self.primary_keys.get(table, [])
+    
+    def get_column_types(self, table: str) -> Dict[str, str]:
+        return self.column_types.get(table, {})
+    
+    def get_indexes(self, table: str = None) -> Dict[str, Dict]:
+        return {name: index for name, index in self.indexes.items() if table is None or index['table'] == table}
 
 
 # Teste do analisador semântico
@@ -128,8 +360,13 @@ if __name__ == "__main__":
         "createDatabase('eCom')",
         "createTable('users').column('id', 'INTEGER', 'primarykey').column('name', 'VARCHAR', '100').column('age', 'INTEGER')",
         "get('users', 'name').where('age', '>', '18')",
+        "get('users', 'age').count().groupBy('age').having('count', '*', '>', '1')",
         "getAll('users')",
-        "insert('users').values('name', 'John', 'age', '25')"
+        "insert('users').values('name', 'John', 'age', '25')",
+        "update('users').set('name', 'Maria').where('id', '=', :id)",
+        "delete('users').where('id', '=', '1')",
+        "createIndex('users', 'idx_age').on('age', 'name').where('age', '>', '18')",
+        "dropIndex('idx_age')"
     ]
     
     for query in test_queries:
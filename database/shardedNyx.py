@@ -0,0 +1,388 @@
+import copy
+import heapq
+import itertools
+import operator
+import sqlite3
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import cmp_to_key
+from typing import Any, Callable, Dict, Iterator, List
+
+from database.compiler import SQLExecutor
+from database.nyx import IndexBuilder, NixORM, TableBuilder
+from database.nyxBuilder import NixQuery
+from database.parser import Param, SelectNode, aggregate_alias, deleteNode, insertNode, numeric_literal, updateNode
+
+HAVING_OPERATORS = {
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+    'IN': lambda value, options: value in options,
+}
+
+
+def crc32_router(value: Any, shard_count: int) -> int:
+    # crc32 em vez de hash(): o shard de uma chave não pode mudar entre processos
+    return zlib.crc32(str(value).encode('utf-8')) % shard_count
+
+
+class ShardedNixORM:
+    """
+    Várias bases (um arquivo sqlite por shard) atrás da mesma interface do NixORM.
+
+    Tabelas com a coluna shard_key são particionadas: o insert vai para o shard da chave
+    e get/update/delete com where('<shard_key>', '=' ou 'IN', ...) só visitam os shards
+    da chave. O resto roda em todos os shards ao mesmo tempo e os resultados são
+    combinados: merge k-way no orderBy, limit aplicado de novo e agregações parciais
+    somadas (avg vira sum/count em cada shard). Tabelas sem a coluna são replicadas:
+    escritas vão para todos os shards e leituras para o primeiro.
+
+    Uso:
+    db = ShardedNixORM(['tenants_0.db', 'tenants_1.db', 'tenants_2.db'], shard_key='tenant_id')
+    db.query("createTable('orders').column('id', 'INTEGER').column('tenant_id', 'INTEGER').column('total', 'REAL')")
+    db.insert('orders').values(id=1, tenant_id=42, total=10.5).execute()
+    db.query("getAll('orders').where('tenant_id', '=', :tenant)", params={'tenant': 42})   # um shard
+    db.get('orders', 'tenant_id').sum('total').groupBy('tenant_id').execute()       # todos
+    """
+
+    def __init__(self, shards, shard_key: str, router: Callable[[Any, int], int] = None,
+                 schema: Dict[str, List[str]] = None, dialect: str = 'sqlite'):
+        if isinstance(shards, dict):
+            self.shard_names = list(shards)
+            connections = list(shards.values())
+        else:
+            connections = list(shards)
+            self.shard_names = [str(index) for index in range(len(connections))]
+
+        if not connections:
+            raise ValueError("ShardedNixORM needs at least one shard")
+
+        # Caminhos viram conexões usáveis pelas threads do fan-out
+        connections = [
+            sqlite3.connect(connection, check_same_thread=False) if isinstance(connection, str) else connection
+            for connection in connections
+        ]
+        self.executors = [SQLExecutor(connection, dialect) for connection in connections]
+        self.shard_key = shard_key
+        self.router = router or crc32_router
+        # O NixORM sem conexão faz parser, análise e geração de SQL
+        self.orm = NixORM(None, schema, dialect)
+        self.parser = self.orm.parser
+        self.semantic_analyzer = self.orm.semantic_analyzer
+        self.sql_executor = self.orm.sql_executor
+        self._fan_out = ThreadPoolExecutor(max_workers=len(connections), thread_name_prefix='nix-shard')
+
+    # ==================== INTERFACE ====================
+
+    def query(self, query_string: str, row_format: str = None, params: Dict[str, Any] = None):
+        try:
+            node = self.parser.parse(query_string)
+        except Exception as e:
+            raise SyntaxError(f"Erro de parsing: {e}")
+
+        if row_format and isinstance(node, SelectNode):
+            node.set_row_format(row_format)
+        return self._execute_node(node, bindings=params)
+
+    def stream(self, query_string: str, params: Dict[str, Any] = None) -> Iterator[Dict]:
+        """Linhas do get/getAll já combinadas, entregues uma a uma (merge k-way sob demanda)"""
+        node = self.parser.parse(query_string)
+        if not isinstance(node, SelectNode) or node.exists:
+            raise ValueError("Only get/getAll queries can be streamed")
+
+        self._analyze(node)
+        return self._select_stream(node, params, self.shards_for(node, params))
+
+    def sql(self, query_string: str) -> str:
+        return self.orm.sql(query_string)
+
+    def get(self, table: str, *columns):
+        return NixQuery(self, 'GET', table, list(columns) if columns else ['*'])
+
+    def getAll(self, table: str):
+        return NixQuery(self, 'GETALL', table, ['*'])
+
+    def insert(self, table_name: str):
+        return NixQuery(self, 'INSERT', table_name, [])
+
+    def update(self, table_name: str):
+        return NixQuery(self, 'UPDATE', table_name, [])
+
+    def delete(self, table_name: str):
+        return NixQuery(self, 'DELETE', table_name, [])
+
+    def createTable(self, table_name: str):
+        return TableBuilder(self, table_name)
+
+    def createIndex(self, table_name: str, index_name: str):
+        return IndexBuilder(self, table_name, index_name)
+
+    def add_table_schema(self, table: str, columns: List[str], primary_key: List[str] = None):
+        self.orm.add_table_schema(table, columns, primary_key)
+        return self
+
+    def close(self):
+        self._fan_out.shutdown(wait=True)
+        for executor in self.executors:
+            executor.db_connection.close()
+
+    # ==================== ROTEAMENTO ====================
+
+    def is_sharded(self, table: str) -> bool:
+        return self.shard_key in self.semantic_analyzer.schema.get(table, [])
+
+    def shard_for(self, value: Any) -> int:
+        return self.router(value, len(self.executors))
+
+    def shards_for(self, node, bindings: Dict[str, Any] = None) -> List[int]:
+        """Índices dos shards que a query precisa visitar"""
+        table = node.table if isinstance(node, SelectNode) else node.table_name
+        every_shard = list(range(len(self.executors)))
+
+        if isinstance(node, SelectNode):
+            tables = [table] + [join['table'] for join in node.joins]
+            if not any(self.is_sharded(name) for name in tables):
+                return [0]
+        elif not self.is_sharded(table):
+            return every_shard
+
+        where = node.where
+        if not where or where.get('FUNC') or where['ID'] not in (self.shard_key, f"{table}.{self.shard_key}"):
+            return every_shard
+
+        if where['EQUALS'] == '=':
+            return [self.shard_for(self._resolve(where['NUMBER'], bindings))]
+        if where['EQUALS'] == 'IN':
+            return sorted({self.shard_for(self._resolve(value, bindings)) for value in where['NUMBER']})
+        return every_shard
+
+    @staticmethod
+    def _resolve(value: Any, bindings: Dict[str, Any] = None) -> Any:
+        if isinstance(value, Param):
+            if not bindings or value.name not in bindings:
+                raise ValueError(f"Missing value for parameter ':{value.name}'")
+            return bindings[value.name]
+        return value
+
+    # ==================== EXECUÇÃO ====================
+
+    def _analyze(self, node):
+        self.orm._analyze(node)
+
+    def _execute_node(self, node, return_sql_only: bool = False, bindings: Dict[str, Any] = None):
+        self._analyze(node)
+
+        if return_sql_only:
+            return self.sql_executor.execute(node, return_sql_only=True)
+
+        if isinstance(node, SelectNode):
+            return self._select(node, bindings)
+        if isinstance(node, insertNode):
+            return self._insert(node, bindings)
+        if isinstance(node, (updateNode, deleteNode)):
+            compiled = self.sql_executor.compile_query(node)
+            return sum(self._on_shards(self.shards_for(node, bindings), lambda executor: executor.run(compiled, bindings)))
+
+        # DDL vale para todos os shards
+        return self._on_shards(range(len(self.executors)), lambda executor: executor.execute(node, return_sql_only=False))[0]
+
+    def _on_shards(self, shards, task: Callable[[SQLExecutor], Any]) -> List:
+        shards = list(shards)
+        if len(shards) == 1:
+            return [task(self.executors[shards[0]])]
+        return list(self._fan_out.map(lambda index: task(self.executors[index]), shards))
+
+    def _insert(self, node: insertNode, bindings: Dict[str, Any] = None) -> int:
+        if not self.is_sharded(node.table_name):
+            compiled = self.sql_executor.compile_query(node)
+            return self._on_shards(range(len(self.executors)), lambda executor: executor.run(compiled, bindings))[0]
+
+        # Cada linha vai para o shard da sua chave: um INSERT por shard
+        rows_by_shard: Dict[int, List[Dict]] = {}
+        for row in [node.values] + node.rows:
+            if self.shard_key not in row:
+                raise ValueError(f"Insert into sharded table '{node.table_name}' needs a value for '{self.shard_key}'")
+            rows_by_shard.setdefault(self.shard_for(self._resolve(row[self.shard_key], bindings)), []).append(row)
+
+        compiled_by_shard = {}
+        for index, rows in rows_by_shard.items():
+            shard_node = copy.copy(node)
+            shard_node.values = rows[0]
+            shard_node.rows = rows[1:]
+            compiled_by_shard[index] = self.sql_executor.compile_query(shard_node)
+
+        counts = self._fan_out.map(
+            lambda index: self.executors[index].run(compiled_by_shard[index], bindings), list(compiled_by_shard)
+        )
+        return sum(counts)
+
+    def _select(self, node: SelectNode, bindings: Dict[str, Any] = None):
+        shards = self.shards_for(node, bindings)
+
+        if len(shards) == 1:
+            compiled = self.sql_executor.compile_query(node)
+            return self.executors[shards[0]].run(compiled, bindings)
+
+        if node.exists:
+            compiled = self.sql_executor.compile_query(node)
+            return any(self._on_shards(shards, lambda executor: executor.run(compiled, bindings)))
+
+        rows = list(self._select_stream(node, bindings, shards))
+        if node.row_format == 'nested':
+            return self.sql_executor._nest_rows(rows)
+        return rows
+
+    def _select_stream(self, node: SelectNode, bindings: Dict[str, Any], shards: List[int]) -> Iterator[Dict]:
+        if node.aggregates:
+            return iter(self._merge_aggregates(node, bindings, shards))
+
+        shard_node = copy.copy(node)
+        shard_node.row_format = 'flat'
+        # Coluna do orderBy fora da projeção: cada shard também a devolve, e ela sai depois do merge
+        hidden = []
+        if node.columns != ['*']:
+            hidden = [column for column, _ in node.order_by if column not in node.columns]
+            shard_node.columns = node.columns + list(dict.fromkeys(hidden))
+
+        compiled = self.sql_executor.compile_query(shard_node)
+        values = self.sql_executor.resolve_params(compiled.params, bindings)
+        # Os shards rodam a query ao mesmo tempo; as linhas são lidas em lotes, sob demanda
+        cursors = self._on_shards(shards, lambda executor: executor.fetch_batches(compiled.sql, values))
+        return self._merge_rows(node, cursors, hidden)
+
+    def _merge_rows(self, node: SelectNode, cursors: List, hidden: List[str]) -> Iterator[Dict]:
+        streams = [self._shard_rows(column_names, batches) for column_names, batches in cursors]
+        try:
+            # Cada shard já devolve as linhas ordenadas (e no máximo limit): o merge mantém a ordem
+            if node.order_by:
+                merged = heapq.merge(*streams, key=self._sort_key(node.order_by))
+            else:
+                merged = itertools.chain.from_iterable(streams)
+
+            if node.limit:
+                merged = itertools.islice(merged, int(node.limit))
+
+            for row in merged:
+                for column in hidden:
+                    row.pop(column, None)
+                yield row
+        finally:
+            for stream in streams:
+                stream.close()
+
+    @staticmethod
+    def _shard_rows(column_names: List[str], batches) -> Iterator[Dict]:
+        try:
+            for rows in batches:
+                for row in rows:
+                    yield dict(zip(column_names, row))
+        finally:
+            batches.close()
+
+    def _merge_aggregates(self, node: SelectNode, bindings: Dict[str, Any], shards: List[int]) -> List[Dict]:
+        aggregates = list(node.aggregates)
+        hidden = []
+        if node.having:
+            alias = aggregate_alias(node.having['FUNC'], node.having['ID'])
+            if alias not in [aggregate['alias'] for aggregate in aggregates]:
+                aggregates.append({'function': node.having['FUNC'], 'column': node.having['ID'], 'alias': alias})
+                hidden.append(alias)
+
+        # Having, orderBy e limit só valem depois de juntar os grupos de todos os shards
+        shard_node = copy.deepcopy(node)
+        shard_node.having = None
+        shard_node.order_by = []
+        shard_node.limit = None
+        shard_node.row_format = 'flat'
+        shard_node.aggregates = []
+        for aggregate in aggregates:
+            if aggregate['function'] == 'countDistinct':
+                raise ValueError("countDistinct can not be combined across shards, filter by the shard key")
+            if aggregate['function'] == 'avg':
+                shard_node.add_aggregate('sum', aggregate['column'], f"__sum_{aggregate['alias']}")
+                shard_node.add_aggregate('count', aggregate['column'], f"__count_{aggregate['alias']}")
+            else:
+                shard_node.add_aggregate(aggregate['function'], aggregate['column'], aggregate['alias'])
+
+        compiled = self.sql_executor.compile_query(shard_node)
+        results = self._on_shards(shards, lambda executor: executor.run(compiled, bindings))
+
+        partial_aliases = {aggregate['alias'] for aggregate in shard_node.aggregates}
+        groups: Dict[tuple, Dict] = {}
+        for row in itertools.chain.from_iterable(results):
+            key = tuple((column, value) for column, value in row.items() if column not in partial_aliases)
+            group = groups.get(key)
+            if group is None:
+                groups[key] = dict(row)
+                continue
+            for aggregate in shard_node.aggregates:
+                alias = aggregate['alias']
+                group[alias] = self._combine(aggregate['function'], group[alias], row[alias])
+
+        merged = []
+        for group in groups.values():
+            row = {column: value for column, value in group.items() if column not in partial_aliases}
+            for aggregate in aggregates:
+                alias = aggregate['alias']
+                if aggregate['function'] == 'avg':
+                    total, count = group[f"__sum_{alias}"], group[f"__count_{alias}"]
+                    row[alias] = total / count if count else None
+                else:
+                    row[alias] = group[alias]
+            merged.append(row)
+
+        if node.having:
+            compare = HAVING_OPERATORS.get(node.having['EQUALS'])
+            if compare is None:
+                raise ValueError(f"Having operator '{node.having['EQUALS']}' not supported across shards")
+            alias = aggregate_alias(node.having['FUNC'], node.having['ID'])
+            value = self._resolve(node.having['NUMBER'], bindings)
+            value = [numeric_literal(item) for item in value] if isinstance(value, list) else numeric_literal(value)
+            merged = [row for row in merged if row[alias] is not None and compare(row[alias], value)]
+
+        for row in merged:
+            for alias in hidden:
+                del row[alias]
+
+        if node.order_by:
+            merged.sort(key=self._sort_key(node.order_by))
+        if node.limit:
+            merged = merged[:int(node.limit)]
+        return merged
+
+    @staticmethod
+    def _combine(function: str, left: Any, right: Any) -> Any:
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if function == 'min':
+            return min(left, right)
+        if function == 'max':
+            return max(left, right)
+        return left + right   # count, sum
+
+    @staticmethod
+    def _sort_key(order_by):
+        def value(row, column):
+            return row[column] if column in row else row.get(column.split('.')[-1])
+
+        # NULL antes de qualquer valor no ASC, como no sqlite
+        def compare(left, right):
+            for column, direction in order_by:
+                a, b = value(left, column), value(right, column)
+                if a == b:
+                    continue
+                if a is None:
+                    result = -1
+                elif b is None:
+                    result = 1
+                else:
+                    result = -1 if a < b else 1
+                return -result if direction == 'DESC' else result
+            return 0
+
+        return cmp_to_key(compare)
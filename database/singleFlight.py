@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Enquanto uma leitura com a mesma chave (SQL, parâmetros) está em andamento,
+    as outras chamadas esperam e recebem o mesmo resultado em vez de ir ao banco.
+
+    Uso (threads):
+    rows, shared = flight.do(key, lambda: executor._execute_sql(sql, params))
+
+    Uso (asyncio):
+    rows, shared = await flight.do_async(key, lambda: run_query(sql, params))
+    """
+
+    def __init__(self, timeout: float = None):
+        self.timeout = timeout
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: float = None) -> Tuple[Any, bool]:
+        """Retorna (resultado, compartilhado); compartilhado=True para quem só esperou"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            wait = self.timeout if timeout is None else timeout
+            if not call.done.wait(wait):
+                raise TimeoutError(f"Timed out after {wait}s waiting for an identical query in flight")
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            # KeyboardInterrupt/SystemExit também: quem espera não pode receber None como resultado
+            call.error = e if isinstance(e, Exception) else RuntimeError(f"Identical query in flight was interrupted: {e!r}")
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]], timeout: float = None) -> Tuple[Any, bool]:
+        loop = asyncio.get_running_loop()
+        # As futures pertencem a um event loop: a chave inclui o loop atual
+        loop_key = (id(loop), key)
+
+        future = self._async_calls.get(loop_key)
+        if future is not None:
+            self.coalesced += 1
+            wait = self.timeout if timeout is None else timeout
+            try:
+                # shield: o timeout de quem espera não cancela a query do líder
+                result = await asyncio.wait_for(asyncio.shield(future), wait)
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"Timed out after {wait}s waiting for an identical query in flight")
+            return result, True
+
+        future = self._async_calls[loop_key] = loop.create_future()
+        try:
+            result = await fn()
+        except Exception as e:
+            future.set_exception(e)
+            # Marca a exceção como lida para o asyncio não avisar quando ninguém esperava
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            del self._async_calls[loop_key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls) + len(self._async_calls)
@@ -0,0 +1,198 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from database.memoryBackend import MemoryTable, resolve, select_rows
+from database.parser import SelectNode
+
+
+class CachedTable:
+    """
+    Cópia completa de uma tabela pequena em memória (MemoryTable), com índice hash na
+    chave e índices hash + ordenado nas colunas de indexes. É recarregada na próxima
+    leitura depois de uma escrita feita pelo ORM, depois do ttl ou quando version()
+    muda (consultado no máximo a cada check_interval segundos).
+    """
+
+    def __init__(self, executor, name: str, key: str = 'id', indexes: Iterable[str] = (),
+                 ttl: float = None, version: Callable[[], Any] = None, check_interval: float = 1.0,
+                 batch_size: int = 10000, types: Dict[str, str] = None):
+        self.executor = executor
+        self.name = name
+        self.types = dict(types or {})
+        self.key = key
+        self.indexes = list(indexes)
+        self.ttl = ttl
+        self.version = version
+        self.check_interval = check_interval
+        self.batch_size = batch_size
+        self._table: Optional[MemoryTable] = None
+        self._stale = True
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self._version_value = None
+        self._kinds: Dict[str, set] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.reloads = 0
+
+    def invalidate(self):
+        self._stale = True
+
+    def table(self) -> MemoryTable:
+        """MemoryTable atual, recarregando do banco se a cópia estiver velha"""
+        table = self._table
+        if table is not None and not self._needs_reload():
+            return table
+
+        with self._lock:
+            # Outra thread pode ter recarregado enquanto esta esperava
+            if self._table is None or self._needs_reload():
+                self.load()
+            return self._table
+
+    def _needs_reload(self) -> bool:
+        if self._stale:
+            return True
+
+        now = time.monotonic()
+        if self.ttl is not None and now - self._loaded_at >= self.ttl:
+            return True
+
+        if self.version is not None and now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            return self.version() != self._version_value
+        return False
+
+    def load(self):
+        # Versão lida antes da tabela: uma escrita no meio força outra recarga, nunca o contrário
+        version_value = self.version() if self.version is not None else None
+        self._stale = False
+
+        try:
+            table = self._read_table()
+        except BaseException:
+            self._stale = True
+            raise
+
+        table.create_hash_index(self.key)
+        for col in self.indexes:
+            table.create_hash_index(col)
+            table.create_sorted_index(col)
+
+        now = time.monotonic()
+        self._table = table
+        self._loaded_at = now
+        self._checked_at = now
+        self._version_value = version_value
+        self._kinds = {}
+        self.reloads += 1
+
+    def _read_table(self) -> MemoryTable:
+        quote = self.executor._quote
+        columns, batches = self.executor.fetch_batches(f"SELECT * FROM {quote(self.name)}", [], self.batch_size)
+        if self.key not in columns:
+            raise ValueError(f"Key column '{self.key}' not found on table '{self.name}'")
+
+        table = MemoryTable(self.name, columns, types=self.types)
+        data = [table.data[col] for col in columns]
+        for rows in batches:
+            for values, row in zip(data, zip(*rows)):
+                values.extend(row)
+        return table
+
+    def comparable(self, table: MemoryTable, condition: Dict, bindings: Dict[str, Any] = None) -> bool:
+        """
+        Se a memória compara o valor do where como o banco: com o tipo da coluna conhecido
+        a afinidade é aplicada (MemoryTable.coerce); sem ele, texto contra coluna com números
+        (ou o contrário) não é comparável e a query vai ao banco.
+        """
+        column = condition['ID'].split('.')[-1]
+        if column in table.types or condition['EQUALS'] == 'LIKE':
+            return True
+
+        value = resolve(condition['NUMBER'], bindings)
+        values = value if condition['EQUALS'] == 'IN' else [value]
+        kinds = self._kinds.get(column)
+        if kinds is None:
+            kinds = self._kinds[column] = {_kind(item) for item in table.data[column] if item is not None}
+        return all(item is None or kinds <= {_kind(item)} for item in values)
+
+    def get(self, key_value: Any) -> Optional[Dict[str, Any]]:
+        """Linha pela chave, ou None"""
+        table = self.table()
+        row_ids = table.hash_indexes[self.key].get(table.coerce(self.key, key_value))
+        self.hits += 1
+        return table.row(row_ids[0]) if row_ids else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'rows': len(self._table) if self._table is not None else 0,
+            'hits': self.hits,
+            'reloads': self.reloads,
+            'indexes': [self.key] + self.indexes,
+        }
+
+
+def _kind(value: Any) -> str:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return 'number'
+    return 'text' if isinstance(value, str) else type(value).__name__
+
+
+class TableCache:
+    """
+    Tabelas de referência (países, planos, configuração) guardadas inteiras em memória.
+    get/getAll de uma tabela só, com where, orderBy, limit e exists, são respondidos
+    sem ir ao banco; agregações e joins continuam indo ao banco.
+
+    Uso:
+    plans = db.cache_table('plans', key='id', indexes=['code'])
+    db.getAll('plans').where('code', '=', 'pro').execute()   # sem ida ao banco
+    plans.get(1)
+    db.get_table_cache_stats()
+    """
+
+    def __init__(self):
+        self.tables: Dict[str, CachedTable] = {}
+
+    def add(self, cached: CachedTable) -> CachedTable:
+        self.tables[cached.name] = cached
+        return cached
+
+    def remove(self, name: str):
+        self.tables.pop(name, None)
+
+    def covers(self, tables: List[str]) -> bool:
+        return any(table in self.tables for table in tables or ())
+
+    def invalidate(self, tables: List[str] = None):
+        # None = não dá para saber a tabela alterada, todas recarregam
+        for name, cached in self.tables.items():
+            if tables is None or name in tables:
+                cached.invalidate()
+
+    def answer(self, node: SelectNode, bindings: Dict[str, Any] = None):
+        """Resultado da query a partir da memória, ou None quando ela precisa ir ao banco"""
+        cached = self.tables.get(node.table)
+        if cached is None or node.aggregates or node.joins or node.group_by or node.having:
+            return None
+
+        table = cached.table()
+        columns = [col.split('.')[-1] for col in node.columns if col != '*']
+        columns += [col.split('.')[-1] for col, _ in node.order_by]
+        if node.where:
+            columns.append(node.where['ID'].split('.')[-1])
+        # Coluna desconhecida: o banco devolve o erro de sempre
+        if any(col not in table.data for col in columns):
+            return None
+        # A memória não pode responder diferente do banco
+        if node.where and not cached.comparable(table, node.where, bindings):
+            return None
+
+        rows = select_rows(table, node, bindings)
+        cached.hits += 1
+        return rows
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: cached.stats() for name, cached in self.tables.items()}
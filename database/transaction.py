@@ -0,0 +1,133 @@
+from typing import Optional
+
+
+class Transaction:
+    """
+    Transação do SQLExecutor: a mais externa faz BEGIN/COMMIT/ROLLBACK, as internas
+    viram SAVEPOINTs. Erro dentro do with desfaz só o bloco onde aconteceu.
+
+    batch_every=N faz COMMIT a cada N comandos (fora de savepoints) e abre outra
+    transação: num laço longo milhares de comandos dividem o mesmo fsync.
+
+    Uso:
+    with db.transaction(isolation_level='IMMEDIATE'):
+        db.insert('users').values(name='Ana').execute()
+        with db.transaction():              # SAVEPOINT
+            db.delete('users').where('id', '=', 1).execute()
+
+    with db.batch_commit(every=1000):
+        for row in rows:
+            db.insert('events').values(**row).execute()
+    """
+
+    ISOLATION_LEVELS = {
+        'sqlite': ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE'),
+        'postgres': ('READ UNCOMMITTED', 'READ COMMITTED', 'REPEATABLE READ', 'SERIALIZABLE'),
+    }
+
+    def __init__(self, executor, isolation_level: str = None, batch_every: int = None):
+        dialect = executor.dialect
+        if isolation_level is not None:
+            isolation_level = isolation_level.upper()
+            if isolation_level not in self.ISOLATION_LEVELS[dialect]:
+                raise ValueError(f"Isolation level '{isolation_level}' not supported for dialect: {dialect}")
+        if batch_every is not None and batch_every < 1:
+            raise ValueError("batch_commit needs every >= 1")
+
+        self.executor = executor
+        self.isolation_level = isolation_level
+        self.batch_every = batch_every
+        self.parent: Optional['Transaction'] = None
+        self.savepoint = None
+        self.statements = 0
+        self.commits = 0
+        self.wrote = False
+
+    @property
+    def connection(self):
+        return self.executor.db_connection
+
+    def __enter__(self):
+        if not self.connection:
+            raise RuntimeError("Transaction requires a database connection")
+
+        self.parent = self.executor.transaction
+        if self.parent is not None:
+            if self.isolation_level or self.batch_every:
+                raise ValueError("Isolation level and batch_commit are only allowed on the outermost transaction")
+            self.savepoint = f"nix_sp_{self._depth()}"
+            self._execute(f"SAVEPOINT {self.savepoint}")
+        else:
+            if getattr(self.connection, 'in_transaction', False):
+                raise RuntimeError("A transaction is already open on this connection, commit it first")
+            self._begin()
+
+        self.executor.transaction = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.executor.transaction = self.parent
+
+        if exc_type is None:
+            if self.savepoint:
+                self._execute(f"RELEASE SAVEPOINT {self.savepoint}")
+                self.parent.wrote = self.parent.wrote or self.wrote
+            else:
+                self.connection.commit()
+                self.commits += 1
+                self._committed()
+            return False
+
+        if self.savepoint:
+            self._execute(f"ROLLBACK TO SAVEPOINT {self.savepoint}")
+            self._execute(f"RELEASE SAVEPOINT {self.savepoint}")
+        else:
+            self.connection.rollback()
+        # O cache pode ter linhas lidas dentro da transação desfeita
+        self.executor._invalidate_cache(None)
+        return False
+
+    def statement_done(self):
+        """Chamado pelo SQLExecutor depois de cada comando de escrita"""
+        outermost = self._outermost()
+        outermost.statements += 1
+        # Só faz o commit parcial fora de savepoints, senão eles seriam perdidos
+        if outermost.batch_every and outermost.statements % outermost.batch_every == 0 \
+                and self.executor.transaction is outermost:
+            self.connection.commit()
+            outermost.commits += 1
+            outermost._committed()
+            outermost._begin()
+
+    def _committed(self):
+        # Escritas da transação: leituras da sessão ficam no primário por pin_window a partir daqui
+        if self.wrote and self.executor.replicas is not None:
+            self.executor.replicas.record_write()
+        self.wrote = False
+
+    def _begin(self):
+        if self.executor.dialect == 'sqlite':
+            self._execute(f"BEGIN {self.isolation_level}" if self.isolation_level else "BEGIN")
+        elif self.isolation_level:
+            # Drivers do postgres abrem a transação sozinhos no primeiro comando
+            self._execute(f"SET TRANSACTION ISOLATION LEVEL {self.isolation_level}")
+
+    def _outermost(self) -> 'Transaction':
+        transaction = self
+        while transaction.parent is not None:
+            transaction = transaction.parent
+        return transaction
+
+    def _depth(self) -> int:
+        depth = 0
+        transaction = self.parent
+        while transaction is not None:
+            depth += 1
+            transaction = transaction.parent
+        return depth
+
+    def _execute(self, sql: str):
+        try:
+            self.connection.cursor().execute(sql)
+        except Exception as e:
+            raise RuntimeError(f"Error when try execute SQL: {e}")
@@ -0,0 +1,225 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable, Dict, List, Tuple
+
+from database.parser import Param, insertNode
+
+_STOP = object()
+
+
+class WriteBatcher:
+    """
+    Write-behind para inserts pequenos e frequentes: as linhas entram numa fila limitada
+    e uma thread em segundo plano grava em lotes (executemany por tabela/colunas, um
+    commit por lote) quando junta max_batch linhas ou depois de flush_interval segundos.
+
+    Com a fila cheia, quem insere espera (backpressure) até put_timeout segundos.
+    Cada insert devolve um Future resolvido depois do commit, para quem precisa de
+    durabilidade; close() grava tudo o que ainda está na fila.
+
+    A thread usa uma conexão própria de connection_factory; sem ela usa a conexão do
+    NixORM (no sqlite, aberta com check_same_thread=False). Como cada lote faz commit
+    ou rollback na conexão, sem connection_factory não dá para usar o batcher com uma
+    db.transaction() aberta: insert levanta RuntimeError e o lote falha.
+
+    Uso:
+    with db.write_batcher(max_batch=1000, flush_interval=0.05) as batcher:
+        batcher.insert('events', name='click', user_id=1)               # não espera
+        batcher.insert('events', name='buy', user_id=1).result()        # espera o commit
+        await batcher.insert_async('events', name='view', user_id=2)    # asyncio
+    """
+
+    def __init__(self, orm_instance, max_batch: int = 500, flush_interval: float = 0.05, max_queue: int = 10000,
+                 put_timeout: float = None, connection_factory: Callable[[], Any] = None):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+
+        self.orm = orm_instance
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.connection_factory = connection_factory
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._statements: Dict[Tuple[str, Tuple[str, ...]], Tuple[str, List]] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self.flushes = 0
+        self.rows_written = 0
+
+        self._thread = threading.Thread(target=self._run, name='nix-write-batcher', daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def insert(self, table: str, **values) -> Future:
+        self._check_open()
+
+        signature = (table, tuple(values))
+        self._statement(signature)
+
+        future = Future()
+        try:
+            self._queue.put((signature, values, future), timeout=self.put_timeout)
+        except queue.Full:
+            raise TimeoutError(f"Write queue full for {self.put_timeout}s")
+        return future
+
+    async def insert_async(self, table: str, **values) -> int:
+        """Espera o commit do lote sem bloquear o event loop (nem quando a fila está cheia)"""
+        loop = asyncio.get_running_loop()
+        try:
+            future = self.insert_nowait(table, **values)
+        except queue.Full:
+            future = await loop.run_in_executor(None, lambda: self.insert(table, **values))
+        return await asyncio.wrap_future(future)
+
+    def insert_nowait(self, table: str, **values) -> Future:
+        """Como insert, mas com a fila cheia levanta queue.Full em vez de esperar"""
+        self._check_open()
+
+        signature = (table, tuple(values))
+        self._statement(signature)
+        future = Future()
+        self._queue.put_nowait((signature, values, future))
+        return future
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("WriteBatcher is closed")
+        if self.connection_factory is None and self.orm.sql_executor.transaction is not None:
+            raise RuntimeError("WriteBatcher shares the ORM connection and would commit the open transaction, "
+                               "pass a connection_factory")
+
+    def _statement(self, signature: Tuple[str, Tuple[str, ...]]) -> Tuple[str, List]:
+        # Valida e compila uma vez por tabela + colunas; o erro aparece para quem inseriu
+        with self._lock:
+            statement = self._statements.get(signature)
+            if statement is None:
+                table, columns = signature
+                node = insertNode(table)
+                for col in columns:
+                    node.add_value(col, Param(col))
+                self.orm._analyze(node)
+                statement = self._statements[signature] = self.orm.sql_executor.compile(node)
+            return statement
+
+    def _run(self):
+        executor = self.orm.sql_executor
+        if self.connection_factory is not None:
+            executor = executor.with_connection(self.connection_factory())
+
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._flush_safely(executor, batch)
+
+        # Drena o que sobrou na fila antes de sair
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftover.append(item)
+        for start in range(0, len(leftover), self.max_batch):
+            self._flush_safely(executor, leftover[start:start + self.max_batch])
+
+        if self.connection_factory is not None:
+            executor.db_connection.close()
+
+    def _flush_safely(self, executor, batch: List):
+        # Um erro inesperado falha só os Futures do lote: a thread continua atendendo a fila
+        try:
+            self._flush(executor, batch)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    try:
+                        future.set_exception(e)
+                    except InvalidStateError:
+                        pass
+
+    def _flush(self, executor, batch: List):
+        # Future cancelado por quem inseriu (ex.: timeout do wait_for) não é gravado; os demais
+        # passam a "running" e não podem mais ser cancelados antes do resultado
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        groups: Dict[Tuple[str, Tuple[str, ...]], List] = {}
+        markers = []
+        for signature, values, future in batch:
+            if signature is None:
+                markers.append(future)
+            else:
+                groups.setdefault(signature, []).append((values, future))
+
+        connection = executor.db_connection
+        try:
+            # Conexão compartilhada: o commit/rollback do lote pegaria a transação de quem a abriu
+            if executor.transaction is not None:
+                raise RuntimeError("WriteBatcher can not flush while a transaction is open on the shared connection, "
+                                   "pass a connection_factory")
+            counts = {}
+            for signature, items in groups.items():
+                sql, params = self._statements[signature]
+                rows = [executor.resolve_params(params, values) for values, _ in items]
+                counts[signature] = executor.execute_many(sql, rows, signature[0], commit=False)
+            connection.commit()
+        except Exception as e:
+            if executor.transaction is None:
+                connection.rollback()
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.flushes += 1
+        self.rows_written += len(batch) - len(markers)
+        for signature, items in groups.items():
+            for _, future in items:
+                future.set_result(counts[signature])
+        for future in markers:
+            future.set_result(None)
+
+    def flush(self, timeout: float = None):
+        """Espera até as linhas já enfileiradas serem gravadas"""
+        if self._closed:
+            raise RuntimeError("WriteBatcher is closed")
+
+        # Marcador: resolvido quando tudo o que entrou antes dele foi gravado
+        marker = Future()
+        self._queue.put((None, None, marker))
+        marker.result(timeout)
+
+    def close(self, timeout: float = None):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {'queued': self._queue.qsize(), 'flushes': self.flushes, 'rows_written': self.rows_written}
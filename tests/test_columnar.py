@@ -0,0 +1,44 @@
+import sqlite3
+from array import array
+
+import pytest
+
+from database.nyx import NixORM
+
+
+@pytest.fixture
+def db():
+    db = NixORM(sqlite3.connect(':memory:'))
+    db.createTable('metrics').primaryKey('id').column('hits', 'INTEGER').column('up', 'BOOLEAN') \
+        .column('value', 'REAL').column('max_speed', 'REAL').execute()
+    return db
+
+
+def test_nulls_in_integer_and_boolean_columns(db):
+    db.insert_columns('metrics', {'hits': [1, 2, None, 4], 'up': [1, 0, 1, None],
+                                  'value': [0.5, None, 1.5, 2.0], 'max_speed': [1.0, 2.0, 3.0, 4.0]})
+    columns = db.fetch_columns("get('metrics', 'hits', 'up', 'value')", use_numpy=False, batch_size=3)
+
+    assert columns['hits'] == [1, 2, None, 4]
+    assert columns['up'] == [1, 0, 1, None]
+    assert columns['value'][0] == 0.5 and columns['value'][1] != columns['value'][1]
+
+
+def test_typed_arrays_without_nulls(db):
+    db.insert_columns('metrics', {'hits': array('q', [1, 2, 3]), 'up': [1, 0, 1], 'value': [1.0, 2.0, 3.0],
+                                  'max_speed': [10.0, 20.0, 30.0]})
+    columns = db.fetch_columns("get('metrics', 'hits', 'up', 'max_speed')", use_numpy=False)
+
+    assert columns['hits'] == array('q', [1, 2, 3])
+    assert columns['up'] == array('b', [1, 0, 1])
+    assert columns['max_speed'] == array('d', [10.0, 20.0, 30.0])
+
+
+def test_aggregate_types_come_from_the_node(db):
+    db.insert_columns('metrics', {'hits': [1, 2], 'up': [1, 1], 'value': [1.0, 3.0], 'max_speed': [5.0, 6.0]})
+    columns = db.fetch_columns(db.get('metrics', 'up').count().avg('hits').max('max_speed').groupBy('up'),
+                               use_numpy=False)
+
+    assert columns['count'] == array('q', [2])
+    assert columns['avg_hits'] == array('d', [1.5])
+    assert columns['max_max_speed'] == array('d', [6.0])
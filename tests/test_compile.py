@@ -0,0 +1,24 @@
+from database.compile import compile_files
+from database.semanticAnalyzer import SemanticAnalyzer
+
+
+def compile_source(tmp_path, source):
+    path = tmp_path / 'queries.nix'
+    path.write_text(source, encoding='utf-8')
+    analyzer = SemanticAnalyzer()
+    analyzer.schema['users'] = ['id', 'name']
+    return compile_files([str(path)], analyzer, 'sqlite')
+
+
+def test_compiles_named_queries(tmp_path):
+    compiled, errors = compile_source(tmp_path, "# name: all_users\ngetAll('users')\n")
+    assert errors == []
+    assert list(compiled) == ['all_users']
+
+
+def test_rejects_keywords_and_generated_names(tmp_path):
+    source = "# name: class\ngetAll('users')\n\n# name: QUERIES\ngetAll('users')\n\n# name: ok\ngetAll('users')\n"
+    compiled, errors = compile_source(tmp_path, source)
+    assert list(compiled) == ['ok']
+    assert [error.split(': ')[1:] for error in errors] == [['class', 'invalid query name'],
+                                                          ['QUERIES', 'invalid query name']]
@@ -0,0 +1,38 @@
+import sqlite3
+
+from database.columnTypes import text_coercer, type_affinity
+from database.nyx import NixORM
+
+
+def test_affinity():
+    assert type_affinity('BIGINT') == 'integer'
+    assert type_affinity('VARCHAR(100)') == 'text'
+    assert type_affinity('DOUBLE PRECISION') == 'real'
+    assert type_affinity('DATE') == 'numeric'
+    assert type_affinity('') == 'blob'
+
+
+def test_coercer_keeps_text_that_is_not_a_number():
+    assert text_coercer('DATE')('2024-01-05') == '2024-01-05'
+    assert text_coercer('NUMERIC')('12') == 12
+    assert text_coercer('NUMERIC')('1.5') == 1.5
+    assert text_coercer('INTEGER')('abc') == 'abc'
+    assert text_coercer('INTEGER')('') is None
+    assert text_coercer('VARCHAR')('') == ''
+    assert text_coercer('BOOLEAN')('yes') is True
+
+
+def test_import_csv_with_typed_columns(tmp_path):
+    path = tmp_path / 'events.csv'
+    path.write_text('name,day,amount,zip\nlogin,2024-01-05,10,01234\nlogout,2024-01-06,2.5,\n', encoding='utf-8')
+
+    db = NixORM(sqlite3.connect(':memory:'))
+    db.createTable('events').primaryKey('id').column('name', 'VARCHAR', '20').column('day', 'DATE') \
+        .column('amount', 'REAL').column('zip', 'VARCHAR', '10').execute()
+    stats = db.import_file('events', str(path), batch_size=1)
+
+    assert stats.rows == 2
+    assert db.query("get('events', 'name', 'day', 'amount', 'zip')") == [
+        {'name': 'login', 'day': '2024-01-05', 'amount': 10.0, 'zip': '01234'},
+        {'name': 'logout', 'day': '2024-01-06', 'amount': 2.5, 'zip': ''},
+    ]
@@ -0,0 +1,89 @@
+import sqlite3
+
+import pytest
+
+from database.memoryBackend import MemoryBackend, MemoryTable
+from database.nyx import NixORM
+
+QUERIES = [
+    ("getAll('users')", None),
+    ("getAll('users').where('id', '=', '2')", None),
+    ("getAll('users').where('id', '=', 2)", None),
+    ("get('users', 'name').where('age', '>', '25')", None),
+    ("get('users', 'name').where('age', '>=', :age)", {'age': 30}),
+    ("get('users', 'name').where('age', '<', 31)", None),
+    ("get('users', 'name', 'zip').where('zip', '=', '01234')", None),
+    ("get('users', 'name').where('name', 'LIKE', '%a%')", None),
+    ("get('users', 'name').where('age', '!=', 30)", None),
+    ("get('users', 'name').orderBy('age', 'DESC').limit('3')", None),
+    ("get('users', 'id').orderBy('name')", None),
+]
+
+
+def run(db, query, params):
+    # Sem orderBy a ordem das linhas não é garantida (o sqlite pode seguir um índice)
+    rows = db.query(query, params=params)
+    return rows if 'orderBy' in query else sorted(rows, key=repr)
+
+
+def create(db):
+    db.createTable('users').primaryKey('id').column('name', 'VARCHAR', '100').column('age', 'INTEGER') \
+        .column('zip', 'VARCHAR', '10').execute()
+    for name, age, zip_code in [('Ana', '30', '01234'), ('Bob', 20, '99999'), ('Cid', None, '01234'),
+                                ('Dan', 40, None), ('Eve', 30, '12345')]:
+        db.insert('users').values(name=name, age=age, zip=zip_code).execute()
+    return db
+
+
+@pytest.fixture
+def databases():
+    return create(NixORM(sqlite3.connect(':memory:'))), create(NixORM(backend=MemoryBackend()))
+
+
+@pytest.mark.parametrize('query, params', QUERIES)
+def test_same_results_as_sqlite(databases, query, params):
+    sqlite_db, memory_db = databases
+    assert run(memory_db, query, params) == run(sqlite_db, query, params)
+
+
+@pytest.mark.parametrize('query, params', QUERIES)
+def test_same_results_with_indexes(databases, query, params):
+    sqlite_db, memory_db = databases
+    memory_db.createIndex('users', 'idx_age').on('age').execute()
+    memory_db.createIndex('users', 'idx_zip').on('zip').execute()
+    assert run(memory_db, query, params) == run(sqlite_db, query, params)
+
+
+def test_writes_match_sqlite(databases):
+    for db in databases:
+        db.createIndex('users', 'idx_age').on('age').execute()
+        assert db.update('users').set(age=31).where('name', '=', 'Ana').execute() == 1
+        assert db.delete('users').where('age', '<', 25).execute() == 1
+
+    sqlite_db, memory_db = databases
+    for query, params in QUERIES:
+        assert run(memory_db, query, params) == run(sqlite_db, query, params)
+
+
+def test_duplicate_primary_key(databases):
+    _, memory_db = databases
+    with pytest.raises(ValueError):
+        memory_db.insert('users').values(id=1, name='Dup').execute()
+    with pytest.raises(ValueError):
+        memory_db.update('users').set(id=2).where('id', '=', 1).execute()
+    assert len(memory_db.query("getAll('users')")) == 5
+
+
+def test_indexes_follow_updates_and_deletes():
+    table = MemoryTable('items', ['id', 'price'], ['id'], {'id': 'INTEGER', 'price': 'REAL'})
+    table.create_hash_index('price')
+    table.create_sorted_index('price')
+    for price in (10, 20, 30):
+        table.insert({'price': price})
+
+    table.update([0], {'price': '25'})
+    table.delete([1])
+
+    assert table.hash_indexes['price'] == {25.0: [0], 30.0: [2]}
+    assert table.sorted_indexes['price'] == [(25.0, 0), (30.0, 2)]
+    assert table.find({'ID': 'price', 'EQUALS': '>', 'NUMBER': '24'}) == [0, 2]
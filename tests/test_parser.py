@@ -0,0 +1,74 @@
+import sqlite3
+
+import pytest
+
+from database.nyx import NixORM
+from database.parser import NixParser, Param
+
+
+def parse(query):
+    return NixParser().parse(query)
+
+
+def test_quoted_values_stay_text():
+    node = parse("insert('addr').values('zip', '01234', 'number', '12')")
+    assert node.values == {'zip': '01234', 'number': '12'}
+
+
+def test_number_and_param_values():
+    node = parse("update('users').set('age', 30, 'name', :name).where('id', '=', 1)")
+    assert node.values['age'] == 30
+    assert isinstance(node.values['name'], Param)
+    assert node.where['NUMBER'] == 1
+
+
+def test_quoted_where_value_stays_text():
+    node = parse("getAll('addr').where('zip', '=', '01234')")
+    assert node.where['NUMBER'] == '01234'
+
+
+def test_having_value_is_numeric():
+    node = parse("get('users', 'age').count().groupBy('age').having('count', '*', '>', '1')")
+    assert node.having['NUMBER'] == 1
+
+
+def test_leading_zero_survives_insert():
+    db = NixORM(sqlite3.connect(':memory:'))
+    db.query("createTable('addr').column('id', 'INTEGER', 'primarykey').column('zip', 'VARCHAR', '10')")
+    db.query("insert('addr').values('zip', '01234')")
+
+    assert db.query("get('addr', 'zip')") == [{'zip': '01234'}]
+    assert db.query("get('addr', 'zip').where('zip', '=', '01234')") == [{'zip': '01234'}]
+
+
+def test_quoted_number_matches_integer_column():
+    db = NixORM(sqlite3.connect(':memory:'))
+    db.query("createTable('users').column('id', 'INTEGER', 'primarykey').column('age', 'INTEGER')")
+    db.query("insert('users').values('age', '30')")
+    db.query("insert('users').values('age', '12')")
+
+    assert db.query("get('users', 'age').where('age', '>', '18')") == [{'age': 30}]
+
+
+def test_second_where_is_rejected():
+    db = NixORM()
+    for query in (db.delete('users'), db.update('users').set(age=1), db.getAll('users')):
+        query.where('age', '>', 10)
+        with pytest.raises(ValueError):
+            query.where('name', '=', 'bob')
+
+
+def test_second_where_is_rejected_in_the_dsl():
+    with pytest.raises(SyntaxError):
+        parse("delete('users').where('age', '>', 10).where('name', '=', 'bob')")
+
+
+def test_fluent_having_matches_the_dsl():
+    db = NixORM(sqlite3.connect(':memory:'))
+    db.query("createTable('users').column('id', 'INTEGER', 'primarykey').column('age', 'INTEGER')")
+    for age in (20, 20, 30):
+        db.insert('users').values(age=age).execute()
+
+    fluent = db.get('users', 'age').count().groupBy('age').having('count', '*', '>', '1').execute()
+    assert fluent == db.query("get('users', 'age').count().groupBy('age').having('count', '*', '>', '1')")
+    assert fluent == [{'age': 20, 'count': 2}]
@@ -0,0 +1,43 @@
+import asyncio
+import sqlite3
+
+from database.nyx import NixORM
+
+
+def make_db(path):
+    db = NixORM(sqlite3.connect(path, check_same_thread=False))
+    db.createTable('orders').primaryKey('id').column('user_id', 'INTEGER').execute()
+    for user_id in (1, 1, 2):
+        db.insert('orders').values(user_id=user_id).execute()
+    return db
+
+
+async def load_concurrently(db):
+    loader = db.related_loader('orders', 'user_id', batch_size=1)
+
+    async def batch(keys):
+        return await loader.load_many(keys)
+
+    first = asyncio.ensure_future(batch([1, 2, 3]))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(batch([2, 1]))
+    return await first, await second
+
+
+def test_concurrent_batches_on_the_main_connection(tmp_path):
+    db = make_db(str(tmp_path / 'app.db'))
+    first, second = asyncio.run(load_concurrently(db))
+
+    assert [row['id'] for row in first[1]] == [1, 2]
+    assert first[3] == []
+    assert [row['id'] for row in second[2]] == [3]
+
+
+def test_batches_use_the_connection_pool(tmp_path):
+    path = str(tmp_path / 'app.db')
+    db = make_db(path)
+    pool = db.enable_connection_pool(lambda: sqlite3.connect(path, check_same_thread=False), size=2)
+    first, second = asyncio.run(load_concurrently(db))
+
+    assert [row['id'] for row in second[1]] == [1, 2]
+    assert pool._opened >= 1
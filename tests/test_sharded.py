@@ -0,0 +1,58 @@
+import sqlite3
+
+import pytest
+
+from database.shardedNyx import ShardedNixORM
+
+
+@pytest.fixture
+def db():
+    db = ShardedNixORM([sqlite3.connect(':memory:', check_same_thread=False) for _ in range(3)], shard_key='tenant_id')
+    db.query("createTable('orders').column('id', 'INTEGER').column('tenant_id', 'INTEGER').column('total', 'INTEGER')")
+    for index in range(30):
+        db.insert('orders').values(id=index, tenant_id=index % 7, total=(index * 7) % 30).execute()
+    yield db
+    db.close()
+
+
+def expected_ids(reverse=False):
+    return [index for _, index in sorted(((index * 7) % 30, index) for index in range(30))][::-1 if reverse else 1]
+
+
+def test_order_by_column_outside_projection(db):
+    rows = db.get('orders', 'id').orderBy('total').execute()
+
+    assert [row['id'] for row in rows] == expected_ids()
+    assert all(list(row) == ['id'] for row in rows)
+
+
+def test_order_by_desc_with_limit(db):
+    rows = db.query("get('orders', 'id').orderBy('total', 'DESC').limit('5')")
+
+    assert [row['id'] for row in rows] == expected_ids(reverse=True)[:5]
+
+
+def test_order_by_projected_column(db):
+    rows = db.get('orders', 'id', 'total').orderBy('total').execute()
+
+    assert [row['total'] for row in rows] == sorted(row['total'] for row in rows)
+    assert len(rows) == 30
+
+
+def test_stream_merges_lazily(db):
+    stream = db.stream("get('orders', 'id').orderBy('total')")
+
+    assert [next(stream)['id'] for _ in range(3)] == expected_ids()[:3]
+    stream.close()
+
+
+def test_aggregates_across_shards(db):
+    rows = db.get('orders').sum('total').execute()
+
+    assert rows == [{'sum_total': sum((index * 7) % 30 for index in range(30))}]
+
+
+def test_having_with_text_value(db):
+    rows = db.get('orders', 'tenant_id').count().groupBy('tenant_id').having('count', '*', '>', '4').execute()
+
+    assert sorted(row['tenant_id'] for row in rows) == [0, 1]
@@ -0,0 +1,46 @@
+import threading
+import time
+
+import pytest
+
+from database.singleFlight import SingleFlight
+
+
+def test_waiters_share_the_leader_result():
+    flight = SingleFlight(timeout=2)
+    results = []
+
+    def leader():
+        results.append(flight.do('key', lambda: time.sleep(0.1) or [1]))
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    time.sleep(0.02)
+    results.append(flight.do('key', lambda: [2]))
+    thread.join()
+
+    assert sorted(results, key=lambda item: item[1]) == [([1], False), ([1], True)]
+
+
+def test_waiters_fail_when_the_leader_is_interrupted():
+    flight = SingleFlight(timeout=2)
+    errors = []
+
+    def leader():
+        def interrupted():
+            time.sleep(0.1)
+            raise KeyboardInterrupt
+        try:
+            flight.do('key', interrupted)
+        except KeyboardInterrupt:
+            errors.append('leader')
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    time.sleep(0.02)
+    with pytest.raises(RuntimeError):
+        flight.do('key', lambda: [2])
+    thread.join()
+
+    assert errors == ['leader']
+    assert flight.in_flight() == 0
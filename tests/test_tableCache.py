@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+
+from database.nyx import NixORM
+
+QUERIES = [
+    ("getAll('plans').where('id', '=', '1')", None),
+    ("getAll('plans').where('id', '=', 1)", None),
+    ("get('plans', 'code').where('price', '>', '5')", None),
+    ("get('plans', 'code').where('price', '<=', :price)", {'price': '10'}),
+    ("get('plans', 'id').where('code', '=', 'pro')", None),
+    ("get('plans', 'id').where('zip', '=', '01234')", None),
+    ("get('plans', 'id').where('zip', '=', 1234)", None),
+    ("get('plans', 'code').orderBy('price', 'DESC').limit('2')", None),
+    ("get('plans', 'id').where('code', 'LIKE', 'p%').exists()", None),
+]
+
+
+class CountingConnection:
+    def __init__(self, connection):
+        self.connection = connection
+        self.calls = 0
+
+    def cursor(self):
+        self.calls += 1
+        return self.connection.cursor()
+
+    def execute(self, *args):
+        self.calls += 1
+        return self.connection.execute(*args)
+
+    def commit(self):
+        return self.connection.commit()
+
+    def rollback(self):
+        return self.connection.rollback()
+
+
+@pytest.fixture
+def db():
+    db = NixORM(CountingConnection(sqlite3.connect(':memory:')))
+    db.createTable('plans').primaryKey('id').column('code', 'VARCHAR', '20').column('price', 'INTEGER') \
+        .column('zip', 'VARCHAR', '10').execute()
+    for code, price, zip_code in [('free', 0, '01234'), ('pro', '10', '1234'), ('team', 30, None)]:
+        db.insert('plans').values(code=code, price=price, zip=zip_code).execute()
+    return db
+
+
+def run_all(db):
+    results = [db.query(query, params=params) for query, params in QUERIES]
+    return results + [db.getAll('plans').where('id', 'IN', ['1', 3]).execute()]
+
+
+def test_cache_answers_like_the_database(db):
+    expected = run_all(db)
+    db.cache_table('plans', key='id', indexes=['code', 'price'])
+    db.sql_executor.db_connection.calls = 0
+
+    assert run_all(db) == expected
+    assert db.sql_executor.db_connection.calls == 0
+
+
+def test_cache_without_declared_types_goes_to_database_on_mismatch(db):
+    expected = run_all(db)
+    db.semantic_analyzer.column_types.pop('plans')
+    plans = db.cache_table('plans', key='id')
+    plans.types = {}
+    plans.invalidate()
+
+    assert run_all(db) == expected
+
+
+def test_orm_write_refreshes_cache(db):
+    plans = db.cache_table('plans', key='id', indexes=['code'])
+    db.update('plans').set(price=12).where('code', '=', 'pro').execute()
+
+    assert db.query("get('plans', 'price').where('code', '=', 'pro')") == [{'price': 12}]
+    assert plans.get('2')['price'] == 12
+    assert plans.stats()['reloads'] == 2
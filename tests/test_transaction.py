@@ -0,0 +1,34 @@
+import sqlite3
+import time
+
+from database.nyx import NixORM
+
+
+def make_db(path, pin_window=0.2):
+    db = NixORM.with_replicas(
+        lambda: sqlite3.connect(path, check_same_thread=False),
+        [lambda: sqlite3.connect(path, check_same_thread=False)],
+        pin_window=pin_window,
+    )
+    db.createTable('users').primaryKey('id').column('name', 'VARCHAR', '100').execute()
+    return db
+
+
+def test_transaction_reads_its_own_writes(tmp_path):
+    db = make_db(str(tmp_path / 'app.db'))
+    time.sleep(0.25)
+
+    with db.transaction():
+        db.insert('users').values(name='Ana').execute()
+        time.sleep(0.25)
+        assert db.query("get('users', 'name')") == [{'name': 'Ana'}]
+
+
+def test_pin_window_starts_at_commit(tmp_path):
+    db = make_db(str(tmp_path / 'app.db'))
+    time.sleep(0.25)
+
+    with db.transaction():
+        db.insert('users').values(name='Ana').execute()
+        time.sleep(0.25)
+    assert db.sql_executor.replicas.is_pinned()
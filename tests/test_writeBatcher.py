@@ -0,0 +1,49 @@
+import asyncio
+import sqlite3
+
+from database.nyx import NixORM
+
+
+def make_db():
+    db = NixORM(sqlite3.connect(':memory:', check_same_thread=False))
+    db.createTable('events').primaryKey('id').column('name', 'VARCHAR', '20').execute()
+    return db
+
+
+def test_cancelled_insert_keeps_the_writer_alive():
+    db = make_db()
+    batcher = db.write_batcher(flush_interval=0.2)
+
+    cancelled = batcher.insert('events', name='cancelled')
+    assert cancelled.cancel()
+    assert batcher.insert('events', name='kept').result(2) == 1
+    assert batcher._thread.is_alive()
+
+    batcher.close()
+    assert db.query("get('events', 'name')") == [{'name': 'kept'}]
+
+
+def test_async_insert_timeout_keeps_the_writer_alive():
+    db = make_db()
+    batcher = db.write_batcher(flush_interval=0.2)
+
+    async def main():
+        try:
+            await asyncio.wait_for(batcher.insert_async('events', name='late'), 0.01)
+        except asyncio.TimeoutError:
+            pass
+        return await batcher.insert_async('events', name='after')
+
+    assert asyncio.run(main()) == 1
+    batcher.flush(2)
+    assert batcher._thread.is_alive()
+    batcher.close()
+
+
+def test_close_writes_queued_rows():
+    db = make_db()
+    with db.write_batcher(max_batch=10, flush_interval=1.0) as batcher:
+        for index in range(25):
+            batcher.insert('events', name=f'e{index}')
+
+    assert len(db.query("getAll('events')")) == 25